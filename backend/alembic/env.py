@@ -19,6 +19,9 @@ from app.core.database import Base
 from app.models.user import User  # Import all models here
 from app.models.team import Team
 from app.models.project import Project
+from app.models.task import Task
+from app.models.comment import Comment
+from app.models.stats_counter import StatsCounter
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,32 @@
+"""Match task sort indexes to the list order
+
+Revision ID: 3d7c52e8a1f0
+Revises: 8f3a6d21c4b9
+Create Date: 2026-10-17 14:21:09.551873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7c52e8a1f0'
+down_revision: Union[str, None] = '8f3a6d21c4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_tasks_due_date_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_due_date_created_at', table_name='tasks')
+    op.create_index('ix_tasks_due_date_created_at_id', 'tasks', ['due_date', sa.text('created_at DESC'), 'id'], unique=False)
+    op.create_index('ix_tasks_assigned_to_due_date_created_at_id', 'tasks', ['assigned_to', 'due_date', sa.text('created_at DESC'), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_assigned_to_due_date_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date_created_at_id', table_name='tasks')
+    op.create_index('ix_tasks_assigned_to_due_date_created_at', 'tasks', ['assigned_to', 'due_date', 'created_at'], unique=False)
+    op.create_index('ix_tasks_due_date_created_at', 'tasks', ['due_date', 'created_at'], unique=False)
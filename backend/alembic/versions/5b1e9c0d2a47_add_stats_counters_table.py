@@ -0,0 +1,90 @@
+"""Add stats_counters table
+
+Revision ID: 5b1e9c0d2a47
+Revises: ca77407a57ba
+Create Date: 2026-10-17 09:12:31.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e9c0d2a47'
+down_revision: Union[str, None] = 'ca77407a57ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stats_counters',
+    sa.Column('scope_type', sa.String(length=32), nullable=False),
+    sa.Column('scope_id', sa.String(length=36), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope_type', 'scope_id', 'entity', 'status')
+    )
+    # Populate from existing rows; afterwards the ORM session listeners in
+    # app/core/stats_counters.py keep the table up to date. Plain SQL so the
+    # backfill stays valid however the application code evolves. Task status
+    # is stored as the enum name (TODO) while counters use the value (todo).
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+BACKFILL = [
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'global', '', 'project', CAST(status AS VARCHAR), COUNT(*)
+    FROM projects GROUP BY status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'manager', CAST(manager_id AS VARCHAR), 'project', CAST(status AS VARCHAR), COUNT(*)
+    FROM projects GROUP BY manager_id, status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'global', '', 'task', LOWER(CAST(status AS VARCHAR)), COUNT(*)
+    FROM tasks GROUP BY status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'assignee', CAST(assigned_to AS VARCHAR), 'task', LOWER(CAST(status AS VARCHAR)), COUNT(*)
+    FROM tasks GROUP BY assigned_to, status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'manager', CAST(p.manager_id AS VARCHAR), 'task', LOWER(CAST(t.status AS VARCHAR)), COUNT(*)
+    FROM tasks t JOIN projects p ON p.id = t.project_id
+    GROUP BY p.manager_id, t.status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'manager_assignee', CAST(t.assigned_to AS VARCHAR), 'task', LOWER(CAST(t.status AS VARCHAR)), COUNT(*)
+    FROM tasks t JOIN projects p ON p.id = t.project_id
+    WHERE p.manager_id = t.assigned_to
+    GROUP BY t.assigned_to, t.status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'member', CAST(t.assigned_to AS VARCHAR), 'project', CAST(p.status AS VARCHAR), COUNT(DISTINCT p.id)
+    FROM tasks t JOIN projects p ON p.id = t.project_id
+    GROUP BY t.assigned_to, p.status
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'global', '', 'team', '', COUNT(*) FROM teams HAVING COUNT(*) > 0
+    """,
+    """
+    INSERT INTO stats_counters (scope_type, scope_id, entity, status, value)
+    SELECT 'global', '', 'user', '', COUNT(*) FROM users HAVING COUNT(*) > 0
+    """,
+]
+
+
+def downgrade() -> None:
+    op.drop_table('stats_counters')
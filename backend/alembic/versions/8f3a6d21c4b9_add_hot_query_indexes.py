@@ -0,0 +1,36 @@
+"""Add indexes for hot task, comment and project queries
+
+Revision ID: 8f3a6d21c4b9
+Revises: 5b1e9c0d2a47
+Create Date: 2026-10-17 10:05:47.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6d21c4b9'
+down_revision: Union[str, None] = '5b1e9c0d2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_assigned_to_due_date_created_at', 'tasks', ['assigned_to', 'due_date', 'created_at'], unique=False)
+    op.create_index('ix_tasks_assigned_to_status', 'tasks', ['assigned_to', 'status'], unique=False)
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+    op.create_index('ix_tasks_due_date_created_at', 'tasks', ['due_date', 'created_at'], unique=False)
+    op.create_index('ix_comments_task_id_created_at', 'comments', ['task_id', 'created_at'], unique=False)
+    op.create_index('ix_projects_manager_id_status', 'projects', ['manager_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_manager_id_status', table_name='projects')
+    op.drop_index('ix_comments_task_id_created_at', table_name='comments')
+    op.drop_index('ix_tasks_due_date_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_status', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_due_date_created_at', table_name='tasks')
@@ -0,0 +1,28 @@
+"""Add id to the comments keyset index
+
+Revision ID: a4e91f7b2c63
+Revises: 3d7c52e8a1f0
+Create Date: 2026-10-17 15:02:44.310527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e91f7b2c63'
+down_revision: Union[str, None] = '3d7c52e8a1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_comments_task_id_created_at', table_name='comments')
+    op.create_index('ix_comments_task_id_created_at_id', 'comments', ['task_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_task_id_created_at_id', table_name='comments')
+    op.create_index('ix_comments_task_id_created_at', 'comments', ['task_id', 'created_at'], unique=False)
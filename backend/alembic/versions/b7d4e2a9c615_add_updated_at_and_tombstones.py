@@ -0,0 +1,66 @@
+"""Add updated_at columns and tombstones table for delta sync
+
+Revision ID: b7d4e2a9c615
+Revises: e5a0d7c3b914
+Create Date: 2026-10-17 19:26:08.540317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e2a9c615'
+down_revision: Union[str, None] = 'e5a0d7c3b914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# updated_at is naive UTC everywhere; projects and teams keep a timestamptz
+# created_at (which may be NULL), so their backfill converts it
+BACKFILL = {
+    'tasks': "UPDATE tasks SET updated_at = created_at",
+    'comments': "UPDATE comments SET updated_at = created_at",
+    'projects': "UPDATE projects SET updated_at = "
+                "COALESCE(created_at AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC')",
+    'teams': "UPDATE teams SET updated_at = "
+             "COALESCE(created_at AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC')",
+}
+
+
+def upgrade() -> None:
+    for table, backfill in BACKFILL.items():
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(backfill)
+        op.alter_column(table, 'updated_at', nullable=False)
+    op.create_index('ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_tasks_assigned_to_updated_at_id', 'tasks', ['assigned_to', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_comments_updated_at_id', 'comments', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_projects_updated_at_id', 'projects', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_teams_updated_at_id', 'teams', ['updated_at', 'id'], unique=False)
+
+    op.create_table('tombstones',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.Column('assigned_to', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('manager_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_deleted_at_id', 'tombstones', ['deleted_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_deleted_at_id', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_index('ix_teams_updated_at_id', table_name='teams')
+    op.drop_index('ix_projects_updated_at_id', table_name='projects')
+    op.drop_index('ix_comments_updated_at_id', table_name='comments')
+    op.drop_index('ix_tasks_assigned_to_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
+    for table in reversed(list(BACKFILL)):
+        op.drop_column(table, 'updated_at')
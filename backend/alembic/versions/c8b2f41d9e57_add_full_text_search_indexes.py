@@ -0,0 +1,36 @@
+"""Add full-text search indexes on tasks and comments
+
+Revision ID: c8b2f41d9e57
+Revises: a4e91f7b2c63
+Create Date: 2026-10-17 16:40:12.774019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8b2f41d9e57'
+down_revision: Union[str, None] = 'a4e91f7b2c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must stay identical to TASK_DOCUMENT / COMMENT_DOCUMENT in
+# app/core/search_index.py, or the search queries will not use the indexes.
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_tasks_search ON tasks USING gin (("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')))"
+    )
+    op.execute(
+        "CREATE INDEX ix_comments_search ON comments USING gin ((to_tsvector('english', message)))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX ix_comments_search")
+    op.execute("DROP INDEX ix_tasks_search")
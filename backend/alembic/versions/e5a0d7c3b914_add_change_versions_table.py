@@ -0,0 +1,34 @@
+"""Add change_versions table
+
+Revision ID: e5a0d7c3b914
+Revises: c8b2f41d9e57
+Create Date: 2026-10-17 18:05:47.162930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0d7c3b914'
+down_revision: Union[str, None] = 'c8b2f41d9e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('change_versions',
+    sa.Column('scope', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+    # Rows are created by the first write to each table (see
+    # app/core/change_versions.py); until then responses carry an ETag but
+    # no Last-Modified.
+
+
+def downgrade() -> None:
+    op.drop_table('change_versions')
@@ -0,0 +1,98 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for read endpoints.
+
+``conditional_get(*scopes)`` is a route dependency that reads the change
+versions of the given scopes and derives a weak ETag from them, the caller's
+identity and the request URL. A matching ``If-None-Match`` (or, without one,
+a fresh enough ``If-Modified-Since``) is answered with ``304 Not Modified``
+before the endpoint body runs, so no row query or serialization happens.
+
+The versions are read through the same session as the endpoint's data, so
+with read replicas the ETag never describes newer data than the response.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user, get_read_db
+from app.core.change_versions import latest, versions_query
+from app.models.user import User
+
+# Responses differ per user and must be revalidated before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(versions: Dict[str, Tuple[int, datetime]], user: User, request: Request) -> str:
+    role = user.role.value if hasattr(user.role, "value") else user.role
+    parts = [f"{scope}={versions[scope][0]}" for scope in sorted(versions)]
+    parts += [str(user.id), str(role), request.url.path, str(request.query_params)]
+    return 'W/"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+
+
+def conditional_get(*scopes: str):
+    """
+    Dependency factory: ETag/Last-Modified headers for a read endpoint whose
+    response depends only on the tables behind ``scopes``, the current user
+    and the URL.
+    """
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(get_current_user)
+    ) -> None:
+        versions = {
+            scope: (version, updated_at)
+            for scope, version, updated_at in (await db.execute(versions_query(scopes))).all()
+        }
+        etag = make_etag(versions, current_user, request)
+        # Part of the @single_flight key: requests only share a result
+        # computed against the same versions
+        request.state.change_versions = tuple(sorted((scope, version) for scope, (version, _) in versions.items()))
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+        # HTTP dates have whole seconds. A time in the current second is not
+        # sent: a second write within that second would carry the same date,
+        # and a client holding the earlier response would get a wrong 304.
+        last_modified = latest(versions)
+        if last_modified is not None and last_modified.replace(microsecond=0) < datetime.utcnow().replace(microsecond=0):
+            headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+        else:
+            last_modified = None
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            not_modified = etag_matches(if_none_match, etag)
+        else:
+            if_modified_since = request.headers.get("if-modified-since")
+            not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+        if not_modified:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return check
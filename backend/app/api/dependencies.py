@@ -1,47 +1,85 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.auth import decode_token
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.auth_cache import auth_cache
+from app.core.replicas import WRITER_KEY, read_replicas
 from app.models.user import User, UserRole
-from typing import Optional
+from uuid import UUID
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token.
-    """
-    token = credentials.credentials
-    
+def _user_id_from_token(token: str) -> UUID:
     try:
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
+        payload = auth_cache.decode_token(token)
+        return UUID(payload["sub"])
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
+
+
+async def _load_user(user_id: UUID, db: AsyncSession) -> User:
+    user = auth_cache.get_user(user_id)
+    if user is not None:
+        return user
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
+    auth_cache.set_user(user)
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+
+    Verified tokens and user rows are served from the in-process auth cache,
+    so repeat requests with the same token skip both JWT verification and the
+    user lookup.
+    """
+    user_id = _user_id_from_token(credentials.credentials)
+    
+    # Lets a commit on this request's primary session start the user's
+    # read-your-writes window
+    db.info[WRITER_KEY] = user_id
+    
+    return await _load_user(user_id, db)
+
+
+async def user_from_token(token: str) -> User:
+    """
+    Authenticate a raw token without holding a request-scoped session, for
+    long-lived connections (WebSocket, server-sent events).
+
+    Raises:
+        HTTPException: 401 if the token or its user is invalid
+    """
+    user_id = _user_id_from_token(token)
+    async with AsyncSessionLocal() as db:
+        return await _load_user(user_id, db)
+
+
+async def get_read_db(current_user: User = Depends(get_current_user)):
+    """
+    Session for read-only endpoints: a read replica when configured and
+    healthy, the primary otherwise or right after the user wrote something.
+    """
+    async with read_replicas.session(current_user.id) as db:
+        yield db
+
+
 def require_role(required_role: UserRole):
     """
     Dependency factory to check if user has the required role.
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    Datetimes and UUIDs are stored as strings.
+    """
+    def convert(value):
+        if isinstance(value, datetime):
+            return {"dt": value.isoformat()}
+        if isinstance(value, UUID):
+            return {"uuid": str(value)}
+        return value
+
+    raw = json.dumps([convert(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Union[Type, Tuple[Type, ...]]]) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    ``types`` gives the accepted type(s) of each value, e.g.
+    ``[(datetime, type(None)), datetime, UUID]``, so a hand-crafted cursor
+    cannot push a string into a datetime comparison.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    def convert(value):
+        if isinstance(value, dict) and "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if isinstance(value, dict) and "uuid" in value:
+            return UUID(value["uuid"])
+        return value
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("unexpected cursor shape")
+        values = [convert(v) for v in values]
+        if not all(isinstance(v, t) for v, t in zip(values, types)):
+            raise ValueError("unexpected cursor value type")
+        return values
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def next_cursor(rows: List[Any], limit: Optional[int], key) -> Optional[str]:
+    """
+    Trim a page fetched with ``limit + 1`` rows and return the cursor for the
+    following page, or None if this is the last page.
+    """
+    if limit is None or len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(key(rows[-1]))
@@ -0,0 +1,174 @@
+"""
+Request collapsing ("single flight") for expensive read endpoints.
+
+``@single_flight(scope)`` goes under the route decorator of a handler in
+``app/api/v1/``. Concurrent requests with the same key, within one
+worker, share one run of the handler. The key is:
+
+- the route template;
+- ``scope(current_user)``, which names the set of users who get the same
+  response;
+- the handler's own query and path parameters (dependencies are left out);
+- the change versions ``conditional_get`` read for the request, if any.
+
+The first request (the leader) runs the handler and serializes its result
+with the route's ``response_model`` once. Requests that arrive while it runs
+await the leader's bytes instead of running the handler themselves. Headers
+set by dependencies, such as the per-user ``ETag``, are still each request's
+own. Because the key holds the versions, a request that starts after a write
+has committed never joins a run that began before the write.
+
+If the leader fails, its waiting followers get the same exception. If it is
+cancelled (the client went away), one of them runs the handler instead.
+Nothing is cached: once the run finishes, the next request starts a new one.
+"""
+import asyncio
+import functools
+import inspect
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from fastapi import Request, Response
+from fastapi.params import Depends
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.core.config import settings
+from app.core.metrics import SINGLE_FLIGHT_REQUESTS
+from app.models.user import User
+
+# Parameters added to the handler's signature, unless it already takes a
+# Request/Response, so FastAPI passes in the request (for the route and
+# versions) and the response that dependencies set headers on
+_REQUEST = "single_flight_request"
+_RESPONSE = "single_flight_response"
+
+# Runs in progress in this worker, by key; each future ends with either
+# (body, None) or (None, exception)
+_in_flight: Dict[Hashable, "asyncio.Future[Tuple[Any, Any]]"] = {}
+
+
+def per_user(user: User) -> Hashable:
+    """Scope for responses that differ for every user."""
+    return user.id
+
+
+def _hashable(value: Any) -> Hashable:
+    # Repeated query parameters arrive as lists
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _parameters(func: Callable) -> Tuple[inspect.Signature, Tuple[str, ...], Dict[type, Tuple[str, bool]]]:
+    """
+    The wrapper's signature, the names of the handler's own request
+    parameters, and for Request and Response the parameter that receives
+    it and whether it was added for the wrapper.
+    """
+    signature = inspect.signature(func)
+    if "current_user" not in signature.parameters:
+        raise TypeError(f"{func.__qualname__} needs a current_user parameter to be single-flighted")
+    params = tuple(
+        name for name, param in signature.parameters.items()
+        if not isinstance(param.default, Depends)
+        and param.annotation not in (Request, Response)
+    )
+    # FastAPI passes the request/response to one parameter only
+    injected, extra = {}, []
+    for annotation, added_name in ((Request, _REQUEST), (Response, _RESPONSE)):
+        name = next((n for n, p in signature.parameters.items() if p.annotation is annotation), None)
+        if name is None:
+            extra.append(inspect.Parameter(added_name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation))
+        injected[annotation] = (name or added_name, name is None)
+    return signature.replace(parameters=[*signature.parameters.values(), *extra]), params, injected
+
+
+async def _serialize(request: Request, result: Any) -> Tuple[int, bytes]:
+    if isinstance(result, Response):
+        # Already encoded by the handler (see app.api.fast_json)
+        return result.status_code, result.body
+    route = request.scope["route"]
+    content = await serialize_response(
+        field=route.response_field,
+        response_content=result,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+    )
+    return route.status_code or 200, JSONResponse(content).body
+
+
+def _respond(body: Tuple[int, bytes], response: Response) -> Response:
+    status_code, content = body
+    shared = Response(content=content, status_code=status_code, media_type="application/json")
+    shared.headers.update(response.headers)
+    return shared
+
+
+def single_flight(scope: Callable[[User], Hashable] = per_user):
+    """
+    Decorator: collapse concurrent identical requests to the handler.
+
+    ``scope`` maps the current user to a value that is equal for every user
+    who gets the same response, e.g. ``"all"`` when the result does not
+    depend on the user. The handler must return a JSON ``Response`` or
+    something its route's ``response_model`` can serialize.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature, params, injected = _parameters(func)
+
+        def take(kwargs: dict, annotation: type):
+            name, added = injected[annotation]
+            return kwargs.pop(name) if added else kwargs[name]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = take(kwargs, Request)
+            response: Response = take(kwargs, Response)
+            if not settings.SINGLE_FLIGHT_ENABLED:
+                return await func(*args, **kwargs)
+
+            route = request.scope["route"].path
+            key = (
+                route,
+                scope(kwargs["current_user"]),
+                tuple(_hashable(kwargs[name]) for name in params),
+                getattr(request.state, "change_versions", None),
+            )
+            while key in _in_flight:
+                flight = _in_flight[key]
+                try:
+                    # Shielded: a follower that goes away must not cancel the run
+                    body, error = await asyncio.shield(flight)
+                except asyncio.CancelledError:
+                    if flight.cancelled():
+                        continue  # the leader went away; take over
+                    raise
+                SINGLE_FLIGHT_REQUESTS.labels(route, "collapsed").inc()
+                if error is not None:
+                    raise error
+                return _respond(body, response)
+
+            SINGLE_FLIGHT_REQUESTS.labels(route, "leader").inc()
+            flight = asyncio.get_running_loop().create_future()
+            _in_flight[key] = flight
+            try:
+                body = await _serialize(request, await func(*args, **kwargs))
+            except asyncio.CancelledError:
+                flight.cancel()
+                raise
+            except Exception as exc:
+                flight.set_result((None, exc))
+                raise
+            else:
+                flight.set_result((body, None))
+            finally:
+                if _in_flight.get(key) is flight:
+                    del _in_flight[key]
+            return _respond(body, response)
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
+from uuid import UUID
 import jwt
 
 from app.core.database import get_db
 from app.core.auth import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
-    decode_token
+    PasswordHasherBusy
 )
+from app.core.auth_cache import auth_cache
 
 from app.schemas.user import UserCreate, UserOut
 from app.schemas.auth import LoginRequest, LoginResponse
@@ -20,10 +23,18 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Register a new user.
@@ -34,7 +45,7 @@ async def register(
     - **role**: User role (admin, manager, member) - defaults to member
     """
     # Check if user with email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,7 +53,7 @@ async def register(
         )
     
     # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,7 +61,10 @@ async def register(
         )
     
     # Create new user with hashed password
-    hashed_password = get_password_hash(user_data.password)
+    try:
+        hashed_password = await get_password_hash_async(user_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -59,8 +73,8 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
@@ -68,7 +82,7 @@ async def register(
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Login with email and password to receive an access token.
@@ -88,7 +102,7 @@ async def login(
     """
     try:
         # Find user by email
-        user = db.query(User).filter(User.email == login_data.email).first()
+        user = await db.scalar(select(User).where(User.email == login_data.email))
         
         # If user doesn't exist, create them automatically
         if not user:
@@ -96,7 +110,7 @@ async def login(
             username = login_data.email.split('@')[0]
             
             # Check if username already exists
-            username_exists = db.query(User).filter(User.username == username).first()
+            username_exists = await db.scalar(select(User).where(User.username == username))
             if username_exists:
                 # Add a random suffix to make it unique
                 import random
@@ -114,17 +128,17 @@ async def login(
             user = User(
                 username=username,
                 email=login_data.email,
-                password_hash=get_password_hash(login_data.password),
+                password_hash=await get_password_hash_async(login_data.password),
                 role=initial_role
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
             assigned_role = initial_role
         else:
             # Existing user - verify password
-            if not verify_password(login_data.password, user.password_hash):
+            if not await verify_password_async(login_data.password, user.password_hash):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect email or password",
@@ -140,21 +154,21 @@ async def login(
                 # Update user role in database if not already admin
                 if user.role != UserRole.admin:
                     user.role = UserRole.admin
-                    db.commit()
+                    await db.commit()
             # Check if manager secret code provided
             elif login_data.secret_code == "manager":
                 assigned_role = UserRole.manager
                 # Update user role in database if not already manager
                 if user.role != UserRole.manager:
                     user.role = UserRole.manager
-                    db.commit()
+                    await db.commit()
             # Otherwise, ensure user is a member (normal user)
             else:
                 # If no secret code and not admin, ensure role is member
                 if user.role != UserRole.member and login_data.email != "admin@example.com":
                     assigned_role = UserRole.member
                     user.role = UserRole.member
-                    db.commit()
+                    await db.commit()
         
         # Create access token with assigned role
         access_token = create_access_token(
@@ -169,6 +183,8 @@ async def login(
     
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     except Exception as e:
         # Log the actual error for debugging
         print(f"Login error: {type(e).__name__}: {str(e)}")
@@ -182,7 +198,7 @@ async def login(
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[AsyncSession, Depends(get_db)]
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
@@ -192,7 +208,7 @@ async def get_current_user(
     token = credentials.credentials
     
     try:
-        payload = decode_token(token)
+        payload = auth_cache.decode_token(token)
         user_id: str = payload.get("sub")
         
         if user_id is None:
@@ -201,15 +217,21 @@ async def get_current_user(
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-    except jwt.PyJWTError:
+        user_id = UUID(user_id)
+    except (jwt.PyJWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Serve from the auth cache when possible
+    user = auth_cache.get_user(user_id)
+    if user is not None:
+        return user
+    
     # Load user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if user is None:
         raise HTTPException(
@@ -218,6 +240,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    auth_cache.set_user(user)
     return user
 
 
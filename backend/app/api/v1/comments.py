@@ -1,61 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from typing import List, Optional
 from uuid import UUID
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.api.conditional import conditional_get
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 from app.models.user import User
 from app.models.task import Task
 from app.models.comment import Comment
+from app.models.change_version import VersionScope
 from app.schemas.comment import CommentCreate, CommentOut
 
 router = APIRouter(tags=["comments"])
 
 
-@router.get("/{task_id}", response_model=List[CommentOut])
-def get_task_comments(
+def comments_query(
     task_id: UUID,
-    db: Session = Depends(get_db),
+    since: Optional[datetime] = None,
+    after: Optional[list] = None,
+    limit: Optional[int] = None
+):
+    """
+    Comments of a task with their author names, oldest first.
+
+    ``after`` is the (created_at, id) of the last comment already seen; the
+    row-value comparison lets the database seek straight to it in
+    ix_comments_task_id_created_at_id.
+    """
+    query = (
+        select(
+            Comment.id,
+            Comment.task_id,
+            Comment.author_id,
+            Comment.message,
+            Comment.created_at,
+            User.username.label("author_name"),
+        )
+        .outerjoin(User, User.id == Comment.author_id)
+        .where(Comment.task_id == task_id)
+    )
+    if since is not None:
+        query = query.where(Comment.created_at > since)
+    if after is not None:
+        query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+    query = query.order_by(Comment.created_at.asc(), Comment.id.asc())
+    return query if limit is None else query.limit(limit)
+
+
+# Tasks: the 404 for a deleted task; users: author names
+@router.get(
+    "/{task_id}",
+    response_model=List[CommentOut],
+    dependencies=[Depends(conditional_get(VersionScope.COMMENTS, VersionScope.TASKS, VersionScope.USERS))],
+)
+async def get_task_comments(
+    task_id: UUID,
+    response: Response,
+    since: Optional[datetime] = Query(None, description="Only return comments created after this time"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return every comment"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all comments for a specific task.
+    Get comments for a specific task, oldest first.
     Users must be authenticated to view comments.
+
+    - **since**: fetch only comments newer than the last one the client has
+    - **limit** / **cursor**: page through comments; the next cursor is
+      returned in the ``X-Next-Cursor`` header (absent on the last page)
     """
     # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    task_exists = await db.scalar(select(Task.id).where(Task.id == task_id))
+    if not task_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    # Get all comments for this task, ordered by creation date
-    comments = db.query(Comment).filter(
-        Comment.task_id == task_id
-    ).order_by(Comment.created_at.asc()).all()
+    # created_at is stored as naive UTC; compare like with like
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    after = decode_cursor(cursor, [datetime, UUID]) if cursor else None
+    query = comments_query(task_id, since=since, after=after, limit=None if limit is None else limit + 1)
+    
+    rows = [dict(row) for row in (await db.execute(query)).mappings()]
+    
+    cursor_for_next = next_cursor(rows, limit, lambda row: [row["created_at"], row["id"]])
+    if cursor_for_next:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for_next
     
-    # Add author names to comments
-    result = []
-    for comment in comments:
-        comment_dict = {
-            "id": comment.id,
-            "task_id": comment.task_id,
-            "author_id": comment.author_id,
-            "message": comment.message,
-            "created_at": comment.created_at,
-            "author_name": comment.author.username if comment.author else "Unknown"
-        }
-        result.append(comment_dict)
+    for row in rows:
+        if row["author_name"] is None:
+            row["author_name"] = "Unknown"
     
-    return result
+    return rows
 
 
 @router.post("/", response_model=CommentOut, status_code=status.HTTP_201_CREATED)
-def create_comment(
+async def create_comment(
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -63,7 +112,7 @@ def create_comment(
     Users must be authenticated to create comments.
     """
     # Verify task exists
-    task = db.query(Task).filter(Task.id == comment_data.task_id).first()
+    task = await db.scalar(select(Task).where(Task.id == comment_data.task_id))
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,8 +127,8 @@ def create_comment(
     )
     
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await db.commit()
+    await db.refresh(new_comment)
     
     # Return comment with author name
     return {
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import user_from_token
+from app.core.config import settings
+from app.core.events import Subscription, broker
+from app.models.user import User
+
+router = APIRouter(tags=["events"])
+
+# Close code sent to a WebSocket consumer evicted for falling behind
+WS_EVICTED = status.WS_1013_TRY_AGAIN_LATER
+
+
+def _token(authorization: Optional[str], access_token: Optional[str]) -> str:
+    """
+    Token from an ``Authorization: Bearer`` header or, for clients that
+    cannot set headers (EventSource, browser WebSockets), the query string.
+    """
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    if access_token:
+        return access_token
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated"
+    )
+
+
+def _finished(subscription: Subscription) -> bool:
+    """An evicted consumer is done once its final resync message is sent."""
+    return subscription.evicted and subscription.queue.empty()
+
+
+async def _server_sent_events(user: User):
+    # Subscribe inside the generator so a client that disconnects before
+    # the stream starts never leaves a subscription behind
+    subscription = broker.subscribe(user)
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {message}\n\n"
+            if _finished(subscription):
+                return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="Token for clients that cannot send an Authorization header")
+):
+    """
+    Server-sent events: one ``data:`` line per change to a task, comment or
+    project the user can see, as JSON
+    ``{"type": "change", "entity", "action", "id", "data"}``.
+
+    A ``{"type": "resync"}`` message means the client fell too far behind
+    and was disconnected; it should refetch its lists and reconnect.
+    """
+    user = await user_from_token(_token(request.headers.get("authorization"), access_token))
+    return StreamingResponse(
+        _server_sent_events(user),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Clients only listen; anything they send is ignored
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        await websocket.send_text(await subscription.get())
+        if _finished(subscription):
+            await websocket.close(code=WS_EVICTED)
+            return
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket, access_token: Optional[str] = None):
+    """
+    The same change events as ``GET /api/v1/events/``, one JSON text
+    message each. Evicted consumers get the resync message and close code
+    1013.
+    """
+    try:
+        user = await user_from_token(_token(websocket.headers.get("authorization"), access_token))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = broker.subscribe(user)
+    # Two tasks for the life of the connection rather than a wait per
+    # message: with thousands of connections, each broadcast wakes every
+    # sender, and that wakeup is the whole per-connection cost
+    sender = asyncio.ensure_future(_send_events(websocket, subscription))
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        done, _ = await asyncio.wait({sender, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        disconnected.cancel()
+        broker.unsubscribe(subscription)
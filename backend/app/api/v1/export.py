@@ -0,0 +1,164 @@
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.replicas import read_replicas
+from app.api.dependencies import get_current_user
+from app.api.fast_json import OPTIONS, out_columns
+from app.api.visibility import apply_filter, visible_comments, visible_projects, visible_tasks
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+
+router = APIRouter(tags=["export"])
+
+
+class ExportEntity(str, Enum):
+    tasks = "tasks"
+    projects = "projects"
+    comments = "comments"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv"}
+
+
+def _in_projects(project_id: Optional[UUID], team_id: Optional[UUID]):
+    """Clause on ``Task.project_id`` for the project/team filters, or None."""
+    clause = None
+    if project_id is not None:
+        clause = Task.project_id == project_id
+    if team_id is not None:
+        in_team = Task.project_id.in_(select(Project.id).where(Project.team_id == team_id))
+        clause = in_team if clause is None else clause & in_team
+    return clause
+
+
+def export_query(
+    entity: ExportEntity,
+    user: User,
+    project_id: Optional[UUID] = None,
+    team_id: Optional[UUID] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """
+    Rows of ``entity`` the user can see, with the columns of its ``*Out``
+    schema. No ORDER BY, so rows stream in scan order as soon as they are
+    read instead of after a sort of the whole table.
+    """
+    if entity == ExportEntity.tasks:
+        model = Task
+        query = apply_filter(select(*out_columns(TaskOut, Task)), visible_tasks(user))
+        query = apply_filter(query, _in_projects(project_id, team_id))
+    elif entity == ExportEntity.projects:
+        model = Project
+        query = apply_filter(select(*out_columns(ProjectOut, Project)), visible_projects(user))
+        if project_id is not None:
+            query = query.where(Project.id == project_id)
+        if team_id is not None:
+            query = query.where(Project.team_id == team_id)
+    else:
+        model = Comment
+        query = apply_filter(
+            select(
+                Comment.id,
+                Comment.task_id,
+                Comment.author_id,
+                Comment.message,
+                Comment.created_at,
+                User.username.label("author_name"),
+            ).outerjoin(User, User.id == Comment.author_id),
+            visible_comments(user),
+        )
+        tasks = _in_projects(project_id, team_id)
+        if tasks is not None:
+            query = query.where(Comment.task_id.in_(select(Task.id).where(tasks)))
+    if created_from is not None:
+        query = query.where(model.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(model.created_at < created_to)
+    return query
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        # Same text as the JSON exports
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(keys, rows) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(keys, row)), option=OPTIONS) + b"\n" for row in rows)
+
+
+def encode_csv(rows, header=None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_export(query, user: User, fmt: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Encoded chunks of ``query``'s rows, ``EXPORT_CHUNK_ROWS`` at a time.
+
+    The session is opened here rather than taken from a dependency, whose
+    session is closed before the response body is sent. Rows come from a
+    server-side cursor, so neither the database driver nor this worker
+    holds more than one chunk.
+    """
+    async with read_replicas.session(user.id) as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS))
+        keys = list(result.keys())
+        if fmt == ExportFormat.csv:
+            yield encode_csv([], header=keys)
+        async for rows in result.partitions():
+            yield encode_ndjson(keys, rows) if fmt == ExportFormat.ndjson else encode_csv(rows)
+
+
+@router.get("/{entity}")
+async def export(
+    entity: ExportEntity,
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson (one JSON object per line) or csv"),
+    project_id: Optional[UUID] = Query(None, description="Only rows of this project"),
+    team_id: Optional[UUID] = Query(None, description="Only rows of this team's projects"),
+    created_from: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream every task, project or comment the user can see, with the same
+    fields and visibility as the list endpoints, in no particular order.
+
+    Rows are read through a server-side cursor and sent as they are
+    encoded, so memory use does not depend on how many rows are exported.
+    """
+    query = export_query(entity, current_user, project_id, team_id, created_from, created_to)
+    return StreamingResponse(
+        stream_export(query, current_user, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{fmt.value}"'},
+    )
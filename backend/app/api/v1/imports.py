@@ -0,0 +1,57 @@
+import io
+import tempfile
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from app.api.dependencies import require_admin
+from app.core.database import engine
+from app.core.importer import ImportEntity, ImportFormat, import_records, read_records
+from app.models.user import User
+
+router = APIRouter(tags=["import"])
+
+# Request bodies above this size are spooled to disk
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def _format_for(content_type: str) -> ImportFormat:
+    return ImportFormat.csv if "csv" in content_type else ImportFormat.jsonl
+
+
+def _progress_lines(entity: ImportEntity, body, fmt: ImportFormat) -> Iterator[bytes]:
+    with body:
+        stream = io.TextIOWrapper(body, encoding="utf-8-sig", newline="")
+        for progress in import_records(engine, entity, read_records(stream, fmt)):
+            yield progress.model_dump_json().encode() + b"\n"
+
+
+@router.post("/{entity}")
+async def import_file(
+    entity: ImportEntity,
+    request: Request,
+    fmt: Optional[ImportFormat] = Query(
+        None, alias="format", description="csv or jsonl; taken from the Content-Type when not given"
+    ),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Import projects, tasks or comments from a CSV or JSONL request body
+    (admin only). See ``app.core.importer`` for the columns and how
+    references are resolved.
+
+    The body is spooled to a temporary file, then imported in chunks of
+    ``IMPORT_CHUNK_ROWS`` rows, one transaction each. The response streams
+    one JSON progress line per chunk, with the line number and reason of
+    every row that was skipped; the last line has ``done`` set.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    async for chunk in request.stream():
+        body.write(chunk)
+    body.seek(0)
+    fmt = fmt or _format_for(request.headers.get("content-type", ""))
+    return StreamingResponse(
+        iterate_in_threadpool(_progress_lines(entity, body, fmt)), media_type="application/x-ndjson"
+    )
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
@@ -7,16 +8,32 @@ from app.core.database import get_db
 from app.models.project import Project, ProjectStatus
 from app.models.user import User, UserRole
 from app.models.team import Team
+from app.models.change_version import VersionScope
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectOut
-from app.api.dependencies import get_current_user
+from app.api.conditional import conditional_get
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.fast_json import json_rows, out_columns
+from app.api.single_flight import per_user, single_flight
+from app.api.visibility import apply_filter, visible_projects
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[ProjectOut])
+def _list_audience(user: User):
+    # Everyone but managers lists every project
+    return "all" if visible_projects(user) is None else per_user(user)
+
+
+@router.get(
+    "/",
+    response_model=List[ProjectOut],
+    dependencies=[Depends(conditional_get(VersionScope.PROJECTS))],
+)
+@single_flight(_list_audience)
 async def list_projects(
+    response: Response,
     status_filter: Optional[str] = Query(None, description="Filter by status: active or completed"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -24,20 +41,11 @@ async def list_projects(
     - Admins: can see all projects
     - Managers: can see projects they manage
     - Members: can see projects from their teams
+
+    Rows are encoded with orjson (``app.api.fast_json``).
     """
-    query = db.query(Project)
-    
     # Apply role-based filtering
-    if current_user.role == UserRole.admin:
-        # Admins see all projects
-        pass
-    elif current_user.role == UserRole.manager:
-        # Managers see only projects they manage
-        query = query.filter(Project.manager_id == current_user.id)
-    else:
-        # Members see projects from teams they're part of
-        # For now, allow them to see all (you can customize this based on team membership)
-        pass
+    query = apply_filter(select(*out_columns(ProjectOut, Project)), visible_projects(current_user))
     
     # Apply status filter if provided
     if status_filter:
@@ -46,22 +54,25 @@ async def list_projects(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid status. Must be 'active' or 'completed'"
             )
-        query = query.filter(Project.status == ProjectStatus(status_filter))
+        query = query.where(Project.status == ProjectStatus(status_filter))
     
-    projects = query.all()
-    return projects
+    return json_rows(ProjectOut, (await db.execute(query)).all(), response)
 
 
-@router.get("/{project_id}", response_model=ProjectOut)
+@router.get(
+    "/{project_id}",
+    response_model=ProjectOut,
+    dependencies=[Depends(conditional_get(VersionScope.PROJECTS))],
+)
 async def get_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(select(Project).where(Project.id == project_id))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,7 +92,7 @@ async def get_project(
 @router.post("/", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -96,7 +107,7 @@ async def create_project(
         )
     
     # Verify team exists
-    team = db.query(Team).filter(Team.id == project_data.team_id).first()
+    team = await db.scalar(select(Team).where(Team.id == project_data.team_id))
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,8 +132,8 @@ async def create_project(
     )
     
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     
     return project
 
@@ -131,13 +142,13 @@ async def create_project(
 async def update_project(
     project_id: UUID,
     project_data: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update a project. Only the project manager or admins can update.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(select(Project).where(Project.id == project_id))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -158,7 +169,7 @@ async def update_project(
         project.description = project_data.description
     if project_data.team_id is not None:
         # Verify team exists
-        team = db.query(Team).filter(Team.id == project_data.team_id).first()
+        team = await db.scalar(select(Team).where(Team.id == project_data.team_id))
         if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -172,8 +183,8 @@ async def update_project(
     if project_data.end_date is not None:
         project.end_date = project_data.end_date
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     
     return project
 
@@ -181,7 +192,7 @@ async def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -193,14 +204,14 @@ async def delete_project(
             detail="Only admins can delete projects"
         )
     
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(select(Project).where(Project.id == project_id))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
     
     return None
@@ -0,0 +1,184 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.visibility import apply_filter, visible_tasks
+from app.core.config import settings
+from app.core.search_index import COMMENT_DOCUMENT, TASK_DOCUMENT, TS_CONFIG, fts5_match, search_terms, tsquery
+from app.models.comment import Comment
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.search import CommentSearchHit, SearchResults, TaskSearchHit
+
+router = APIRouter(tags=["search"])
+
+# bm25 column weights for tasks_fts (title, description)
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_tasks_fts = table("tasks_fts", column("rowid"))
+_comments_fts = table("comments_fts", column("rowid"))
+
+
+def _comment_columns(score):
+    return (
+        Comment.id,
+        Comment.task_id,
+        Comment.author_id,
+        Comment.message,
+        Comment.created_at,
+        User.username.label("author_name"),
+        score.label("score"),
+    )
+
+
+def sqlite_search_queries(user: User, terms: list, limit: int):
+    """
+    FTS5 queries for tasks and comments; bm25 is lower for better matches.
+
+    Only the newest ``SEARCH_MAX_CANDIDATES`` visible matches are ranked.
+    Visibility is checked against the set of visible rowids while scanning
+    the FTS index (the ``+`` keeps SQLite from probing the index once per
+    visible row, which is far slower for common words).
+    """
+    match = fts5_match(terms)
+    visible = visible_tasks(user)
+
+    task_score = func.bm25(literal_column("tasks_fts"), TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    task_candidates = (
+        select(_tasks_fts.c.rowid, task_score.label("score"))
+        .where(literal_column("tasks_fts").op("MATCH")(match))
+    )
+    if visible is not None:
+        task_candidates = task_candidates.where(literal_column("+tasks_fts.rowid").in_(
+            select(literal_column("tasks.rowid")).select_from(Task).where(visible)
+        ))
+    task_candidates = task_candidates.order_by(
+        _tasks_fts.c.rowid.desc()
+    ).limit(settings.SEARCH_MAX_CANDIDATES).subquery("candidates")
+    tasks = (
+        select(Task, task_candidates.c.score)
+        .join_from(task_candidates, Task, literal_column("tasks.rowid") == task_candidates.c.rowid)
+        .order_by(task_candidates.c.score)
+        .limit(limit)
+    )
+
+    comment_candidates = (
+        select(_comments_fts.c.rowid, func.bm25(literal_column("comments_fts")).label("score"))
+        .where(literal_column("comments_fts").op("MATCH")(match))
+    )
+    if visible is not None:
+        comment_candidates = comment_candidates.where(literal_column("+comments_fts.rowid").in_(
+            select(literal_column("comments.rowid"))
+            .select_from(Comment)
+            .join(Task, Task.id == Comment.task_id)
+            .where(visible)
+        ))
+    comment_candidates = comment_candidates.order_by(
+        _comments_fts.c.rowid.desc()
+    ).limit(settings.SEARCH_MAX_CANDIDATES).subquery("candidates")
+    comments = (
+        select(*_comment_columns(comment_candidates.c.score))
+        .select_from(comment_candidates)
+        .join(Comment, literal_column("comments.rowid") == comment_candidates.c.rowid)
+        .outerjoin(User, User.id == Comment.author_id)
+        .order_by(comment_candidates.c.score)
+        .limit(limit)
+    )
+
+    return tasks, comments
+
+
+def postgres_search_queries(user: User, terms: list, limit: int):
+    """
+    ``tsvector`` queries that match the GIN expression indexes; ts_rank_cd
+    is higher for better matches. Only the newest ``SEARCH_MAX_CANDIDATES``
+    visible matches are ranked.
+    """
+    query = func.to_tsquery(literal_column(f"'{TS_CONFIG}'"), tsquery(terms))
+    visible = visible_tasks(user)
+
+    task_document = literal_column(f"({TASK_DOCUMENT})")
+    task_candidates = apply_filter(
+        select(Task.id, func.ts_rank_cd(task_document, query).label("score"))
+        .where(task_document.op("@@")(query)),
+        visible
+    ).order_by(Task.created_at.desc()).limit(settings.SEARCH_MAX_CANDIDATES).subquery("candidates")
+    tasks = (
+        select(Task, task_candidates.c.score)
+        .join(task_candidates, Task.id == task_candidates.c.id)
+        .order_by(task_candidates.c.score.desc())
+        .limit(limit)
+    )
+
+    comment_document = literal_column(f"({COMMENT_DOCUMENT})")
+    comment_candidates = apply_filter(
+        select(Comment.id, func.ts_rank_cd(comment_document, query).label("score"))
+        .join(Task, Task.id == Comment.task_id)
+        .where(comment_document.op("@@")(query)),
+        visible
+    ).order_by(Comment.created_at.desc()).limit(settings.SEARCH_MAX_CANDIDATES).subquery("candidates")
+    comments = (
+        select(*_comment_columns(comment_candidates.c.score))
+        .join(comment_candidates, Comment.id == comment_candidates.c.id)
+        .outerjoin(User, User.id == Comment.author_id)
+        .order_by(comment_candidates.c.score.desc())
+        .limit(limit)
+    )
+
+    return tasks, comments
+
+
+SEARCH_QUERIES = {
+    "sqlite": sqlite_search_queries,
+    "postgresql": postgres_search_queries,
+}
+
+
+@router.get("/", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for; the last one also matches as a prefix"),
+    limit: int = Query(20, ge=1, le=100, description="Max results per kind"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search task titles/descriptions and comment messages, best matches first.
+
+    Only tasks the user can see in ``list_tasks`` (and comments on them) are
+    returned, and only the newest ``SEARCH_MAX_CANDIDATES`` matches of each
+    kind are ranked. Every word must match; the last word also matches as a prefix
+    so results can update while the user types.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return SearchResults(tasks=[], comments=[])
+
+    build = SEARCH_QUERIES.get(db.bind.dialect.name)
+    if build is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available on this database backend"
+        )
+    tasks_query, comments_query = build(current_user, terms, limit)
+
+    tasks = [
+        TaskSearchHit(
+            id=task.id,
+            title=task.title,
+            description=task.description,
+            project_id=task.project_id,
+            assigned_to=task.assigned_to,
+            status=task.status.value,
+            due_date=task.due_date,
+            created_at=task.created_at,
+            score=score,
+        )
+        for task, score in (await db.execute(tasks_query)).all()
+    ]
+    comments = [
+        CommentSearchHit(**{**row, "author_name": row["author_name"] or "Unknown"})
+        for row in (await db.execute(comments_query)).mappings()
+    ]
+    return SearchResults(tasks=tasks, comments=comments)
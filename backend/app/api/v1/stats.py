@@ -1,21 +1,42 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.core.auth_cache import auth_cache
+from app.core.stats_counters import counters_query
+from app.api.conditional import conditional_get
+from app.api.dependencies import get_current_user, get_read_db, require_admin
+from app.api.single_flight import per_user, single_flight
 from app.models.user import User, UserRole
-from app.models.project import Project, ProjectStatus
-from app.models.task import Task, TaskStatus
-from app.models.team import Team
-from app.schemas.stats import StatsOverview, ProjectStats, TaskStats
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus
+from app.models.stats_counter import CounterScope, CounterEntity
+from app.models.change_version import VersionScope
+from app.schemas.stats import StatsOverview, ProjectStats, TaskStats, AuthCacheStats
 
 router = APIRouter(tags=["stats"])
 
 
-@router.get("/overview", response_model=StatsOverview)
-def get_stats_overview(
-    db: Session = Depends(get_db),
+def _value(counters: Dict[tuple, int], scope: tuple, entity: str, status: str = "") -> int:
+    return counters.get((scope, entity, status), 0)
+
+
+def _overview_audience(user: User):
+    # Admins only read the global counters, so they all get the same overview
+    return "admin" if user.role == UserRole.admin else per_user(user)
+
+
+@router.get(
+    "/overview",
+    response_model=StatsOverview,
+    dependencies=[Depends(conditional_get(
+        VersionScope.TASKS, VersionScope.PROJECTS, VersionScope.TEAMS, VersionScope.USERS
+    ))],
+)
+@single_flight(_overview_audience)
+async def get_stats_overview(
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -23,67 +44,85 @@ def get_stats_overview(
     - Admins see all stats
     - Managers see stats for their projects/teams
     - Members see stats for tasks assigned to them
+
+    Counts are read from the incrementally maintained ``stats_counters``
+    table in a single query, so the cost does not grow with the number of
+    projects or tasks. Concurrent identical requests share one run
+    (``@single_flight``).
     """
+    user_id = str(current_user.id)
+    global_scope = (CounterScope.GLOBAL, "")
+    manager_scope = (CounterScope.MANAGER, user_id)
+    assignee_scope = (CounterScope.ASSIGNEE, user_id)
+    overlap_scope = (CounterScope.MANAGER_ASSIGNEE, user_id)
+    member_scope = (CounterScope.MEMBER, user_id)
     
-    # Project stats
-    project_query = db.query(Project)
-    
-    if current_user.role == UserRole.manager:
-        # Managers see only their projects
-        project_query = project_query.filter(Project.manager_id == current_user.id)
-    elif current_user.role == UserRole.member:
-        # Members see projects they have tasks in
-        member_project_ids = db.query(Task.project_id).filter(
-            Task.assigned_to == current_user.id
-        ).distinct().all()
-        member_project_ids = [p[0] for p in member_project_ids]
-        project_query = project_query.filter(Project.id.in_(member_project_ids))
+    if current_user.role == UserRole.admin:
+        scopes = [global_scope]
+    elif current_user.role == UserRole.manager:
+        scopes = [global_scope, manager_scope, assignee_scope, overlap_scope]
+    else:
+        scopes = [global_scope, assignee_scope, member_scope]
     
-    # Count projects by status
-    total_projects = project_query.count()
-    active_projects = project_query.filter(Project.status == ProjectStatus.active).count()
-    completed_projects = project_query.filter(Project.status == ProjectStatus.completed).count()
+    counters = {
+        ((scope_type, scope_id), entity, status): value
+        for scope_type, scope_id, entity, status, value
+        in await db.execute(counters_query(scopes))
+    }
     
-    # Task stats
-    task_query = db.query(Task)
+    def project_count(status: ProjectStatus) -> int:
+        if current_user.role == UserRole.admin:
+            # Admins see all projects
+            return _value(counters, global_scope, CounterEntity.PROJECT, status.value)
+        if current_user.role == UserRole.manager:
+            # Managers see only their projects
+            return _value(counters, manager_scope, CounterEntity.PROJECT, status.value)
+        # Members see projects they have tasks in
+        return _value(counters, member_scope, CounterEntity.PROJECT, status.value)
     
-    if current_user.role == UserRole.member:
+    def task_count(status: TaskStatus) -> int:
+        if current_user.role == UserRole.admin:
+            return _value(counters, global_scope, CounterEntity.TASK, status.value)
+        if current_user.role == UserRole.manager:
+            # Tasks in their projects + tasks assigned to them, without double
+            # counting tasks that are both
+            return (
+                _value(counters, manager_scope, CounterEntity.TASK, status.value)
+                + _value(counters, assignee_scope, CounterEntity.TASK, status.value)
+                - _value(counters, overlap_scope, CounterEntity.TASK, status.value)
+            )
         # Members see only their tasks
-        task_query = task_query.filter(Task.assigned_to == current_user.id)
-    elif current_user.role == UserRole.manager:
-        # Managers see tasks in their projects + tasks assigned to them
-        managed_project_ids = db.query(Project.id).filter(
-            Project.manager_id == current_user.id
-        ).all()
-        managed_project_ids = [p[0] for p in managed_project_ids]
-        
-        task_query = task_query.filter(
-            (Task.project_id.in_(managed_project_ids)) | 
-            (Task.assigned_to == current_user.id)
-        )
+        return _value(counters, assignee_scope, CounterEntity.TASK, status.value)
     
-    # Count tasks by status
-    total_tasks = task_query.count()
-    todo_tasks = task_query.filter(Task.status == TaskStatus.TODO).count()
-    in_progress_tasks = task_query.filter(Task.status == TaskStatus.IN_PROGRESS).count()
-    done_tasks = task_query.filter(Task.status == TaskStatus.DONE).count()
-    
-    # Team and user counts (all users see all teams and users)
-    total_teams = db.query(Team).count()
-    total_users = db.query(User).count()
+    active_projects = project_count(ProjectStatus.active)
+    completed_projects = project_count(ProjectStatus.completed)
+    todo_tasks = task_count(TaskStatus.TODO)
+    in_progress_tasks = task_count(TaskStatus.IN_PROGRESS)
+    done_tasks = task_count(TaskStatus.DONE)
     
     return StatsOverview(
         projects=ProjectStats(
             active=active_projects,
             completed=completed_projects,
-            total=total_projects
+            total=active_projects + completed_projects
         ),
         tasks=TaskStats(
             todo=todo_tasks,
             in_progress=in_progress_tasks,
             done=done_tasks,
-            total=total_tasks
+            total=todo_tasks + in_progress_tasks + done_tasks
         ),
-        teams=total_teams,
-        users=total_users
+        # All users see all teams and users
+        teams=_value(counters, global_scope, CounterEntity.TEAM),
+        users=_value(counters, global_scope, CounterEntity.USER)
     )
+
+
+@router.get("/auth-cache", response_model=AuthCacheStats)
+async def get_auth_cache_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get hit/miss counters for the in-process auth cache. Admin only.
+    """
+    return AuthCacheStats(**auth_cache.stats())
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.tombstones import retention_cutoff
+from app.api.dependencies import get_current_user
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.visibility import apply_filter, visible_comments, visible_projects, visible_tasks, visible_tombstones
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.team import Team
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.schemas.sync import SyncChanges
+
+router = APIRouter(tags=["sync"])
+
+# Each stream is read in (updated_at, id) order, tombstones in
+# (deleted_at, id) order; the cursor holds the position reached in each
+STREAMS = ("tasks", "projects", "teams", "comments", "deleted")
+CURSOR_TYPES = [(datetime, type(None)), (UUID, type(None))] * len(STREAMS)
+
+Position = Tuple[Optional[datetime], Optional[UUID]]
+_START: Position = (None, None)
+_NIL = UUID(int=0)
+
+
+def _decode(since: Optional[str]) -> List[Position]:
+    if since is None:
+        return [_START] * len(STREAMS)
+    values = decode_cursor(since, CURSOR_TYPES)
+    return [(values[i], values[i + 1]) for i in range(0, len(values), 2)]
+
+
+def _encode(positions: List[Position]) -> str:
+    return encode_cursor([value for position in positions for value in position])
+
+
+def _after(columns, position: Position):
+    """Rows past ``position`` in ``columns`` order."""
+    if position[0] is None:
+        return true()
+    return tuple_(*columns) > tuple_(*position)
+
+
+def _advance(position: Position, rows: list, limit: int, key, horizon: datetime) -> Tuple[Position, bool]:
+    """
+    Trim a stream fetched with ``limit + 1`` rows; return its new position
+    and whether more rows are waiting.
+
+    A stream that is caught up never moves past ``horizon``: a row stamped
+    before the last one returned may still be committing, and stopping
+    short means it is picked up next time (clients upsert by id, so rows
+    sent twice are harmless).
+    """
+    more = len(rows) > limit
+    del rows[limit:]
+    if rows:
+        position = key(rows[-1])
+    if not more and (position[0] is None or position[0] > horizon):
+        position = (horizon, _NIL)
+    return position, more
+
+
+def _updated_key(row) -> Position:
+    return row.updated_at, row.id
+
+
+def _deleted_key(row) -> Position:
+    return row.deleted_at, row.id
+
+
+# Reads from the primary: on a lagging replica a caught-up cursor would
+# move past rows the replica has not applied yet
+@router.get("/", response_model=SyncChanges)
+async def sync(
+    since: Optional[str] = Query(None, description="Cursor from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Max rows per kind (tasks, projects, ...)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Tasks, projects, teams and comments created or updated since ``since``,
+    and the ones deleted or no longer visible to the user (``deleted``).
+    Visibility is the same as in the list endpoints.
+
+    Without ``since`` every visible row is returned. Keep calling with the
+    returned ``cursor`` while ``has_more`` is true. Clients upsert rows by
+    id; a row may be sent again. A cursor older than the tombstone
+    retention (``SYNC_TOMBSTONE_RETENTION_DAYS``) is rejected with 410:
+    sync again from scratch.
+    """
+    positions = _decode(since)
+    horizon = datetime.utcnow() - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+    tasks_at, projects_at, teams_at, comments_at, deleted_at = positions
+    if since is None:
+        # A full sync has nothing to drop; deletes from here on count
+        deleted_at = (horizon, _NIL)
+    elif deleted_at[0] is not None and deleted_at[0] < retention_cutoff():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor expired; sync again without since"
+        )
+
+    def page(query, columns, position):
+        return query.where(_after(columns, position)).order_by(*columns).limit(limit + 1)
+
+    task_key = (Task.updated_at, Task.id)
+    tasks = list((await db.scalars(page(
+        apply_filter(select(Task), visible_tasks(current_user)), task_key, tasks_at
+    ))).all())
+    project_key = (Project.updated_at, Project.id)
+    projects = list((await db.scalars(page(
+        apply_filter(select(Project), visible_projects(current_user)), project_key, projects_at
+    ))).all())
+    team_key = (Team.updated_at, Team.id)
+    teams = list((await db.scalars(page(select(Team), team_key, teams_at))).all())
+    comment_key = (Comment.updated_at, Comment.id)
+    comments = list((await db.execute(page(
+        apply_filter(
+            select(
+                Comment.id,
+                Comment.task_id,
+                Comment.author_id,
+                Comment.message,
+                Comment.created_at,
+                Comment.updated_at,
+                User.username.label("author_name"),
+            ).outerjoin(User, User.id == Comment.author_id),
+            visible_comments(current_user),
+        ),
+        comment_key,
+        comments_at,
+    ))).all())
+    deleted = []
+    if since is not None:
+        tombstone_key = (Tombstone.deleted_at, Tombstone.id)
+        deleted = list((await db.execute(page(
+            select(Tombstone.id, Tombstone.entity, Tombstone.entity_id, Tombstone.deleted_at)
+            .where(visible_tombstones(current_user)),
+            tombstone_key,
+            deleted_at,
+        ))).all())
+
+    streams = [
+        (tasks, tasks_at, _updated_key),
+        (projects, projects_at, _updated_key),
+        (teams, teams_at, _updated_key),
+        (comments, comments_at, _updated_key),
+        (deleted, deleted_at, _deleted_key),
+    ]
+    new_positions, has_more = [], False
+    for rows, position, key in streams:
+        position, more = _advance(position, rows, limit, key, horizon)
+        new_positions.append(position)
+        has_more = has_more or more
+
+    return {
+        "tasks": tasks,
+        "projects": projects,
+        "teams": teams,
+        "comments": comments,
+        "deleted": [{"entity": row.entity, "id": row.entity_id} for row in deleted],
+        "cursor": _encode(new_positions),
+        "has_more": has_more,
+    }
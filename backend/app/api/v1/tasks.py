@@ -1,73 +1,188 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_user, require_role
+from app.api.conditional import conditional_get
+from app.api.fast_json import json_rows, out_columns
+from app.api.dependencies import get_current_user, get_read_db, require_role
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.api.visibility import apply_filter, can_access_task, load_task_with_manager, visible_tasks
 from app.models.user import User, UserRole
 from app.models.task import Task, TaskStatus
 from app.models.project import Project
-from app.schemas.task import TaskCreate, TaskUpdate, TaskOut
+from app.models.comment import Comment
+from app.models.change_version import VersionScope
+from app.schemas.task import (
+    TaskBulkRequest,
+    TaskBulkResponse,
+    TaskBulkResult,
+    TaskCreate,
+    TaskOut,
+    TaskUpdate,
+)
 
 router = APIRouter(tags=["tasks"])
 
 
-@router.get("/", response_model=List[TaskOut])
-def list_tasks(
-    status_filter: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+# Types of the (due_date, created_at, id) values in a task cursor
+CURSOR_TYPES = [(datetime, type(None)), datetime, UUID]
+
+
+def _task_sort_key(task: Task) -> list:
+    return [task.due_date, task.created_at, task.id]
+
+
+def page_segments(cursor_values: Optional[list]) -> list:
     """
-    List tasks for the current user.
-    - Members see only their assigned tasks
-    - Managers see tasks in their projects
-    - Admins see all tasks
+    Keyset filters for the rows after a cursor in
+    ``due_date ASC NULLS LAST, created_at DESC, id ASC`` order, one per
+    due_date segment (dated tasks first, then undated ones).
+
+    Each filter starts with a range on ``due_date`` so the page is a range
+    scan of ix_tasks_due_date_created_at_id; a single OR spanning the NULL
+    boundary would force the database to read and sort every later row.
     """
-    query = db.query(Task)
-    
-    if current_user.role == UserRole.member:
-        # Members see only tasks assigned to them
-        query = query.filter(Task.assigned_to == current_user.id)
-    elif current_user.role == UserRole.manager:
-        # Managers see tasks in projects they manage
-        managed_project_ids = db.query(Project.id).filter(
-            Project.manager_id == current_user.id
-        ).all()
-        managed_project_ids = [p[0] for p in managed_project_ids]
-        
-        # Also include tasks assigned to them
-        query = query.filter(
-            (Task.project_id.in_(managed_project_ids)) | 
-            (Task.assigned_to == current_user.id)
-        )
-    # Admins see all tasks (no filter needed)
+    if cursor_values is None:
+        return [Task.due_date.isnot(None), Task.due_date.is_(None)]
+    due_date, created_at, task_id = cursor_values
+    tail = and_(
+        Task.created_at <= created_at,
+        or_(Task.created_at < created_at, Task.id > task_id)
+    )
+    if due_date is None:
+        return [and_(Task.due_date.is_(None), tail)]
+    return [
+        and_(Task.due_date >= due_date, or_(Task.due_date > due_date, tail)),
+        Task.due_date.is_(None),
+    ]
+
+
+def task_page_query(query, segment, limit: Optional[int]):
+    """
+    One segment of a ``list_tasks`` page: ``query`` (visibility and status
+    filters applied) restricted to ``segment`` in list order.
+    """
+    page = query.where(segment).order_by(Task.due_date.asc(), Task.created_at.desc(), Task.id.asc())
+    return page if limit is None else page.limit(limit)
+
+
+def _parse_status(value: str) -> Optional[TaskStatus]:
+    try:
+        return TaskStatus[value.upper()]
+    except KeyError:
+        return None
+
+
+def _invalid_status(value: str) -> str:
+    return f"Invalid status: {value}. Must be one of: todo, in_progress, done"
+
+
+def _update_denied(user: User, task: Task, project_manager_id: Optional[UUID], task_data: TaskUpdate) -> Optional[str]:
+    """
+    Why ``user`` may not apply ``task_data`` to ``task``, or None if allowed.
+    - Members can only update status of their own tasks
+    - Managers can update tasks in their projects or assigned to them
+    - Admins can update any task
+    """
+    if user.role == UserRole.member:
+        if not can_access_task(user, task, project_manager_id):
+            return "You can only update your own tasks"
+        if task_data.title or task_data.description or task_data.assigned_to or task_data.due_date:
+            return "Members can only update task status"
+    elif not can_access_task(user, task, project_manager_id):
+        return "You can only update tasks in your projects or assigned to you"
+    return None
+
+
+def _task_out(task: Task) -> TaskOut:
+    return TaskOut(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        project_id=task.project_id,
+        assigned_to=task.assigned_to,
+        status=task.status.value if isinstance(task.status, TaskStatus) else task.status,
+        due_date=task.due_date,
+        created_at=task.created_at,
+    )
+
+
+def task_list_query(user: User, status_filter: Optional[str] = None):
+    """
+    The ``list_tasks`` query before ordering and paging: the ``TaskOut``
+    columns of the tasks the user can see, optionally with one status.
+    """
+    query = apply_filter(select(*out_columns(TaskOut, Task)), visible_tasks(user))
     
     # Apply status filter if provided
     if status_filter and status_filter != "all":
         try:
             status_enum = TaskStatus[status_filter.upper()]
-            query = query.filter(Task.status == status_enum)
+            query = query.where(Task.status == status_enum)
         except KeyError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status filter: {status_filter}"
             )
+    return query
+
+
+# Manager visibility depends on who manages each project
+@router.get(
+    "/",
+    response_model=List[TaskOut],
+    dependencies=[Depends(conditional_get(VersionScope.TASKS, VersionScope.PROJECTS))],
+)
+async def list_tasks(
+    response: Response,
+    status_filter: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return every task"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List tasks for the current user.
+    - Members see only their assigned tasks
+    - Managers see tasks in their projects
+    - Admins see all tasks
+
+    Pass ``limit`` to page through results; the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header (absent on the last page).
+
+    Rows are selected as columns and encoded with orjson (``app.api.fast_json``);
+    ``TaskOut`` only describes the response.
+    """
+    query = task_list_query(current_user, status_filter)
     
-    tasks = query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc()).all()
+    if limit is None and not cursor:
+        query = query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc(), Task.id.asc())
+        tasks = list((await db.execute(query)).all())
+    else:
+        # Fetch segment by segment until the page (plus one look-ahead row) is full
+        cursor_values = decode_cursor(cursor, CURSOR_TYPES) if cursor else None
+        tasks = []
+        for segment in page_segments(cursor_values):
+            remaining = None if limit is None else limit + 1 - len(tasks)
+            tasks.extend((await db.execute(task_page_query(query, segment, remaining))).all())
+            if limit is not None and len(tasks) > limit:
+                break
     
-    # Convert enum to string for JSON serialization
-    for task in tasks:
-        task.status = task.status.value
+    cursor_for_next = next_cursor(tasks, limit, _task_sort_key)
+    if cursor_for_next:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for_next
     
-    return tasks
+    return json_rows(TaskOut, tasks, response)
 
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.manager, UserRole.admin]))
 ):
     """
@@ -75,7 +190,7 @@ def create_task(
     Managers can only create tasks for projects they manage.
     """
     # Verify project exists
-    project = db.query(Project).filter(Project.id == task_data.project_id).first()
+    project = await db.scalar(select(Project).where(Project.id == task_data.project_id))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,7 +205,7 @@ def create_task(
         )
     
     # Verify assignee exists
-    assignee = db.query(User).filter(User.id == task_data.assigned_to).first()
+    assignee = await db.scalar(select(User).where(User.id == task_data.assigned_to))
     if not assignee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,8 +231,8 @@ def create_task(
     )
     
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
+    await db.refresh(new_task)
     
     # Convert enum to string for JSON serialization
     new_task.status = new_task.status.value
@@ -125,11 +240,170 @@ def create_task(
     return new_task
 
 
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_tasks(
+    request: TaskBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create, update and delete many tasks in one transaction.
+
+    Every referenced project, user and task is loaded with a single ``IN``
+    query per table, permissions are checked in memory with the same rules
+    as the single-task endpoints, and all changes are flushed together.
+
+    Each operation gets a result with an HTTP-style status (201, 200, 204 or
+    the error code the single endpoint would return). Failed operations are
+    skipped; with ``atomic`` set, any failure leaves everything unchanged.
+    """
+    operations = request.operations
+    creates = [op.create for op in operations if op.op == "create" and op.create]
+    updates = [op.update for op in operations if op.op == "update" and op.update]
+    project_ids = {data.project_id for data in creates}
+    user_ids = {data.assigned_to for data in creates} | {
+        data.assigned_to for data in updates if data.assigned_to is not None
+    }
+    task_ids = {op.id for op in operations if op.op in ("update", "delete") and op.id}
+    delete_ids = {op.id for op in operations if op.op == "delete" and op.id}
+    
+    project_managers = dict((await db.execute(
+        select(Project.id, Project.manager_id).where(Project.id.in_(project_ids))
+    )).all()) if project_ids else {}
+    existing_users = set((await db.scalars(
+        select(User.id).where(User.id.in_(user_ids))
+    )).all()) if user_ids else set()
+    tasks = {
+        task.id: (task, manager_id)
+        for task, manager_id in (await db.execute(
+            select(Task, Project.manager_id)
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(Task.id.in_(task_ids))
+        )).all()
+    } if task_ids else {}
+    # Comments reference their task, so such tasks cannot be deleted
+    commented = set((await db.scalars(
+        select(Comment.task_id).where(Comment.task_id.in_(delete_ids)).distinct()
+    )).all()) if delete_ids else set()
+    
+    results: List[TaskBulkResult] = []
+    applied = []  # (result, task) pairs filled in after the commit
+    deleted = set()
+    
+    def fail(index, op, code, error, task_id=None):
+        results.append(TaskBulkResult(index=index, op=op.op, status=code, id=task_id, error=error))
+    
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            data = op.create
+            if data is None:
+                fail(index, op, status.HTTP_400_BAD_REQUEST, "Missing 'create' payload")
+                continue
+            if data.project_id not in project_managers:
+                fail(index, op, status.HTTP_404_NOT_FOUND, "Project not found")
+                continue
+            if current_user.role == UserRole.member:
+                fail(index, op, status.HTTP_403_FORBIDDEN, "Only managers and admins can create tasks")
+                continue
+            if current_user.role == UserRole.manager and project_managers[data.project_id] != current_user.id:
+                fail(index, op, status.HTTP_403_FORBIDDEN, "You can only create tasks for projects you manage")
+                continue
+            if data.assigned_to not in existing_users:
+                fail(index, op, status.HTTP_404_NOT_FOUND, "Assigned user not found")
+                continue
+            status_enum = _parse_status(data.status)
+            if status_enum is None:
+                fail(index, op, status.HTTP_400_BAD_REQUEST, _invalid_status(data.status))
+                continue
+            task = Task(
+                title=data.title,
+                description=data.description,
+                project_id=data.project_id,
+                assigned_to=data.assigned_to,
+                status=status_enum,
+                due_date=data.due_date
+            )
+            db.add(task)
+            result = TaskBulkResult(index=index, op=op.op, status=status.HTTP_201_CREATED)
+            results.append(result)
+            applied.append((result, task))
+            continue
+        
+        # update / delete
+        if op.id is None:
+            fail(index, op, status.HTTP_400_BAD_REQUEST, "Missing task id")
+            continue
+        if op.id not in tasks or op.id in deleted:
+            fail(index, op, status.HTTP_404_NOT_FOUND, "Task not found", op.id)
+            continue
+        task, project_manager_id = tasks[op.id]
+        
+        if op.op == "delete":
+            if current_user.role != UserRole.admin:
+                fail(index, op, status.HTTP_403_FORBIDDEN, "Only admins can delete tasks", op.id)
+                continue
+            if op.id in commented:
+                fail(index, op, status.HTTP_409_CONFLICT, "Task has comments", op.id)
+                continue
+            await db.delete(task)
+            deleted.add(op.id)
+            results.append(TaskBulkResult(index=index, op=op.op, status=status.HTTP_204_NO_CONTENT, id=op.id))
+            continue
+        
+        data = op.update
+        if data is None:
+            fail(index, op, status.HTTP_400_BAD_REQUEST, "Missing 'update' payload", op.id)
+            continue
+        denied = _update_denied(current_user, task, project_manager_id, data)
+        if denied:
+            fail(index, op, status.HTTP_403_FORBIDDEN, denied, op.id)
+            continue
+        if data.assigned_to is not None and data.assigned_to not in existing_users:
+            fail(index, op, status.HTTP_404_NOT_FOUND, "Assigned user not found", op.id)
+            continue
+        status_enum = None
+        if data.status is not None:
+            status_enum = _parse_status(data.status)
+            if status_enum is None:
+                fail(index, op, status.HTTP_400_BAD_REQUEST, _invalid_status(data.status), op.id)
+                continue
+        if data.title is not None:
+            task.title = data.title
+        if data.description is not None:
+            task.description = data.description
+        if data.assigned_to is not None:
+            task.assigned_to = data.assigned_to
+        if status_enum is not None:
+            task.status = status_enum
+        if data.due_date is not None:
+            task.due_date = data.due_date
+        result = TaskBulkResult(index=index, op=op.op, status=status.HTTP_200_OK, id=op.id)
+        results.append(result)
+        applied.append((result, task))
+    
+    failed = sum(1 for result in results if result.error is not None)
+    if failed and request.atomic:
+        await db.rollback()
+        for result in results:
+            if result.error is None:
+                result.status = status.HTTP_424_FAILED_DEPENDENCY
+                result.error = "Not applied: another operation in this atomic batch failed"
+        return TaskBulkResponse(succeeded=0, failed=len(results), results=results)
+    
+    await db.commit()
+    
+    for result, task in applied:
+        result.id = task.id
+        result.task = _task_out(task)
+    
+    return TaskBulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+
 @router.put("/{task_id}", response_model=TaskOut)
-def update_task(
+async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -138,7 +412,8 @@ def update_task(
     - Managers can update tasks in their projects
     - Admins can update any task
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Task and its project's manager come back in one query
+    task, project_manager_id = await load_task_with_manager(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,28 +421,12 @@ def update_task(
         )
     
     # Check permissions
-    if current_user.role == UserRole.member:
-        # Members can only update their own tasks, and only the status
-        if task.assigned_to != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only update your own tasks"
-            )
-        # Members can only update status
-        if task_data.title or task_data.description or task_data.assigned_to or task_data.due_date:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Members can only update task status"
-            )
-    elif current_user.role == UserRole.manager:
-        # Managers can update tasks in their projects
-        project = db.query(Project).filter(Project.id == task.project_id).first()
-        if project.manager_id != current_user.id and task.assigned_to != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only update tasks in your projects or assigned to you"
-            )
-    # Admins can update any task (no additional check needed)
+    denied = _update_denied(current_user, task, project_manager_id, task_data)
+    if denied:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=denied
+        )
     
     # Update fields
     if task_data.title is not None:
@@ -176,7 +435,7 @@ def update_task(
         task.description = task_data.description
     if task_data.assigned_to is not None:
         # Verify new assignee exists
-        assignee = db.query(User).filter(User.id == task_data.assigned_to).first()
+        assignee = await db.scalar(select(User).where(User.id == task_data.assigned_to))
         if not assignee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -196,8 +455,8 @@ def update_task(
     if task_data.due_date is not None:
         task.due_date = task_data.due_date
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     
     # Convert enum to string for JSON serialization
     task.status = task.status.value
@@ -206,22 +465,22 @@ def update_task(
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.admin]))
 ):
     """
     Delete a task. Only admins can delete tasks.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.scalar(select(Task).where(Task.id == task_id))
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     
     return None
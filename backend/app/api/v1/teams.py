@@ -1,39 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
 from app.core.database import get_db
 from app.models.team import Team
+from app.models.change_version import VersionScope
 from app.models.user import User
 from app.schemas.team import TeamCreate, TeamUpdate, TeamOut
-from app.api.dependencies import get_current_user, require_admin
+from app.api.conditional import conditional_get
+from app.api.dependencies import get_current_user, get_read_db, require_admin
+from app.api.fast_json import json_rows, out_columns
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TeamOut])
+@router.get(
+    "/",
+    response_model=List[TeamOut],
+    dependencies=[Depends(conditional_get(VersionScope.TEAMS))],
+)
 async def list_teams(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     List all teams. Accessible by all authenticated users (admin, manager, member).
+    Rows are encoded with orjson (``app.api.fast_json``).
     """
-    teams = db.query(Team).all()
-    return teams
+    teams = (await db.execute(select(*out_columns(TeamOut, Team)))).all()
+    return json_rows(TeamOut, teams, response)
 
 
-@router.get("/{team_id}", response_model=TeamOut)
+@router.get(
+    "/{team_id}",
+    response_model=TeamOut,
+    dependencies=[Depends(conditional_get(VersionScope.TEAMS))],
+)
 async def get_team(
     team_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific team by ID. Accessible by all authenticated users.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.scalar(select(Team).where(Team.id == team_id))
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -45,14 +59,14 @@ async def get_team(
 @router.post("/", response_model=TeamOut, status_code=status.HTTP_201_CREATED)
 async def create_team(
     team_data: TeamCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Create a new team. Only accessible by admin users.
     """
     # Check if team name already exists
-    existing_team = db.query(Team).filter(Team.name == team_data.name).first()
+    existing_team = await db.scalar(select(Team).where(Team.name == team_data.name))
     if existing_team:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,8 +80,8 @@ async def create_team(
     )
     
     db.add(team)
-    db.commit()
-    db.refresh(team)
+    await db.commit()
+    await db.refresh(team)
     
     return team
 
@@ -76,13 +90,13 @@ async def create_team(
 async def update_team(
     team_id: UUID,
     team_data: TeamUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Update a team. Only accessible by admin users.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.scalar(select(Team).where(Team.id == team_id))
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,7 +105,7 @@ async def update_team(
     
     # Check if new name conflicts with existing team
     if team_data.name and team_data.name != team.name:
-        existing_team = db.query(Team).filter(Team.name == team_data.name).first()
+        existing_team = await db.scalar(select(Team).where(Team.name == team_data.name))
         if existing_team:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -102,8 +116,8 @@ async def update_team(
     if team_data.description is not None:
         team.description = team_data.description
     
-    db.commit()
-    db.refresh(team)
+    await db.commit()
+    await db.refresh(team)
     
     return team
 
@@ -111,20 +125,20 @@ async def update_team(
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_team(
     team_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Delete a team. Only accessible by admin users.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.scalar(select(Team).where(Team.id == team_id))
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team not found"
         )
     
-    db.delete(team)
-    db.commit()
+    await db.delete(team)
+    await db.commit()
     
     return None
@@ -0,0 +1,133 @@
+"""
+Role-based visibility rules shared by the task, project, comment and sync routers.
+
+Each rule is expressed as a SQL clause (IN-subquery) so the database does
+the filtering; nothing here materializes id lists in Python.
+"""
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, exists, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.team import Team
+from app.models.tombstone import Tombstone, TombstoneEntity
+from app.models.user import User, UserRole
+
+
+def manages_project(user_id: UUID, project_id_column=Task.project_id) -> ColumnElement:
+    """
+    Clause: the project referenced by ``project_id_column`` is managed by the user.
+
+    An uncorrelated ``IN (SELECT id FROM projects WHERE manager_id = ...)``
+    is evaluated once per query (a hash/semi-join on Postgres, a transient
+    index on SQLite) instead of once per task row like a correlated EXISTS.
+    """
+    return project_id_column.in_(
+        select(Project.id).where(Project.manager_id == user_id)
+    )
+
+
+def visible_tasks(user: User) -> Optional[ColumnElement]:
+    """
+    Filter for the tasks a user can see, or None if they can see every task.
+    - Members see only tasks assigned to them
+    - Managers see tasks in projects they manage and tasks assigned to them
+    - Admins see all tasks
+    """
+    if user.role == UserRole.member:
+        return Task.assigned_to == user.id
+    if user.role == UserRole.manager:
+        return manages_project(user.id) | (Task.assigned_to == user.id)
+    return None
+
+
+def visible_projects(user: User) -> Optional[ColumnElement]:
+    """
+    Filter for the projects a user can list, or None if they can list every project.
+    - Admins see all projects
+    - Managers see projects they manage
+    - Members see all projects (team membership is not modelled yet)
+    """
+    if user.role == UserRole.manager:
+        return Project.manager_id == user.id
+    return None
+
+
+def visible_comments(user: User) -> Optional[ColumnElement]:
+    """
+    Filter for the comments a user can see (those on tasks they can see), or
+    None if they can see every comment.
+    """
+    tasks = visible_tasks(user)
+    if tasks is None:
+        return None
+    return Comment.task_id.in_(select(Task.id).where(tasks))
+
+
+def _still_visible(model, clause: Optional[ColumnElement]) -> ColumnElement:
+    row = exists().where(model.id == Tombstone.entity_id)
+    return row if clause is None else row.where(clause)
+
+
+def visible_tombstones(user: User) -> ColumnElement:
+    """
+    Filter for the tombstones a user should receive: rows they could see
+    before the delete (or visibility change), unless they can still see
+    them. A reassigned task, for instance, is tombstoned for its old
+    assignee only.
+    """
+    if user.role == UserRole.admin:
+        task_audience = project_audience = true()
+    elif user.role == UserRole.manager:
+        task_audience = or_(Tombstone.assigned_to == user.id, Tombstone.manager_id == user.id)
+        project_audience = Tombstone.manager_id == user.id
+    else:
+        task_audience = Tombstone.assigned_to == user.id
+        project_audience = true()
+    return or_(
+        and_(Tombstone.entity == TombstoneEntity.TASK, task_audience,
+             ~_still_visible(Task, visible_tasks(user))),
+        and_(Tombstone.entity == TombstoneEntity.COMMENT, task_audience,
+             ~_still_visible(Comment, visible_comments(user))),
+        and_(Tombstone.entity == TombstoneEntity.PROJECT, project_audience,
+             ~_still_visible(Project, visible_projects(user))),
+        and_(Tombstone.entity == TombstoneEntity.TEAM, ~_still_visible(Team, None)),
+    )
+
+
+def apply_filter(query, clause: Optional[ColumnElement]):
+    return query if clause is None else query.where(clause)
+
+
+async def load_task_with_manager(
+    db: AsyncSession,
+    task_id: UUID
+) -> Tuple[Optional[Task], Optional[UUID]]:
+    """
+    Load a task together with its project's manager id in a single query.
+    Returns (None, None) if the task does not exist.
+    """
+    row = (await db.execute(
+        select(Task, Project.manager_id)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(Task.id == task_id)
+    )).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+
+def can_access_task(user: User, task: Task, project_manager_id: Optional[UUID]) -> bool:
+    """
+    In-memory counterpart of ``visible_tasks`` for a single loaded task.
+    """
+    if user.role == UserRole.admin:
+        return True
+    if task.assigned_to == user.id:
+        return True
+    return user.role == UserRole.manager and project_manager_id == user.id
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from passlib.context import CryptContext
@@ -8,6 +11,10 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a plain text password.
@@ -82,3 +89,90 @@ def decode_token(token: str) -> Dict[str, Any]:
         algorithms=[settings.ALGORITHM]
     )
     return payload
+
+
+class PasswordHasherPool:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt is deliberately slow, so running it inline in an ``async def``
+    handler stalls the event loop for every other request. This pool runs it
+    on a dedicated thread or process pool and rejects new work once
+    ``max_queue`` calls are already pending or running.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of hashing calls currently queued or running."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def run(self, fn, *args):
+        """
+        Run ``fn(*args)`` on the pool and await its result.
+
+        Raises:
+            PasswordHasherBusy: If the pool already has ``max_queue`` calls in flight
+        """
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing pool is saturated")
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a plain text password on the password hashing pool.
+    
+    Raises:
+        PasswordHasherBusy: If the pool is saturated
+    """
+    return await password_hasher.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain text password on the password hashing pool.
+    
+    Raises:
+        PasswordHasherBusy: If the pool is saturated
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
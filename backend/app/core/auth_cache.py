@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.auth import decode_token
+from app.core.config import settings
+from app.models.user import User
+
+# Columns copied into a cached user snapshot
+_USER_FIELDS = ("id", "username", "email", "password_hash", "role", "created_at")
+
+
+class AuthCache:
+    """
+    In-process cache for authenticated requests.
+
+    - Decoded JWT payloads are kept in a bounded LRU keyed by the raw token
+      and expire together with the token's ``exp`` claim.
+    - User rows are kept as plain snapshots with a short TTL, so
+      ``get_current_user`` does not need a database round trip per request.
+
+    Entries for a user are dropped whenever that user's row is updated or
+    deleted (see the SQLAlchemy listeners at the bottom of this module).
+    That invalidation only reaches the current process: other workers keep
+    serving their snapshot (including the old role) until it expires, which
+    is why ``AUTH_USER_CACHE_TTL_SECONDS`` defaults to a few seconds.
+    """
+
+    def __init__(self, token_cache_size: int, user_ttl_seconds: int):
+        self.token_cache_size = token_cache_size
+        self.user_ttl_seconds = user_ttl_seconds
+        self._lock = threading.Lock()
+        self._tokens: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, set] = {}
+        self._users: Dict[str, tuple] = {}
+        self.token_hits = 0
+        self.token_misses = 0
+        self.user_hits = 0
+        self.user_misses = 0
+
+    def decode_token(self, token: str) -> Dict[str, Any]:
+        """
+        Decode a JWT token, reusing a previously verified payload when possible.
+
+        Raises:
+            jwt.PyJWTError: If token is invalid or expired
+        """
+        now = time.time()
+        with self._lock:
+            payload = self._tokens.get(token)
+            if payload is not None:
+                if payload.get("exp", 0) > now:
+                    self._tokens.move_to_end(token)
+                    self.token_hits += 1
+                    return payload
+                self._drop_token(token)
+            self.token_misses += 1
+
+        payload = decode_token(token)
+
+        if self.token_cache_size > 0 and "exp" in payload:
+            with self._lock:
+                self._tokens[token] = payload
+                self._tokens.move_to_end(token)
+                sub = payload.get("sub")
+                if sub is not None:
+                    self._tokens_by_user.setdefault(str(sub), set()).add(token)
+                while len(self._tokens) > self.token_cache_size:
+                    oldest = next(iter(self._tokens))
+                    self._drop_token(oldest)
+
+        return payload
+
+    def get_user(self, user_id: UUID) -> Optional[User]:
+        """
+        Return a detached User built from a cached snapshot, or None on a miss.
+        """
+        key = str(user_id)
+        with self._lock:
+            entry = self._users.get(key)
+            if entry is not None:
+                snapshot, expires_at = entry
+                if expires_at > time.monotonic():
+                    self.user_hits += 1
+                    return User(**snapshot)
+                del self._users[key]
+            self.user_misses += 1
+        return None
+
+    def set_user(self, user: User) -> None:
+        """
+        Store a snapshot of a freshly loaded user row.
+        """
+        if self.user_ttl_seconds <= 0:
+            return
+        snapshot = {field: getattr(user, field) for field in _USER_FIELDS}
+        expires_at = time.monotonic() + self.user_ttl_seconds
+        with self._lock:
+            self._users[str(user.id)] = (snapshot, expires_at)
+
+    def invalidate_user(self, user_id) -> None:
+        """
+        Drop the cached row and every cached token belonging to a user.
+        """
+        key = str(user_id)
+        with self._lock:
+            self._users.pop(key, None)
+            for token in self._tokens_by_user.pop(key, set()):
+                self._tokens.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._tokens_by_user.clear()
+            self._users.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "token_hits": self.token_hits,
+                "token_misses": self.token_misses,
+                "token_entries": len(self._tokens),
+                "user_hits": self.user_hits,
+                "user_misses": self.user_misses,
+                "user_entries": len(self._users),
+            }
+
+    def _drop_token(self, token: str) -> None:
+        payload = self._tokens.pop(token, None)
+        if payload is None:
+            return
+        tokens = self._tokens_by_user.get(str(payload.get("sub")))
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[str(payload.get("sub"))]
+
+
+auth_cache = AuthCache(
+    token_cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    user_ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+# Invalidate on flush so the current request never sees a stale snapshot, and
+# again after commit so a concurrent reader cannot re-cache the old row.
+_PENDING_KEY = "auth_cache_invalidate"
+
+
+def _user_changed(mapper, connection, target: User) -> None:
+    auth_cache.invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+event.listen(User, "after_update", _user_changed)
+event.listen(User, "after_delete", _user_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
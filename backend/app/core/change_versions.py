@@ -0,0 +1,97 @@
+"""
+Per-scope change versions used as HTTP validators.
+
+Every flush that inserts, updates or deletes a Task, Project, Team, Comment
+or User bumps the ``change_versions`` row of that table, inside the same
+transaction as the change itself. Read endpoints hash the versions they
+depend on into an ETag (see ``app/api/conditional.py``), so answering a
+conditional GET costs one primary-key lookup instead of the list query.
+
+A version only says "something in this table changed"; a client is sent the
+full response again after any write to the table, even one it cannot see.
+
+Rows written with Core statements bypass the ORM and therefore these
+listeners; code doing that must call ``bump`` itself.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.change_version import ChangeVersion, VersionScope
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.team import Team
+from app.models.user import User
+
+MODEL_SCOPES = {
+    Task: VersionScope.TASKS,
+    Project: VersionScope.PROJECTS,
+    Team: VersionScope.TEAMS,
+    Comment: VersionScope.COMMENTS,
+    User: VersionScope.USERS,
+}
+
+
+def versions_query(scopes: Iterable[str]):
+    """Select (scope, version, updated_at) for the given scopes."""
+    return select(
+        ChangeVersion.scope, ChangeVersion.version, ChangeVersion.updated_at
+    ).where(ChangeVersion.scope.in_(list(scopes)))
+
+
+def bump(connection: Connection, scopes: Iterable[str]) -> None:
+    """
+    Increment the version of each scope, creating rows as needed.
+    """
+    now = datetime.utcnow()
+    rows = [{"scope": scope, "version": 1, "updated_at": now} for scope in sorted(set(scopes))]
+    if not rows:
+        return
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(ChangeVersion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChangeVersion.scope],
+            set_={"version": ChangeVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+        )
+        connection.execute(stmt, rows)
+        return
+
+    # Generic fallback: update, then insert what did not exist yet
+    table = ChangeVersion.__table__
+    for row in rows:
+        result = connection.execute(
+            table.update()
+            .where(table.c.scope == row["scope"])
+            .values(version=table.c.version + 1, updated_at=row["updated_at"])
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+def latest(versions: Dict[str, Tuple[int, datetime]]) -> Optional[datetime]:
+    """Time of the most recent change across ``versions``, if any."""
+    return max((updated_at for _, updated_at in versions.values()), default=None)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions(session: Session, flush_context) -> None:
+    scopes = {
+        MODEL_SCOPES[type(obj)]
+        for obj in list(session.new) + list(session.deleted)
+        if type(obj) in MODEL_SCOPES
+    }
+    scopes.update(
+        MODEL_SCOPES[type(obj)]
+        for obj in session.dirty
+        if type(obj) in MODEL_SCOPES and session.is_modified(obj, include_collections=False)
+    )
+    if scopes:
+        bump(session.connection(), scopes)
@@ -5,8 +5,84 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./projectmanager.db")
+    # Optional explicit async URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
 
+    # Read replicas (comma-separated URLs in DATABASE_URL form; empty reads
+    # from the primary). Users who just wrote read from the primary for
+    # READ_YOUR_WRITES_SECONDS; unreachable replicas are retried after
+    # READ_REPLICA_RETRY_SECONDS.
+    READ_DATABASE_URLS: list = [url.strip() for url in os.getenv("READ_DATABASE_URLS", "").split(",") if url.strip()]
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    READ_REPLICA_RETRY_SECONDS: float = float(os.getenv("READ_REPLICA_RETRY_SECONDS", 30))
+
+    # Connection pool (server databases; SQLite uses its driver defaults)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Server-side statement timeout in milliseconds, Postgres only (0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+    # SQLite tuning applied to every new connection
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    # Negative values are KiB, positive values are pages (SQLite convention)
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -64000))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+    # Auth cache (set to 0 to disable). The cache is per process: with several
+    # workers, a role change reaches the other workers only when their cached
+    # user row expires, so keep the TTL short.
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+    AUTH_USER_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", 5))
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+    # Max operations accepted by POST /api/v1/tasks/bulk
+    TASK_BULK_MAX_OPERATIONS: int = int(os.getenv("TASK_BULK_MAX_OPERATIONS", 1000))
+
+    # Newest matches ranked per search query; bounds the cost of very common words
+    SEARCH_MAX_CANDIDATES: int = int(os.getenv("SEARCH_MAX_CANDIDATES", 10000))
+
+    # Change feed (/api/v1/events): events a connection may fall behind by
+    # before it is evicted, and the SSE keep-alive interval
+    CHANGE_FEED_ENABLED: bool = os.getenv("CHANGE_FEED_ENABLED", "true").lower() == "true"
+    CHANGE_FEED_QUEUE_SIZE: int = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", 256))
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", 15))
+
+    # Delta sync (/api/v1/sync): how far back a caught-up cursor is held, to
+    # cover writes that commit after rows stamped later (longest write
+    # transaction plus clock skew between app servers), and how long
+    # tombstones are kept before older cursors expire
+    SYNC_OVERLAP_SECONDS: float = float(os.getenv("SYNC_OVERLAP_SECONDS", 10))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+
+    # Rows fetched from the server-side cursor and encoded per chunk by
+    # /api/v1/export; bounds the memory an export holds at once
+    EXPORT_CHUNK_ROWS: int = int(os.getenv("EXPORT_CHUNK_ROWS", 1000))
+
+    # Rows per insert and transaction in bulk imports (app.core.importer);
+    # a database error loses at most one chunk
+    IMPORT_CHUNK_ROWS: int = int(os.getenv("IMPORT_CHUNK_ROWS", 5000))
+
+    # Collapse concurrent identical requests to @single_flight routes
+    # (stats overview, project list) into one run per worker
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+    # Per-request SQL instrumentation (Server-Timing headers, N+1 warnings)
+    SQL_INSTRUMENTATION: bool = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+    # Warn when one statement runs this many times in a request (0 disables)
+    SQL_REPEAT_WARN_THRESHOLD: int = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", 10))
+
+    # How often each worker refreshes pool/cache metrics in multi-worker mode
+    METRICS_SAMPLE_INTERVAL_SECONDS: float = float(os.getenv("METRICS_SAMPLE_INTERVAL_SECONDS", 5))
+
 settings = Settings()
@@ -1,20 +1,133 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Async drivers used for each synchronous backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+# libpq sslmode values that asyncpg accepts as its ``ssl`` argument
+ASYNCPG_SSL_MODES = ("disable", "allow", "prefer", "require", "verify-ca", "verify-full")
+
+
+def to_async_url(database_url: str) -> str:
+    """
+    Convert a synchronous database URL into its async driver equivalent,
+    e.g. ``postgresql://`` -> ``postgresql+asyncpg://``.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if url.get_driver_name() == "asyncpg" and "sslmode" in url.query:
+        # asyncpg does not understand libpq's sslmode; it takes the same
+        # values (disable, require, verify-full, ...) through ``ssl``.
+        sslmode = url.query["sslmode"]
+        if sslmode not in ASYNCPG_SSL_MODES:
+            raise ValueError(f"Unsupported sslmode for asyncpg: {sslmode}")
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return url.render_as_string(hide_password=False)
+
+
+def _is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _connect_args(database_url: str) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {"check_same_thread": False} if url.get_driver_name() == "pysqlite" else {}
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if url.get_backend_name() != "postgresql" or timeout <= 0:
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(timeout)}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+
+def engine_kwargs(database_url: str) -> dict:
+    """
+    Keyword arguments for ``create_engine``/``create_async_engine``.
+    """
+    kwargs = {"connect_args": _connect_args(database_url)}
+    if not _is_sqlite(database_url):
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return kwargs
+
+
+def sqlite_pragmas() -> list:
+    """
+    PRAGMA statements run on every new SQLite connection: WAL lets readers
+    proceed while a writer commits, and busy_timeout makes writers wait for
+    the lock instead of failing with "database is locked".
+    """
+    pragmas = [
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    if settings.SQLITE_WAL:
+        pragmas.insert(0, "PRAGMA journal_mode=WAL")
+    return pragmas
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine) -> None:
+    """
+    Attach per-connection setup to a (sync) engine. For async engines pass
+    ``async_engine.sync_engine``.
+    """
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+
+# Synchronous engine, used by Alembic and offline scripts
+engine = create_engine(settings.DATABASE_URL, **engine_kwargs(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine, used by the API so request handlers never block the event loop
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs(ASYNC_DATABASE_URL))
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+configure_engine(engine)
+configure_engine(async_engine.sync_engine)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,360 @@
+"""
+Change feed: task, comment and project changes pushed to connected clients.
+
+Every flush records one event per inserted, updated or deleted Task, Comment
+or Project, together with its audience (the users and roles allowed to see
+the row under the ``list_*`` visibility rules). Events leave the process
+only once the transaction commits:
+
+- SQLite: ``after_commit`` hands them to the in-process ``broker``.
+- PostgreSQL: they are sent with ``pg_notify`` inside the writing
+  transaction, so Postgres delivers them at commit, to every worker.
+  Each worker runs a ``PostgresRelay`` that LISTENs and feeds its broker.
+
+The broker keeps one bounded queue per connection. A consumer that falls
+``CHANGE_FEED_QUEUE_SIZE`` events behind is evicted: its pending events are
+dropped, it receives a final ``resync`` message, and the connection is
+closed. The client then refetches (cheaply, with ETags) and reconnects.
+
+Rows written with Core statements bypass the ORM and produce no events.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, attributes
+
+from app.core.config import settings
+from app.core.metrics import CHANGE_FEED_CONNECTIONS, CHANGE_FEED_EVICTIONS
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel; payloads are limited to 8000 bytes
+CHANNEL = "change_feed"
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+# Sent to an evicted consumer before its connection is closed
+RESYNC = json.dumps({"type": "resync"})
+
+_EVENTS_KEY = "change_events"
+
+_TASK_FIELDS = ("id", "title", "description", "project_id", "assigned_to", "status", "due_date", "created_at")
+_COMMENT_FIELDS = ("id", "task_id", "author_id", "message", "created_at")
+_PROJECT_FIELDS = (
+    "id", "name", "description", "team_id", "manager_id", "status", "start_date", "end_date", "created_at",
+)
+
+
+def _json_default(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+@dataclass
+class Envelope:
+    """A serialized event and who may receive it."""
+    message: str
+    users: Set[str]
+    roles: Set[str]
+
+    def to_json(self) -> dict:
+        return {"message": self.message, "users": sorted(self.users), "roles": sorted(self.roles)}
+
+
+class Subscription:
+    """One connected client: its identity and bounded outgoing queue."""
+
+    def __init__(self, user_id, role: str, queue_size: int):
+        self.user_id = str(user_id)
+        self.role = role
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class ChangeBroker:
+    """
+    In-process fanout. Subscriptions are indexed by user id and role, so
+    publishing costs the size of an event's audience, not the number of
+    connections.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._by_user: Dict[str, Set[Subscription]] = {}
+        self._by_role: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.evictions = 0
+
+    def subscribe(self, user: User) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        role = user.role.value if isinstance(user.role, Enum) else str(user.role)
+        subscription = Subscription(user.id, role, self.queue_size)
+        self._by_user.setdefault(subscription.user_id, set()).add(subscription)
+        self._by_role.setdefault(role, set()).add(subscription)
+        CHANGE_FEED_CONNECTIONS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        role_members = self._by_role.get(subscription.role)
+        if role_members is None or subscription not in role_members:
+            return  # already evicted
+        for index, key in ((self._by_user, subscription.user_id), (self._by_role, subscription.role)):
+            index[key].discard(subscription)
+            if not index[key]:
+                del index[key]
+        CHANGE_FEED_CONNECTIONS.dec()
+
+    @property
+    def connections(self) -> int:
+        return sum(len(members) for members in self._by_role.values())
+
+    def publish(self, envelopes: List[Envelope]) -> None:
+        """
+        Queue each event for its audience. Safe to call from any thread;
+        delivery always happens on the event loop serving the connections.
+        """
+        loop = self._loop
+        if loop is None or not envelopes:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(envelopes)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, envelopes)
+
+    def _deliver(self, envelopes: List[Envelope]) -> None:
+        for envelope in envelopes:
+            targets: Set[Subscription] = set()
+            for role in envelope.roles:
+                targets.update(self._by_role.get(role, ()))
+            for user_id in envelope.users:
+                targets.update(self._by_user.get(user_id, ()))
+            for subscription in targets:
+                try:
+                    subscription.queue.put_nowait(envelope.message)
+                except asyncio.QueueFull:
+                    self.evict(subscription)
+
+    def evict(self, subscription: Subscription) -> None:
+        """Drop a consumer that cannot keep up; it is told to resync."""
+        self.unsubscribe(subscription)
+        subscription.evicted = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(RESYNC)
+        self.evictions += 1
+        CHANGE_FEED_EVICTIONS.inc()
+
+
+broker = ChangeBroker(queue_size=settings.CHANGE_FEED_QUEUE_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Producing events
+# ---------------------------------------------------------------------------
+
+def _before(obj, attr):
+    """Value of an attribute before the flush."""
+    hist = attributes.get_history(obj, attr)
+    if hist.deleted:
+        return hist.deleted[0]
+    return getattr(obj, attr)
+
+
+def _row(obj, fields) -> dict:
+    # Only loaded values: server defaults (created_at on projects) are not
+    # fetched back here, as that would cost a query per row
+    state = inspect(obj).dict
+    return {field: state[field] for field in fields if field in state}
+
+
+def _ids(*values) -> Set[str]:
+    return {str(value) for value in values if value is not None}
+
+
+def _envelope(entity: str, action: str, obj, data: Optional[dict], users: Set[str], roles: Set[str]) -> Envelope:
+    message = json.dumps(
+        {"type": "change", "entity": entity, "action": action, "id": obj.id, "data": data},
+        default=_json_default,
+        separators=(",", ":"),
+    )
+    return Envelope(message=message, users=users, roles=roles)
+
+
+def collect_events(session: Session) -> List[Envelope]:
+    """Events for the Task, Comment and Project rows written by this flush."""
+    changes = [(obj, "created") for obj in session.new]
+    changes += [(obj, "deleted") for obj in session.deleted]
+    changes += [
+        (obj, "updated") for obj in session.dirty
+        if isinstance(obj, (Task, Comment, Project)) and session.is_modified(obj, include_collections=False)
+    ]
+    changes = [(obj, action) for obj, action in changes if isinstance(obj, (Task, Comment, Project))]
+    if not changes:
+        return []
+
+    connection = session.connection()
+    admins = {UserRole.admin.value}
+
+    # Who can see each task involved: its assignee and its project's manager
+    task_ids = {obj.task_id for obj, _ in changes if isinstance(obj, Comment)}
+    project_ids = set()
+    for obj, _ in changes:
+        if isinstance(obj, Task):
+            project_ids.update(_ids(obj.project_id, _before(obj, "project_id")))
+    task_audience: Dict[str, Set[str]] = {}
+    if task_ids:
+        for task_id, assigned_to, manager_id in connection.execute(
+            select(Task.id, Task.assigned_to, Project.manager_id)
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(Task.id.in_(task_ids))
+        ):
+            task_audience[str(task_id)] = _ids(assigned_to, manager_id)
+    managers: Dict[str, str] = {}
+    if project_ids:
+        managers = {
+            str(project_id): str(manager_id)
+            for project_id, manager_id in connection.execute(
+                select(Project.id, Project.manager_id).where(Project.id.in_([UUID(pid) for pid in project_ids]))
+            )
+        }
+    # Projects written in this flush carry their own (possibly new) manager
+    for obj, _ in changes:
+        if isinstance(obj, Project):
+            managers[str(obj.id)] = str(obj.manager_id)
+
+    envelopes = []
+    for obj, action in changes:
+        if isinstance(obj, Task):
+            # Both the old and new assignee/manager hear about a reassignment
+            users = _ids(obj.assigned_to, _before(obj, "assigned_to"))
+            for project_id in _ids(obj.project_id, _before(obj, "project_id")):
+                users.update(_ids(managers.get(project_id)))
+            data = None if action == "deleted" else _row(obj, _TASK_FIELDS)
+            envelopes.append(_envelope("task", action, obj, data, users, admins))
+        elif isinstance(obj, Comment):
+            users = task_audience.get(str(obj.task_id), set()) | _ids(obj.author_id)
+            data = None if action == "deleted" else _row(obj, _COMMENT_FIELDS)
+            envelopes.append(_envelope("comment", action, obj, data, users, admins))
+        else:
+            # Members can list every project (see visible_projects)
+            users = _ids(obj.manager_id, _before(obj, "manager_id"))
+            data = None if action == "deleted" else _row(obj, _PROJECT_FIELDS)
+            envelopes.append(_envelope("project", action, obj, data, users, admins | {UserRole.member.value}))
+    return envelopes
+
+
+def _notify_payloads(envelopes: Iterable[Envelope]) -> List[str]:
+    """Pack envelopes into as few NOTIFY payloads as the size limit allows."""
+    payloads, batch, size = [], [], 2
+    for envelope in envelopes:
+        item = json.dumps(envelope.to_json(), separators=(",", ":"))
+        if len(item.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            # Too large to relay (long description/message); send the
+            # change without the row so clients refetch it
+            event = json.loads(envelope.message)
+            event["data"] = None
+            envelope = Envelope(json.dumps(event, separators=(",", ":")), envelope.users, envelope.roles)
+            item = json.dumps(envelope.to_json(), separators=(",", ":"))
+        if batch and size + len(item.encode()) + 1 > NOTIFY_PAYLOAD_LIMIT:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(item)
+        size += len(item.encode()) + 1
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+@event.listens_for(Session, "after_flush")
+def _record_events(session: Session, flush_context) -> None:
+    if not settings.CHANGE_FEED_ENABLED:
+        return
+    envelopes = collect_events(session)
+    if not envelopes:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        for payload in _notify_payloads(envelopes):
+            connection.execute(select(func.pg_notify(CHANNEL, payload)))
+    else:
+        session.info.setdefault(_EVENTS_KEY, []).extend(envelopes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session: Session) -> None:
+    envelopes = session.info.pop(_EVENTS_KEY, None)
+    if envelopes:
+        broker.publish(envelopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session: Session) -> None:
+    session.info.pop(_EVENTS_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Cross-worker relay (PostgreSQL)
+# ---------------------------------------------------------------------------
+
+class PostgresRelay:
+    """
+    LISTENs on ``CHANNEL`` over a dedicated connection from the engine's
+    pool and publishes what arrives to the local broker, reconnecting when
+    the connection drops.
+    """
+
+    def __init__(self, engine, retry_seconds: float = 5.0):
+        self.engine = engine
+        self.retry_seconds = retry_seconds
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            envelopes = [
+                Envelope(item["message"], set(item["users"]), set(item["roles"]))
+                for item in json.loads(payload)
+            ]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change feed notification")
+            return
+        broker.publish(envelopes)
+
+    async def run(self) -> None:
+        """Listen until cancelled."""
+        while True:
+            try:
+                async with self.engine.connect() as connection:
+                    raw = (await connection.get_raw_connection()).driver_connection
+                    await raw.add_listener(CHANNEL, self._on_notify)
+                    try:
+                        while not raw.is_closed():
+                            await asyncio.sleep(self.retry_seconds)
+                    finally:
+                        if not raw.is_closed():
+                            await raw.remove_listener(CHANNEL, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Change feed relay disconnected: %s", exc)
+            await asyncio.sleep(self.retry_seconds)
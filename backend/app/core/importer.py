@@ -0,0 +1,357 @@
+"""
+Bulk import of projects, tasks and comments from CSV or JSONL files.
+
+The file is parsed a line at a time and inserted in chunks of
+``IMPORT_CHUNK_ROWS`` rows. Each chunk is one Core ``insert()`` executemany
+in its own transaction, so memory does not grow with the file and a failure
+loses at most one chunk. References are resolved through lookup maps loaded
+once per import:
+
+- teams by id or name;
+- users by id, email or username;
+- projects by id or (unique) name.
+
+Task ids in comment files are checked with one query per chunk.
+
+A row that fails validation or refers to something unknown is reported with
+its line number and skipped; the rest of the file is imported. If the
+database rejects a chunk (a row id that already exists), the rows with
+existing or repeated ids are reported and the chunk is retried without them.
+
+Core inserts bypass the ORM listeners, so each chunk does their work in its
+own transaction:
+
+- ``stats_counters`` deltas (``apply_deltas``);
+- ``change_versions`` bumps;
+- ``updated_at`` is set by the column default, so delta sync sends the rows.
+
+The full-text search index is kept by the database (triggers on SQLite,
+expression indexes on PostgreSQL). No change feed events are sent; clients
+pick the rows up through sync or a refetch.
+
+Usage:
+    python -m app.core.importer projects projects.csv
+    python -m app.core.importer tasks tasks.jsonl
+    python -m app.core.importer comments comments.csv
+"""
+import csv
+import json
+import sys
+from collections import Counter, defaultdict
+from enum import Enum
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.core import change_versions
+from app.core.config import settings
+from app.core.stats_counters import CounterKey, apply_deltas, member_project_key, project_keys, task_keys
+from app.models.change_version import VersionScope
+from app.models.comment import Comment
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.models.team import Team
+from app.models.user import User
+from app.schemas.imports import (
+    CommentImport,
+    ImportProgress,
+    ImportRowError,
+    ProjectImport,
+    TaskImport,
+)
+
+
+class ImportEntity(str, Enum):
+    projects = "projects"
+    tasks = "tasks"
+    comments = "comments"
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+SCHEMAS: Dict[ImportEntity, Type[BaseModel]] = {
+    ImportEntity.projects: ProjectImport,
+    ImportEntity.tasks: TaskImport,
+    ImportEntity.comments: CommentImport,
+}
+MODELS = {ImportEntity.projects: Project, ImportEntity.tasks: Task, ImportEntity.comments: Comment}
+SCOPES = {
+    ImportEntity.projects: VersionScope.PROJECTS,
+    ImportEntity.tasks: VersionScope.TASKS,
+    ImportEntity.comments: VersionScope.COMMENTS,
+}
+
+# A name shared by several projects cannot be used as a reference
+_AMBIGUOUS = object()
+
+Record = Tuple[int, object]  # (line number, parsed dict or error message)
+
+
+def format_for(filename: str) -> ImportFormat:
+    """Guess the format from a file name: ``.csv`` or JSONL."""
+    return ImportFormat.csv if filename.lower().endswith(".csv") else ImportFormat.jsonl
+
+
+def read_records(stream: IO[str], fmt: ImportFormat) -> Iterator[Record]:
+    """
+    Parse ``stream`` one record at a time. Empty CSV cells and blank JSONL
+    lines are skipped; a malformed line yields an error message instead.
+    """
+    if fmt == ImportFormat.csv:
+        reader = csv.DictReader(stream)
+        line = 2  # after the header
+        for row in reader:
+            yield line, {key: value for key, value in row.items() if key and value not in ("", None)}
+            line = reader.line_num + 1
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        yield number, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class Lookups:
+    """Reference maps, loaded once per import."""
+
+    def __init__(self, connection: Connection, entity: ImportEntity):
+        self.users: Dict[str, UUID] = {}
+        self.teams: Dict[str, UUID] = {}
+        # id or name -> (id, manager_id, status)
+        self.projects: Dict[str, object] = {}
+        # (assignee, project) pairs known to have tasks
+        self.member_pairs: set = set()
+        for user_id, email, username in connection.execute(select(User.id, User.email, User.username)):
+            self.users[str(user_id)] = self.users[email] = self.users[username] = user_id
+        if entity == ImportEntity.projects:
+            for team_id, name in connection.execute(select(Team.id, Team.name)):
+                self.teams[str(team_id)] = self.teams[name] = team_id
+        if entity == ImportEntity.tasks:
+            for project in connection.execute(select(Project.id, Project.manager_id, Project.status, Project.name)):
+                found = (project.id, project.manager_id, project.status)
+                self.projects[str(project.id)] = found
+                self.projects[project.name] = _AMBIGUOUS if project.name in self.projects else found
+
+    @staticmethod
+    def _find(mapping: Dict[str, object], key: str, what: str):
+        found = mapping.get(key.strip())
+        if found is None:
+            raise LookupError(f"Unknown {what}: {key}")
+        if found is _AMBIGUOUS:
+            raise LookupError(f"Ambiguous {what} name: {key}; use its id")
+        return found
+
+    def user(self, key: str) -> UUID:
+        return self._find(self.users, key, "user")
+
+    def team(self, key: str) -> UUID:
+        return self._find(self.teams, key, "team")
+
+    def project(self, key: str) -> tuple:
+        return self._find(self.projects, key, "project")
+
+
+def _optional(values: dict) -> dict:
+    # Columns not given fall back to their defaults (id, created_at, ...)
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def to_row(entity: ImportEntity, data: BaseModel, lookups: Lookups) -> dict:
+    """The insert parameters for one validated record."""
+    if entity == ImportEntity.projects:
+        return _optional({
+            "id": data.id, "name": data.name, "description": data.description,
+            "team_id": lookups.team(data.team), "manager_id": lookups.user(data.manager),
+            "status": ProjectStatus(data.status), "start_date": data.start_date, "end_date": data.end_date,
+            "created_at": data.created_at,
+        })
+    if entity == ImportEntity.tasks:
+        project_id, _, _ = lookups.project(data.project)
+        return _optional({
+            "id": data.id, "title": data.title, "description": data.description, "project_id": project_id,
+            "assigned_to": lookups.user(data.assigned_to), "status": TaskStatus(data.status),
+            "due_date": data.due_date, "created_at": data.created_at,
+        })
+    return _optional({
+        "id": data.id, "task_id": data.task_id, "author_id": lookups.user(data.author),
+        "message": data.message, "created_at": data.created_at,
+    })
+
+
+def _task_deltas(connection: Connection, rows: List[dict], lookups: Lookups) -> Dict[CounterKey, int]:
+    """
+    Counter deltas for tasks about to be inserted, as the ORM listener would
+    apply them. Run before the insert, in the same transaction.
+    """
+    deltas: Dict[CounterKey, int] = Counter()
+    pairs = set()
+    for row in rows:
+        _, manager_id, _ = lookups.project(str(row["project_id"]))
+        for key in task_keys(row["assigned_to"], row.get("status", TaskStatus.TODO), manager_id):
+            deltas[key] += 1
+        pairs.add((row["assigned_to"], row["project_id"]))
+    # A member counts a project once they have a first task in it. Pairs seen
+    # in an earlier chunk are known to have one, so only new pairs are queried.
+    new_pairs = pairs - lookups.member_pairs
+    if new_pairs:
+        had_tasks = set(connection.execute(
+            select(Task.assigned_to, Task.project_id)
+            .where(tuple_(Task.assigned_to, Task.project_id).in_(list(new_pairs)))
+            .distinct()
+        ).tuples())
+        for assigned_to, project_id in new_pairs - had_tasks:
+            _, _, status = lookups.project(str(project_id))
+            deltas[member_project_key(assigned_to, status)] += 1
+    return deltas
+
+
+def _rejected_ids(connection: Connection, model, rows: List[Tuple[int, dict]]) -> Dict[int, str]:
+    """Lines whose explicit id already exists, or repeats an earlier row of the chunk."""
+    ids = [row["id"] for _, row in rows if "id" in row]
+    existing = set(connection.scalars(select(model.id).where(model.id.in_(ids)))) if ids else set()
+    rejected, seen = {}, set()
+    for line, row in rows:
+        if "id" not in row:
+            continue
+        if row["id"] in existing:
+            rejected[line] = f"A {model.__name__.lower()} with id {row['id']} already exists"
+        elif row["id"] in seen:
+            rejected[line] = f"Duplicate id {row['id']} in the file"
+        seen.add(row["id"])
+    return rejected
+
+
+def _insert_chunk(engine: Engine, entity: ImportEntity, rows: List[Tuple[int, dict]], lookups: Lookups) -> None:
+    model = MODELS[entity]
+    values = [row for _, row in rows]
+    # One executemany per set of columns: rows that leave out an optional
+    # column get its default rather than NULL
+    by_columns: Dict[frozenset, List[dict]] = defaultdict(list)
+    for row in values:
+        by_columns[frozenset(row)].append(row)
+    with engine.begin() as connection:
+        deltas: Dict[CounterKey, int] = Counter()
+        if entity == ImportEntity.projects:
+            for row in values:
+                for key in project_keys(row["manager_id"], row["status"]):
+                    deltas[key] += 1
+        elif entity == ImportEntity.tasks:
+            deltas = _task_deltas(connection, values, lookups)
+        for group in by_columns.values():
+            connection.execute(insert(model), group)
+        apply_deltas(connection, deltas)
+        change_versions.bump(connection, [SCOPES[entity]])
+    if entity == ImportEntity.tasks:
+        lookups.member_pairs.update((row["assigned_to"], row["project_id"]) for row in values)
+
+
+def _flush(
+    engine: Engine, entity: ImportEntity, rows: List[Tuple[int, dict]], lookups: Lookups,
+    errors: List[ImportRowError],
+) -> int:
+    """Insert a chunk; return how many rows went in, adding errors for the rest."""
+    if not rows:
+        return 0
+    if entity == ImportEntity.comments:
+        with engine.connect() as connection:
+            task_ids = {row["task_id"] for _, row in rows}
+            known = set(connection.scalars(select(Task.id).where(Task.id.in_(task_ids))))
+        for line, row in rows:
+            if row["task_id"] not in known:
+                errors.append(ImportRowError(line=line, error=f"Unknown task: {row['task_id']}"))
+        rows = [(line, row) for line, row in rows if row["task_id"] in known]
+        if not rows:
+            return 0
+    try:
+        _insert_chunk(engine, entity, rows, lookups)
+        return len(rows)
+    except IntegrityError:
+        with engine.connect() as connection:
+            rejected = _rejected_ids(connection, MODELS[entity], rows)
+        if not rejected:
+            raise
+    errors.extend(ImportRowError(line=line, error=error) for line, error in rejected.items())
+    rows = [(line, row) for line, row in rows if line not in rejected]
+    if rows:
+        _insert_chunk(engine, entity, rows, lookups)
+    return len(rows)
+
+
+def import_records(
+    engine: Engine, entity: ImportEntity, records: Iterable[Record], chunk_size: Optional[int] = None
+) -> Iterator[ImportProgress]:
+    """
+    Import ``records``; yield progress after every chunk (with that chunk's
+    row errors) and a final summary with ``done`` set.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_ROWS
+    schema = SCHEMAS[entity]
+    with engine.connect() as connection:
+        lookups = Lookups(connection, entity)
+
+    processed = imported = 0
+    rows: List[Tuple[int, dict]] = []
+    errors: List[ImportRowError] = []
+
+    def progress(done: bool = False) -> ImportProgress:
+        return ImportProgress(
+            processed=processed, imported=imported, failed=processed - imported - len(rows),
+            errors=errors, done=done,
+        )
+
+    for line, record in records:
+        processed += 1
+        try:
+            if isinstance(record, str):
+                raise ValueError(record)
+            rows.append((line, to_row(entity, schema.model_validate(record), lookups)))
+        except ValidationError as exc:
+            errors.append(ImportRowError(line=line, error=_validation_message(exc)))
+        except (LookupError, ValueError) as exc:
+            errors.append(ImportRowError(line=line, error=str(exc)))
+        if len(rows) >= chunk_size:
+            imported += _flush(engine, entity, rows, lookups, errors)
+            rows = []
+            yield progress()
+            errors = []
+
+    imported += _flush(engine, entity, rows, lookups, errors)
+    rows = []
+    yield progress(done=True)
+
+
+def main(argv: List[str]) -> int:
+    from app.core.database import engine
+
+    if len(argv) != 2 or argv[0] not in ImportEntity.__members__:
+        print("Usage: python -m app.core.importer [projects|tasks|comments] FILE(.csv|.jsonl)")
+        return 2
+    entity, path = ImportEntity(argv[0]), argv[1]
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        for progress in import_records(engine, entity, read_records(stream, format_for(path))):
+            for error in progress.errors:
+                print(f"line {error.line}: {error.error}", file=sys.stderr)
+            state = "Imported" if progress.done else "Progress:"
+            print(f"{state} {progress.imported} of {progress.processed} {entity.value} ({progress.failed} failed)")
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
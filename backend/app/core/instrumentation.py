@@ -0,0 +1,129 @@
+"""
+Per-request SQL instrumentation.
+
+Engine hooks time every statement and attribute it to the request currently
+being served (tracked with a context variable). The middleware reports the
+totals in a ``Server-Timing`` header and warns when a single statement shape
+repeats often enough in one request to look like an N+1 pattern.
+"""
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """SQL activity recorded for one request."""
+
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[statement] += 1
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Stats for the request being served, or None outside a request."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach timing hooks to a (sync) engine. For async engines pass
+    ``async_engine.sync_engine``.
+    """
+    if not settings.SQL_INSTRUMENTATION:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    ASGI middleware that collects per-request SQL stats and emits them as
+    ``Server-Timing`` response headers.
+    """
+
+    def __init__(self, app, repeat_threshold: int = 0):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_INSTRUMENTATION:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: RequestQueryStats) -> None:
+        if not stats.count:
+            return
+        path = scope.get("path", "")
+        if self.repeat_threshold > 0:
+            for statement, count in stats.shapes.items():
+                if count >= self.repeat_threshold:
+                    logger.warning(
+                        "Possible N+1: statement ran %d times in %s %s: %s",
+                        count, scope.get("method", ""), path, " ".join(statement.split())
+                    )
+        logger.debug(
+            "%s %s: %d queries, %.2fms total, slowest %.2fms: %s",
+            scope.get("method", ""), path, stats.count, stats.total_seconds * 1000,
+            stats.slowest_seconds * 1000, " ".join((stats.slowest_statement or "").split())
+        )
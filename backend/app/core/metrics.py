@@ -0,0 +1,164 @@
+"""
+Prometheus metrics for the API.
+
+Per-route request counts and latency histograms are recorded by
+``MetricsMiddleware`` using the route template (``/api/v1/tasks/{task_id}``)
+as the label, so label cardinality stays bounded. Connection pool, password
+hashing pool and auth cache state is sampled when ``/metrics`` is scraped.
+
+When running several uvicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to an
+empty, writable directory shared by the workers; ``/metrics`` then aggregates
+the samples of every worker. Since a scrape only reaches one worker, each
+worker also samples on a timer (``METRICS_SAMPLE_INTERVAL_SECONDS``) in that
+mode, started from the app lifespan.
+"""
+import asyncio
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.responses import Response
+
+from app.core.auth import password_hasher
+from app.core.auth_cache import auth_cache
+from app.core.config import settings
+from app.core.database import async_engine
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ["method", "route", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connection pool size", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hashing calls queued or running", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected", "Password hashing calls rejected because the pool was saturated",
+)
+AUTH_CACHE = Counter(
+    "auth_cache_lookups", "Auth cache lookups by cache and result", ["cache", "result"],
+)
+CHANGE_FEED_CONNECTIONS = Gauge(
+    "change_feed_connections", "Open change feed connections (SSE and WebSocket)", multiprocess_mode="livesum"
+)
+CHANGE_FEED_EVICTIONS = Counter(
+    "change_feed_evictions", "Change feed consumers disconnected for falling too far behind",
+)
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "single_flight_requests",
+    "Requests to single-flight routes that ran the handler (leader) or shared another's result (collapsed)",
+    ["route", "result"],
+)
+
+# Last sampled value of each monotonic in-process counter, so only the
+# increase since the previous sample is added to its Prometheus counter
+_last_seen = {}
+
+
+def _advance(counter, key: str, value: int) -> None:
+    delta = value - _last_seen.get(key, 0)
+    if delta > 0:
+        counter.inc(delta)
+    _last_seen[key] = value
+
+
+def sample_runtime_metrics() -> None:
+    """Copy pool and cache state into their gauges and counters."""
+    pool = async_engine.sync_engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+    PASSWORD_HASH_QUEUE_DEPTH.set(password_hasher.queue_depth)
+    _advance(PASSWORD_HASH_REJECTED, "password_hash_rejected", password_hasher.rejected)
+    stats = auth_cache.stats()
+    for cache in ("token", "user"):
+        _advance(AUTH_CACHE.labels(cache, "hit"), f"{cache}_hits", stats[f"{cache}_hits"])
+        _advance(AUTH_CACHE.labels(cache, "miss"), f"{cache}_misses", stats[f"{cache}_misses"])
+
+
+async def sample_runtime_metrics_periodically() -> None:
+    """Sample every ``METRICS_SAMPLE_INTERVAL_SECONDS`` until cancelled."""
+    while True:
+        sample_runtime_metrics()
+        await asyncio.sleep(settings.METRICS_SAMPLE_INTERVAL_SECONDS)
+
+
+def metrics_response() -> Response:
+    """Render every metric in the Prometheus text exposition format."""
+    sample_runtime_metrics()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        data = generate_latest(registry)
+    else:
+        data = generate_latest()
+    return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_progress = IN_PROGRESS.labels(method)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            # Route template is set on the scope by the router once matched
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            REQUESTS.labels(method, template, status_code).inc()
+            LATENCY.labels(method, template).observe(elapsed)
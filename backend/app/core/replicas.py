@@ -0,0 +1,152 @@
+"""
+Read replica routing.
+
+``READ_DATABASE_URLS`` lists one or more replicas of ``DATABASE_URL``.
+Read-only endpoints take their session from ``ReplicaPool.session``, which
+picks replicas round-robin, skips any that recently failed to connect and
+falls back to the primary when none is available (or none is configured).
+
+A user who has just committed a write is kept on the primary for
+``READ_YOUR_WRITES_SECONDS`` so they see their own change despite replica
+lag. The window is tracked per process: with several workers, a follow-up
+request served by another worker can still hit a replica, so replica lag
+should stay well below the window.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, configure_engine, engine_kwargs, to_async_url
+from app.core.instrumentation import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the id of the user a primary session writes for
+WRITER_KEY = "writer_id"
+_HAS_WRITES_KEY = "has_writes"
+
+
+class Replica:
+    """One read replica with its own engine and session factory."""
+
+    def __init__(self, url: str):
+        self.url = url
+        async_url = to_async_url(url)
+        self.engine = create_async_engine(async_url, **engine_kwargs(async_url))
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self.down_until = 0.0
+        configure_engine(self.engine.sync_engine)
+        instrument_engine(self.engine.sync_engine)
+
+
+class ReplicaPool:
+    """
+    Round-robin replica selection with health-based failover and a
+    read-your-writes window per user.
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float, read_your_writes_seconds: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._recent_writers: Dict[str, float] = {}
+
+    def record_write(self, user_id) -> None:
+        """Pin a user to the primary for the read-your-writes window."""
+        if self.read_your_writes_seconds <= 0 or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[str(user_id)] = now + self.read_your_writes_seconds
+            # Drop expired entries now and then so the map stays small
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {
+                    key: until for key, until in self._recent_writers.items() if until > now
+                }
+
+    def wrote_recently(self, user_id) -> bool:
+        with self._lock:
+            until = self._recent_writers.get(str(user_id))
+        return until is not None and until > time.monotonic()
+
+    def candidates(self, user_id=None) -> List[Replica]:
+        """Replicas to try, in order; empty means read from the primary."""
+        if not self.replicas or (user_id is not None and self.wrote_recently(user_id)):
+            return []
+        now = time.monotonic()
+        start = next(self._turn) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    def mark_down(self, replica: Replica) -> None:
+        replica.down_until = time.monotonic() + self.retry_seconds
+
+    @asynccontextmanager
+    async def session(self, user_id=None):
+        """
+        Yield a session on a healthy replica, or on the primary if no
+        replica can be reached.
+        """
+        for replica in self.candidates(user_id):
+            db = replica.sessionmaker()
+            try:
+                # Check out a connection now so a dead replica fails over here
+                await db.connection()
+            except (DBAPIError, OSError, asyncio.TimeoutError) as exc:
+                await db.close()
+                self.mark_down(replica)
+                logger.warning(
+                    "Read replica %s unavailable for %ss: %s",
+                    replica.engine.url.render_as_string(hide_password=True), self.retry_seconds, exc,
+                )
+                continue
+            async with db:
+                yield db
+            return
+
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+read_replicas = ReplicaPool(
+    urls=settings.READ_DATABASE_URLS,
+    retry_seconds=settings.READ_REPLICA_RETRY_SECONDS,
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_writes(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session: Session) -> None:
+    if session.info.pop(_HAS_WRITES_KEY, False) and WRITER_KEY in session.info:
+        read_replicas.record_write(session.info[WRITER_KEY])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES_KEY, None)
@@ -0,0 +1,159 @@
+"""
+Full-text search index over task titles/descriptions and comment messages.
+
+- SQLite: FTS5 tables ``tasks_fts`` and ``comments_fts`` using the base tables
+  as external content, kept in sync by AFTER INSERT/UPDATE/DELETE triggers.
+- PostgreSQL: GIN expression indexes over the weighted ``tsvector`` of each
+  row (``TASK_DOCUMENT`` / ``COMMENT_DOCUMENT``), which Postgres maintains
+  itself.
+
+Because both are maintained by the database, rows written with Core
+statements (bulk endpoints, imports) are indexed too. Fresh SQLite databases
+get the index from ``Base.metadata.create_all``; Postgres gets it from
+migration ``c8b2f41d9e57``. For an existing SQLite file, or after ``VACUUM``
+(which may renumber the rowids the FTS tables point at), run:
+
+    python -m app.core.search_index rebuild
+"""
+import re
+import sys
+from typing import List
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from app.core.database import Base
+
+# Text search configuration used for stemming on Postgres
+TS_CONFIG = "english"
+
+# Weighted documents; index expressions and queries must use exactly these
+TASK_DOCUMENT = (
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(tasks.title, '')), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(tasks.description, '')), 'B')"
+)
+COMMENT_DOCUMENT = f"to_tsvector('{TS_CONFIG}', comments.message)"
+
+SQLITE_DDL = [
+    # Title matches weigh more than description matches (see bm25 weights).
+    # The last query word is matched as a prefix; prefix='2 3' indexes short
+    # prefixes, which would otherwise expand to thousands of terms.
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='rowid',
+        tokenize='porter unicode61', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+        message, content='comments', content_rowid='rowid',
+        tokenize='porter unicode61', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO comments_fts(rowid, message) VALUES (new.rowid, new.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, message) VALUES ('delete', old.rowid, old.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF message ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, message) VALUES ('delete', old.rowid, old.message);
+        INSERT INTO comments_fts(rowid, message) VALUES (new.rowid, new.message);
+    END""",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS comments_fts_insert",
+    "DROP TRIGGER IF EXISTS comments_fts_delete",
+    "DROP TRIGGER IF EXISTS comments_fts_update",
+    "DROP TABLE IF EXISTS tasks_fts",
+    "DROP TABLE IF EXISTS comments_fts",
+]
+
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_tasks_search ON tasks USING gin (({TASK_DOCUMENT.replace('tasks.', '')}))",
+    f"CREATE INDEX IF NOT EXISTS ix_comments_search ON comments USING gin (({COMMENT_DOCUMENT.replace('comments.', '')}))",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_comments_search",
+    "DROP INDEX IF EXISTS ix_tasks_search",
+]
+
+
+def install(connection: Connection) -> None:
+    """Create the search index structures for the connection's backend."""
+    statements = SQLITE_DDL if connection.dialect.name == "sqlite" else POSTGRES_DDL
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def rebuild(connection: Connection) -> None:
+    """Create the index if missing and re-index every existing row."""
+    install(connection)
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+        connection.execute(text("INSERT INTO comments_fts(comments_fts) VALUES ('rebuild')"))
+    else:
+        connection.execute(text("REINDEX INDEX ix_tasks_search"))
+        connection.execute(text("REINDEX INDEX ix_comments_search"))
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Words of a user query. Only word characters survive, so the terms can be
+    placed in an FTS5 MATCH or ``to_tsquery`` expression without escaping.
+    """
+    return re.findall(r"\w+", query.lower())[:16]
+
+
+def fts5_match(terms: List[str]) -> str:
+    """FTS5 query matching every term, the last one as a prefix."""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def tsquery(terms: List[str]) -> str:
+    """``to_tsquery`` input matching every term, the last one as a prefix."""
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw) -> None:
+    if connection.dialect.name in ("sqlite", "postgresql"):
+        install(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_DROP:
+            connection.execute(text(statement))
+
+
+def main(argv: List[str]) -> int:
+    from app.core.database import engine
+
+    if argv[:1] == ["rebuild"]:
+        with engine.begin() as connection:
+            rebuild(connection)
+        print("Rebuilt the search index")
+        return 0
+    print("Usage: python -m app.core.search_index rebuild")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,395 @@
+"""
+Incrementally maintained project/task/team/user counters.
+
+Every flush that inserts, updates or deletes a Task, Project, Team or User
+turns into a handful of ``+n``/``-n`` upserts on the ``stats_counters`` table,
+inside the same transaction as the change itself. ``/stats/overview`` then
+reads a few counter rows instead of scanning ``tasks`` and ``projects``.
+
+Rows written with Core statements bypass the ORM and therefore these
+listeners; code doing that must call ``apply_deltas`` itself or run
+``rebuild`` afterwards.
+
+Usage:
+    python -m app.core.stats_counters rebuild   # recompute from scratch
+    python -m app.core.stats_counters check     # report drift, exit 1 if any
+"""
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, distinct, event, func, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from app.models.project import Project
+from app.models.stats_counter import CounterEntity, CounterScope, StatsCounter
+from app.models.task import Task
+from app.models.team import Team
+from app.models.user import User
+
+CounterKey = Tuple[str, str, str, str]  # (scope_type, scope_id, entity, status)
+
+
+def _status(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def task_keys(assigned_to, status, manager_id) -> List[CounterKey]:
+    """Counter keys a single task contributes to."""
+    status = _status(status)
+    keys = [
+        (CounterScope.GLOBAL, "", CounterEntity.TASK, status),
+        (CounterScope.ASSIGNEE, str(assigned_to), CounterEntity.TASK, status),
+    ]
+    if manager_id is not None:
+        keys.append((CounterScope.MANAGER, str(manager_id), CounterEntity.TASK, status))
+        if manager_id == assigned_to:
+            keys.append((CounterScope.MANAGER_ASSIGNEE, str(manager_id), CounterEntity.TASK, status))
+    return keys
+
+
+def project_keys(manager_id, status) -> List[CounterKey]:
+    """Counter keys a single project contributes to."""
+    status = _status(status)
+    return [
+        (CounterScope.GLOBAL, "", CounterEntity.PROJECT, status),
+        (CounterScope.MANAGER, str(manager_id), CounterEntity.PROJECT, status),
+    ]
+
+
+def member_project_key(user_id, project_status) -> CounterKey:
+    return (CounterScope.MEMBER, str(user_id), CounterEntity.PROJECT, _status(project_status))
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def counters_query(scopes: Iterable[Tuple[str, str]]):
+    """
+    Select every counter row for the given (scope_type, scope_id) pairs.
+    """
+    return select(
+        StatsCounter.scope_type,
+        StatsCounter.scope_id,
+        StatsCounter.entity,
+        StatsCounter.status,
+        StatsCounter.value,
+    ).where(or_(*[
+        and_(StatsCounter.scope_type == scope_type, StatsCounter.scope_id == scope_id)
+        for scope_type, scope_id in scopes
+    ]))
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def apply_deltas(connection: Connection, deltas: Dict[CounterKey, int]) -> None:
+    """
+    Add each delta to its counter row, creating rows as needed.
+    """
+    rows = [
+        {"scope_type": k[0], "scope_id": k[1], "entity": k[2], "status": k[3], "value": v}
+        for k, v in deltas.items() if v
+    ]
+    if not rows:
+        return
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(StatsCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                StatsCounter.scope_type, StatsCounter.scope_id,
+                StatsCounter.entity, StatsCounter.status,
+            ],
+            set_={"value": StatsCounter.value + stmt.excluded.value},
+        )
+        connection.execute(stmt, rows)
+        return
+
+    # Generic fallback: update, then insert what did not exist yet
+    table = StatsCounter.__table__
+    for row in rows:
+        result = connection.execute(
+            table.update()
+            .where(
+                table.c.scope_type == row["scope_type"],
+                table.c.scope_id == row["scope_id"],
+                table.c.entity == row["entity"],
+                table.c.status == row["status"],
+            )
+            .values(value=table.c.value + row["value"])
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+def _history(obj, attr) -> Tuple[object, object]:
+    """(value before flush, value after flush) for an attribute."""
+    hist = attributes.get_history(obj, attr)
+    if hist.has_changes():
+        before = hist.deleted[0] if hist.deleted else None
+        after = hist.added[0] if hist.added else None
+        return before, after
+    value = getattr(obj, attr)
+    return value, value
+
+
+@event.listens_for(Session, "after_flush")
+def _update_counters(session: Session, flush_context) -> None:
+    # Task states as (task id, assigned_to, project_id, status) before/after the flush
+    task_before: List[tuple] = []
+    task_after: List[tuple] = []
+    # Project manager/status before and after the flush
+    project_before: Dict[object, tuple] = {}
+    project_after: Dict[object, tuple] = {}
+    deltas: Dict[CounterKey, int] = Counter()
+
+    new_projects = set()
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            task_after.append((obj.id, obj.assigned_to, obj.project_id, obj.status))
+        elif isinstance(obj, Project):
+            project_after[obj.id] = (obj.manager_id, obj.status)
+            new_projects.add(obj.id)
+        elif isinstance(obj, Team):
+            deltas[(CounterScope.GLOBAL, "", CounterEntity.TEAM, "")] += 1
+        elif isinstance(obj, User):
+            deltas[(CounterScope.GLOBAL, "", CounterEntity.USER, "")] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            task_before.append((obj.id, obj.assigned_to, obj.project_id, obj.status))
+        elif isinstance(obj, Project):
+            project_before[obj.id] = (obj.manager_id, obj.status)
+        elif isinstance(obj, Team):
+            deltas[(CounterScope.GLOBAL, "", CounterEntity.TEAM, "")] -= 1
+        elif isinstance(obj, User):
+            deltas[(CounterScope.GLOBAL, "", CounterEntity.USER, "")] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Task):
+            changed = [_history(obj, attr) for attr in ("assigned_to", "project_id", "status")]
+            if any(before != after for before, after in changed):
+                (ab, aa), (pb, pa), (sb, sa) = changed
+                task_before.append((obj.id, ab, pb, sb))
+                task_after.append((obj.id, aa, pa, sa))
+        elif isinstance(obj, Project):
+            (mb, ma), (sb, sa) = _history(obj, "manager_id"), _history(obj, "status")
+            if mb != ma or _status(sb) != _status(sa):
+                project_before[obj.id] = (mb, sb)
+                project_after[obj.id] = (ma, sa)
+
+    if not (task_before or task_after or project_before or project_after or any(deltas.values())):
+        return
+
+    connection = session.connection()
+
+    # Current (post-flush) manager/status of every project involved
+    project_ids = {t[2] for t in task_before + task_after} | set(project_before) | set(project_after)
+    project_ids.discard(None)
+    current: Dict[object, tuple] = {}
+    if project_ids:
+        for pid, manager_id, status in connection.execute(
+            select(Project.id, Project.manager_id, Project.status).where(Project.id.in_(project_ids))
+        ):
+            current[pid] = (manager_id, status)
+
+    def state_before(pid) -> Optional[tuple]:
+        if pid in project_before:
+            return project_before[pid]
+        if pid in new_projects:
+            return None
+        return current.get(pid)
+
+    def state_after(pid) -> Optional[tuple]:
+        if pid in project_after:
+            return project_after[pid]
+        if pid in project_before:
+            return None  # deleted in this flush
+        return current.get(pid)
+
+    # Projects
+    for pid, (manager_id, status) in project_before.items():
+        for key in project_keys(manager_id, status):
+            deltas[key] -= 1
+    for pid, (manager_id, status) in project_after.items():
+        for key in project_keys(manager_id, status):
+            deltas[key] += 1
+
+    # Tasks touched in this flush
+    touched_ids = set()
+    pair_delta: Dict[tuple, int] = Counter()
+    for task_id, assigned_to, pid, status in task_before:
+        touched_ids.add(task_id)
+        before = state_before(pid)
+        for key in task_keys(assigned_to, status, before[0] if before else None):
+            deltas[key] -= 1
+        pair_delta[(assigned_to, pid)] -= 1
+    for task_id, assigned_to, pid, status in task_after:
+        touched_ids.add(task_id)
+        after = state_after(pid)
+        for key in task_keys(assigned_to, status, after[0] if after else None):
+            deltas[key] += 1
+        pair_delta[(assigned_to, pid)] += 1
+
+    # Untouched tasks in projects whose manager changed move to the new manager
+    moved = [
+        pid for pid in project_before
+        if pid in project_after and project_before[pid][0] != project_after[pid][0]
+    ]
+    if moved:
+        query = select(Task.project_id, Task.assigned_to, Task.status, func.count()).where(
+            Task.project_id.in_(moved)
+        ).group_by(Task.project_id, Task.assigned_to, Task.status)
+        if touched_ids:
+            query = query.where(Task.id.notin_(touched_ids))
+        for pid, assigned_to, status, count in connection.execute(query):
+            for key in task_keys(assigned_to, status, project_before[pid][0]):
+                deltas[key] -= count
+            for key in task_keys(assigned_to, status, project_after[pid][0]):
+                deltas[key] += count
+
+    # Member project membership: (user, project) pairs whose existence or
+    # project status may have changed
+    pairs = {pair for pair in pair_delta if pair[1] is not None}
+    restatused = [
+        pid for pid in project_before
+        if pid in project_after and _status(project_before[pid][1]) != _status(project_after[pid][1])
+    ]
+    if restatused:
+        for pid, assigned_to in connection.execute(
+            select(Task.project_id, Task.assigned_to).where(Task.project_id.in_(restatused)).distinct()
+        ):
+            pairs.add((assigned_to, pid))
+    if pairs:
+        remaining = Counter()
+        for assigned_to, pid, count in connection.execute(
+            select(Task.assigned_to, Task.project_id, func.count())
+            .where(tuple_(Task.assigned_to, Task.project_id).in_(list(pairs)))
+            .group_by(Task.assigned_to, Task.project_id)
+        ):
+            remaining[(assigned_to, pid)] = count
+        for assigned_to, pid in pairs:
+            after_count = remaining[(assigned_to, pid)]
+            before_count = after_count - pair_delta[(assigned_to, pid)]
+            before, after = state_before(pid), state_after(pid)
+            if before_count > 0 and before is not None:
+                deltas[member_project_key(assigned_to, before[1])] -= 1
+            if after_count > 0 and after is not None:
+                deltas[member_project_key(assigned_to, after[1])] += 1
+
+    apply_deltas(connection, deltas)
+
+
+# ---------------------------------------------------------------------------
+# Rebuild and consistency check
+# ---------------------------------------------------------------------------
+
+def compute_counters(connection: Connection) -> Dict[CounterKey, int]:
+    """
+    Compute every counter from the source tables.
+    """
+    counters: Dict[CounterKey, int] = defaultdict(int)
+
+    for manager_id, status, count in connection.execute(
+        select(Project.manager_id, Project.status, func.count())
+        .group_by(Project.manager_id, Project.status)
+    ):
+        for key in project_keys(manager_id, status):
+            counters[key] += count
+
+    for assigned_to, manager_id, status, count in connection.execute(
+        select(Task.assigned_to, Project.manager_id, Task.status, func.count())
+        .select_from(Task)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .group_by(Task.assigned_to, Project.manager_id, Task.status)
+    ):
+        for key in task_keys(assigned_to, status, manager_id):
+            counters[key] += count
+
+    for assigned_to, status, count in connection.execute(
+        select(Task.assigned_to, Project.status, func.count(distinct(Project.id)))
+        .select_from(Task)
+        .join(Project, Project.id == Task.project_id)
+        .group_by(Task.assigned_to, Project.status)
+    ):
+        counters[member_project_key(assigned_to, status)] += count
+
+    counters[(CounterScope.GLOBAL, "", CounterEntity.TEAM, "")] = connection.scalar(
+        select(func.count(Team.id))
+    )
+    counters[(CounterScope.GLOBAL, "", CounterEntity.USER, "")] = connection.scalar(
+        select(func.count(User.id))
+    )
+    return {key: value for key, value in counters.items() if value}
+
+
+def stored_counters(connection: Connection) -> Dict[CounterKey, int]:
+    rows = connection.execute(select(
+        StatsCounter.scope_type,
+        StatsCounter.scope_id,
+        StatsCounter.entity,
+        StatsCounter.status,
+        StatsCounter.value,
+    ))
+    return {
+        (scope_type, scope_id, entity, status): value
+        for scope_type, scope_id, entity, status, value in rows
+        if value
+    }
+
+
+def rebuild(connection: Connection) -> int:
+    """
+    Replace the contents of ``stats_counters`` with freshly computed values.
+    Returns the number of counter rows written.
+    """
+    counters = compute_counters(connection)
+    connection.execute(delete(StatsCounter))
+    apply_deltas(connection, counters)
+    return len(counters)
+
+
+def check(connection: Connection) -> Dict[CounterKey, Tuple[int, int]]:
+    """
+    Compare stored counters against freshly computed values.
+    Returns ``{key: (stored, expected)}`` for every counter that drifted.
+    """
+    expected = compute_counters(connection)
+    stored = stored_counters(connection)
+    return {
+        key: (stored.get(key, 0), expected.get(key, 0))
+        for key in set(expected) | set(stored)
+        if stored.get(key, 0) != expected.get(key, 0)
+    }
+
+
+def main(argv: List[str]) -> int:
+    from app.core.database import engine
+
+    command = argv[0] if argv else ""
+    if command == "rebuild":
+        with engine.begin() as connection:
+            count = rebuild(connection)
+        print(f"Rebuilt {count} stats counters")
+        return 0
+    if command == "check":
+        with engine.connect() as connection:
+            drift = check(connection)
+        for key, (stored, expected) in sorted(drift.items()):
+            print(f"{'/'.join(key)}: stored={stored} expected={expected}")
+        print("Stats counters are consistent" if not drift else f"{len(drift)} counters drifted")
+        return 1 if drift else 0
+    print("Usage: python -m app.core.stats_counters [rebuild|check]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,164 @@
+"""
+Tombstones and visibility bumps for the delta sync endpoint.
+
+``/api/v1/sync`` returns the rows whose ``updated_at`` moved past a client's
+cursor, plus the tombstones recorded since then. Every flush that deletes a
+Task, Project, Team or Comment writes a tombstone carrying the row's old
+audience (assignee and project manager), in the same transaction as the
+delete.
+
+Visibility changes are handled the same way:
+
+- A task that is reassigned or moved to another project is tombstoned for
+  its old assignee and manager; the sync query skips the tombstone for
+  anyone who can still see the task. Its comments get a new ``updated_at``,
+  so the new audience receives them.
+- A project whose manager changes is tombstoned for the old manager, and so
+  are its tasks; the tasks and their comments get a new ``updated_at``.
+
+Clients drop the comments of a task they receive a tombstone for.
+
+Rows written with Core statements bypass the ORM and therefore these
+listeners; code deleting that way must write the tombstones itself.
+
+Usage:
+    python -m app.core.tombstones purge   # drop tombstones past retention
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from app.core.config import settings
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.team import Team
+from app.models.tombstone import Tombstone, TombstoneEntity
+
+
+def retention_cutoff() -> datetime:
+    """Tombstones older than this may have been purged."""
+    return datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def purge(connection: Connection) -> int:
+    """Delete tombstones past retention; returns how many were deleted."""
+    return connection.execute(delete(Tombstone).where(Tombstone.deleted_at < retention_cutoff())).rowcount
+
+
+def _before(obj, attr):
+    """Value of an attribute before the flush."""
+    hist = attributes.get_history(obj, attr)
+    if hist.deleted:
+        return hist.deleted[0]
+    return getattr(obj, attr)
+
+
+def _changed(obj, attr) -> bool:
+    return attributes.get_history(obj, attr).has_changes()
+
+
+def _tombstone(entity: str, entity_id, assigned_to=None, manager_id=None) -> dict:
+    return {"entity": entity, "entity_id": entity_id, "assigned_to": assigned_to, "manager_id": manager_id}
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session: Session, flush_context) -> None:
+    deleted = [obj for obj in session.deleted if isinstance(obj, (Task, Project, Team, Comment))]
+    moved_tasks = [
+        obj for obj in session.dirty
+        if isinstance(obj, Task) and obj not in session.deleted
+        and (_changed(obj, "assigned_to") or _changed(obj, "project_id"))
+    ]
+    new_managers = [
+        obj for obj in session.dirty
+        if isinstance(obj, Project) and obj not in session.deleted and _changed(obj, "manager_id")
+    ]
+    if not (deleted or moved_tasks or new_managers):
+        return
+
+    connection = session.connection()
+
+    # Managers before this flush, from the projects it wrote and the database
+    managers: Dict[UUID, Optional[UUID]] = {
+        obj.id: _before(obj, "manager_id") for obj in session.deleted if isinstance(obj, Project)
+    }
+    managers.update((obj.id, _before(obj, "manager_id")) for obj in new_managers)
+    # Assignee and project before this flush of every task involved
+    tasks: Dict[UUID, Tuple[UUID, UUID]] = {
+        obj.id: (_before(obj, "assigned_to"), _before(obj, "project_id"))
+        for obj in list(session.deleted) + list(session.dirty) if isinstance(obj, Task)
+    }
+    missing_tasks = {obj.task_id for obj in deleted if isinstance(obj, Comment)} - set(tasks)
+    if missing_tasks:
+        tasks.update(
+            (task_id, (assigned_to, project_id))
+            for task_id, assigned_to, project_id in connection.execute(
+                select(Task.id, Task.assigned_to, Task.project_id).where(Task.id.in_(missing_tasks))
+            )
+        )
+    missing_projects = {project_id for _, project_id in tasks.values()} - set(managers)
+    if missing_projects:
+        managers.update(connection.execute(
+            select(Project.id, Project.manager_id).where(Project.id.in_(missing_projects))
+        ).all())
+
+    def task_audience(task_id) -> Tuple[Optional[UUID], Optional[UUID]]:
+        assigned_to, project_id = tasks.get(task_id, (None, None))
+        return assigned_to, managers.get(project_id)
+
+    rows: List[dict] = []
+    for obj in deleted:
+        if isinstance(obj, Task):
+            rows.append(_tombstone(TombstoneEntity.TASK, obj.id, *task_audience(obj.id)))
+        elif isinstance(obj, Comment):
+            rows.append(_tombstone(TombstoneEntity.COMMENT, obj.id, *task_audience(obj.task_id)))
+        elif isinstance(obj, Project):
+            rows.append(_tombstone(TombstoneEntity.PROJECT, obj.id, manager_id=managers.get(obj.id)))
+        else:
+            rows.append(_tombstone(TombstoneEntity.TEAM, obj.id))
+
+    bumped_tasks: Set[UUID] = {obj.id for obj in moved_tasks}
+    for obj in moved_tasks:
+        rows.append(_tombstone(TombstoneEntity.TASK, obj.id, *task_audience(obj.id)))
+
+    if new_managers:
+        project_ids = [obj.id for obj in new_managers]
+        for task_id, project_id in connection.execute(
+            select(Task.id, Task.project_id).where(Task.project_id.in_(project_ids))
+        ):
+            rows.append(_tombstone(TombstoneEntity.TASK, task_id, manager_id=managers.get(project_id)))
+            bumped_tasks.add(task_id)
+        rows.extend(
+            _tombstone(TombstoneEntity.PROJECT, obj.id, manager_id=managers.get(obj.id)) for obj in new_managers
+        )
+        connection.execute(
+            update(Task).where(Task.project_id.in_(project_ids)).values(updated_at=datetime.utcnow())
+        )
+
+    if bumped_tasks:
+        connection.execute(
+            update(Comment).where(Comment.task_id.in_(bumped_tasks)).values(updated_at=datetime.utcnow())
+        )
+    connection.execute(Tombstone.__table__.insert(), rows)
+
+
+def main(argv: List[str]) -> int:
+    from app.core.database import engine
+
+    if argv[:1] == ["purge"]:
+        with engine.begin() as connection:
+            count = purge(connection)
+        print(f"Purged {count} tombstones older than {settings.SYNC_TOMBSTONE_RETENTION_DAYS} days")
+        return 0
+    print("Usage: python -m app.core.tombstones purge")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -9,11 +11,43 @@ from app.api.v1.projects import router as projects_router
 from app.api.v1.tasks import router as tasks_router
 from app.api.v1.comments import router as comments_router
 from app.api.v1.stats import router as stats_router
+from app.api.v1.search import router as search_router
+from app.api.v1.events import router as events_router
+from app.api.v1.sync import router as sync_router
+from app.api.v1.export import router as export_router
+from app.api.v1.imports import router as imports_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.auth import password_hasher
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.events import PostgresRelay
+from app.core.instrumentation import SQLInstrumentationMiddleware
+from app.core.metrics import MULTIPROCESS, MetricsMiddleware, metrics_response, sample_runtime_metrics_periodically
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Project Manager API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # A scrape reaches a single worker, so every worker keeps its own
+    # pool/cache samples fresh in the shared multiprocess directory
+    sampler = asyncio.create_task(sample_runtime_metrics_periodically()) if MULTIPROCESS else None
+    # Change events from every worker arrive through Postgres NOTIFY
+    relay = None
+    if settings.CHANGE_FEED_ENABLED and async_engine.dialect.name == "postgresql":
+        relay = asyncio.create_task(PostgresRelay(async_engine).run())
+    yield
+    for task in (sampler, relay):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    # Release password hashing workers on shutdown
+    password_hasher.shutdown()
+
+
+app = FastAPI(title="Project Manager API", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -22,8 +56,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing", "ETag"],
 )
 
+# Per-request query count / DB time in Server-Timing headers
+app.add_middleware(
+    SQLInstrumentationMiddleware,
+    repeat_threshold=settings.SQL_REPEAT_WARN_THRESHOLD,
+)
+
+# Request counts, latency histograms and in-flight gauges for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(teams_router, prefix="/api/v1/teams", tags=["teams"])
@@ -31,7 +75,17 @@ app.include_router(projects_router, prefix="/api/v1/projects", tags=["projects"]
 app.include_router(tasks_router, prefix="/api/v1/tasks", tags=["tasks"])
 app.include_router(comments_router, prefix="/api/v1/comments", tags=["comments"])
 app.include_router(stats_router, prefix="/api/v1/stats", tags=["stats"])
+app.include_router(search_router, prefix="/api/v1/search", tags=["search"])
+app.include_router(events_router, prefix="/api/v1/events", tags=["events"])
+app.include_router(sync_router, prefix="/api/v1/sync", tags=["sync"])
+app.include_router(export_router, prefix="/api/v1/export", tags=["export"])
+app.include_router(imports_router, prefix="/api/v1/import", tags=["import"])
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
@@ -3,5 +3,12 @@ from app.models.team import Team
 from app.models.project import Project, ProjectStatus
 from app.models.task import Task, TaskStatus
 from app.models.comment import Comment
+from app.models.stats_counter import StatsCounter, CounterScope, CounterEntity
+from app.models.change_version import ChangeVersion, VersionScope
+from app.models.tombstone import Tombstone, TombstoneEntity
 
-__all__ = ["User", "UserRole", "Team", "Project", "ProjectStatus", "Task", "TaskStatus", "Comment"]
+__all__ = [
+    "User", "UserRole", "Team", "Project", "ProjectStatus", "Task", "TaskStatus", "Comment",
+    "StatsCounter", "CounterScope", "CounterEntity", "ChangeVersion", "VersionScope",
+    "Tombstone", "TombstoneEntity",
+]
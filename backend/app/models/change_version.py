@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from app.core.database import Base
+
+
+class VersionScope:
+    """Scopes with their own change version; each covers one table."""
+    TASKS = "tasks"
+    PROJECTS = "projects"
+    TEAMS = "teams"
+    COMMENTS = "comments"
+    USERS = "users"
+
+
+class ChangeVersion(Base):
+    __tablename__ = "change_versions"
+
+    scope = Column(String(32), primary_key=True)
+    # Bumped by every transaction that writes to the scope's table
+    version = Column(BigInteger, nullable=False, default=0)
+    # Naive UTC time of the latest bump
+    updated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, BigInteger
+from app.core.database import Base
+
+
+class CounterScope:
+    """Scope types used as the first part of a stats counter key."""
+    GLOBAL = "global"                      # Everything
+    MANAGER = "manager"                    # Projects managed by / tasks in projects managed by scope_id
+    ASSIGNEE = "assignee"                  # Tasks assigned to scope_id
+    MANAGER_ASSIGNEE = "manager_assignee"  # Tasks assigned to scope_id in projects they manage
+    MEMBER = "member"                      # Distinct projects scope_id has tasks in
+
+
+class CounterEntity:
+    PROJECT = "project"
+    TASK = "task"
+    TEAM = "team"
+    USER = "user"
+
+
+class StatsCounter(Base):
+    __tablename__ = "stats_counters"
+
+    # scope_id and status are "" when not applicable (e.g. the global user count)
+    scope_type = Column(String(32), primary_key=True)
+    scope_id = Column(String(36), primary_key=True)
+    entity = Column(String(16), primary_key=True)
+    status = Column(String(32), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, desc
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,6 +16,20 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_tasks for members: assigned_to filter, keyset over the list order
+        Index("ix_tasks_assigned_to_due_date_created_at_id", "assigned_to", "due_date", desc("created_at"), "id"),
+        # list_tasks with a status filter and per-assignee stats
+        Index("ix_tasks_assigned_to_status", "assigned_to", "status"),
+        # list_tasks for managers (tasks in managed projects) and per-project stats
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        # list_tasks for admins: matches the (due_date, created_at DESC, id)
+        # list order, so every page is a range scan of this index
+        Index("ix_tasks_due_date_created_at_id", "due_date", desc("created_at"), "id"),
+        # sync: rows changed since a cursor, for admins and for members
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index("ix_tasks_assigned_to_updated_at_id", "assigned_to", "updated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
@@ -25,6 +39,7 @@ class Task(Base):
     status = Column(SQLEnum(TaskStatus), nullable=False, default=TaskStatus.TODO)
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     project = relationship("Project", backref="tasks")
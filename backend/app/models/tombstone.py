@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class TombstoneEntity:
+    TASK = "task"
+    PROJECT = "project"
+    TEAM = "team"
+    COMMENT = "comment"
+
+
+class Tombstone(Base):
+    """
+    A row that was deleted, or that some users can no longer see, kept so
+    the sync endpoint can tell clients to drop it.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        # sync: tombstones since a cursor
+        Index("ix_tombstones_deleted_at_id", "deleted_at", "id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    # Naive UTC
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Who could see the row before: its task's assignee and project manager
+    # (tasks and comments) or its manager (projects). No foreign keys, as
+    # these users may be gone by the time the tombstone is read.
+    assigned_to = Column(UUID(as_uuid=True), nullable=True)
+    manager_id = Column(UUID(as_uuid=True), nullable=True)
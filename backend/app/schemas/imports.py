@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+
+
+# One row of an import file. References to other rows (team, manager,
+# project, assignee, author) may be an id or a unique name: a team or
+# project name, or a user's email or username. ``id`` keeps a row's id from
+# the source system, so later files (e.g. comments) can refer to it.
+
+class ProjectImport(BaseModel):
+    id: Optional[UUID] = None
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    team: str
+    manager: str
+    status: str = Field(default="active", pattern="^(active|completed)$")
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    created_at: Optional[datetime] = None
+
+
+class TaskImport(BaseModel):
+    id: Optional[UUID] = None
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    project: str
+    assigned_to: str
+    status: str = Field(default="todo", pattern="^(todo|in_progress|done)$")
+    due_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+class CommentImport(BaseModel):
+    id: Optional[UUID] = None
+    task_id: UUID
+    author: str
+    message: str = Field(..., min_length=1)
+    created_at: Optional[datetime] = None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportProgress(BaseModel):
+    processed: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError] = []
+    done: bool = False
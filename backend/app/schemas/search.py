@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.comment import CommentOut
+from app.schemas.task import TaskOut
+
+
+class TaskSearchHit(TaskOut):
+    score: float
+
+
+class CommentSearchHit(CommentOut):
+    score: float
+
+
+class SearchResults(BaseModel):
+    tasks: List[TaskSearchHit]
+    comments: List[CommentSearchHit]
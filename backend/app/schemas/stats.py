@@ -22,3 +22,12 @@ class StatsOverview(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AuthCacheStats(BaseModel):
+    token_hits: int
+    token_misses: int
+    token_entries: int
+    user_hits: int
+    user_misses: int
+    user_entries: int
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List
+from uuid import UUID
+
+from app.schemas.comment import CommentOut
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+from app.schemas.team import TeamOut
+
+
+class DeletedRef(BaseModel):
+    entity: str  # task, project, team or comment
+    id: UUID
+
+
+class SyncChanges(BaseModel):
+    tasks: List[TaskOut]
+    projects: List[ProjectOut]
+    teams: List[TeamOut]
+    comments: List[CommentOut]
+    # Rows to drop: deleted, or no longer visible to the caller
+    deleted: List[DeletedRef]
+    # Pass back as ``since`` on the next call
+    cursor: str
+    # More changes are waiting; call again right away with ``cursor``
+    has_more: bool
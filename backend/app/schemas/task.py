@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
+from app.core.config import settings
+
 
 class TaskCreate(BaseModel):
     title: str
@@ -33,3 +35,33 @@ class TaskOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskBulkOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    # Task to update or delete
+    id: Optional[UUID] = None
+    # Payload for "create" / "update"
+    create: Optional[TaskCreate] = None
+    update: Optional[TaskUpdate] = None
+
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOperation] = Field(..., min_length=1, max_length=settings.TASK_BULK_MAX_OPERATIONS)
+    # Apply nothing if any operation fails validation
+    atomic: bool = False
+
+
+class TaskBulkResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[UUID] = None
+    task: Optional[TaskOut] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkResult]
@@ -0,0 +1,123 @@
+"""
+Throughput and memory of bulk imports (``app.core.importer``) into a scratch
+SQLite database (see benchmarks/results/bulk_import.md).
+
+Writes a task file of the requested size and format (100 projects, 50
+assignees referred to by email), then imports it in-process and reports
+rows per second and the growth of the process's peak RSS (``VmHWM``). For
+comparison, ``--orm-rows`` tasks are also created through ORM sessions in
+batches of the same size, which is what a loop over ``POST /api/v1/tasks/``
+amounts to without the HTTP overhead.
+
+Usage:
+    python -m benchmarks.bulk_import --rows 100000 1000000 --format csv
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "import.db")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core import stats_counters  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.importer import ImportEntity, ImportFormat, import_records, read_records  # noqa: E402
+from app.models import Project, Task, TaskStatus, Team, User, UserRole  # noqa: E402
+from benchmarks.export_memory import peak_rss_mb  # noqa: E402
+from benchmarks.search_latency import new_id  # noqa: E402
+
+USERS = 50
+PROJECTS = 100
+
+
+def seed() -> None:
+    start = datetime.utcnow() - timedelta(days=30)
+    users = [{"id": new_id(), "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x",
+              "role": UserRole.member, "created_at": start} for i in range(USERS)]
+    team = {"id": new_id(), "name": "Seed", "created_by": users[0]["id"], "updated_at": start}
+    projects = [{"id": new_id(), "name": f"project{i}", "team_id": team["id"], "manager_id": users[i % USERS]["id"],
+                 "updated_at": start} for i in range(PROJECTS)]
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+        connection.execute(insert(Team), [team])
+        connection.execute(insert(Project), projects)
+        stats_counters.rebuild(connection)
+
+
+def task_record(i: int) -> dict:
+    return {"title": f"Task {i}", "description": "Imported task " * 5, "project": f"project{i % PROJECTS}",
+            "assigned_to": f"user{i % USERS}@example.com", "status": list(TaskStatus)[i % 3].value}
+
+
+def write_file(rows: int, fmt: ImportFormat) -> str:
+    path = os.path.join(tempfile.mkdtemp(), f"tasks.{fmt.value}")
+    with open(path, "w", newline="") as out:
+        if fmt == ImportFormat.csv:
+            writer = csv.DictWriter(out, fieldnames=list(task_record(0)))
+            writer.writeheader()
+            writer.writerows(task_record(i) for i in range(rows))
+        else:
+            out.writelines(json.dumps(task_record(i)) + "\n" for i in range(rows))
+    return path
+
+
+def orm_create(rows: int) -> None:
+    projects = {project.name: project.id for project in SessionLocal().query(Project)}
+    users = {user.email: user.id for user in SessionLocal().query(User)}
+    for offset in range(0, rows, settings.IMPORT_CHUNK_ROWS):
+        with SessionLocal() as db:
+            for i in range(offset, min(rows, offset + settings.IMPORT_CHUNK_ROWS)):
+                record = task_record(i)
+                db.add(Task(title=record["title"], description=record["description"],
+                            project_id=projects[record["project"]], assigned_to=users[record["assigned_to"]],
+                            status=TaskStatus(record["status"])))
+            db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--format", choices=[fmt.value for fmt in ImportFormat], default="csv")
+    parser.add_argument("--orm-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    seed()
+    fmt = ImportFormat(args.format)
+    for rows in args.rows:
+        path = write_file(rows, fmt)
+        before = peak_rss_mb(os.getpid())
+        start = time.perf_counter()
+        with open(path, newline="") as stream:
+            for progress in import_records(engine, ImportEntity.tasks, read_records(stream, fmt)):
+                pass
+        seconds = time.perf_counter() - start
+        assert progress.imported == rows, progress
+        peak = peak_rss_mb(os.getpid())
+        print(f"import {rows:>9,} rows: {seconds:6.1f} s, {rows / seconds:8,.0f} rows/s, "
+              f"peak RSS {peak:5.0f} MB (+{peak - before:.0f})")
+        os.remove(path)
+
+    with engine.begin() as connection:
+        assert stats_counters.check(connection) == {}
+        connection.execute(delete(Task))
+        stats_counters.rebuild(connection)
+
+    start = time.perf_counter()
+    orm_create(args.orm_rows)
+    seconds = time.perf_counter() - start
+    print(f"ORM    {args.orm_rows:>9,} rows: {seconds:6.1f} s, {args.orm_rows / seconds:8,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Task creation throughput: one ``POST /api/v1/tasks/`` per task versus
+``POST /api/v1/tasks/bulk`` batches, measured in-process against a scratch
+SQLite database (see benchmarks/results/bulk_tasks.md).
+
+Usage:
+    python -m benchmarks.bulk_tasks --tasks 2000 --batch 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bulk.db")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks created by each method")
+    parser.add_argument("--batch", type=int, default=1000, help="Operations per bulk request")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as client:
+        login = client.post("/api/v1/auth/login", json={"email": "admin@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        admin_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        team = client.post("/api/v1/teams/", json={"name": "Bench"}, headers=headers).json()
+        project = client.post("/api/v1/projects/", json={"name": "Bench", "team_id": team["id"]}, headers=headers).json()
+        payload = {"title": "task", "project_id": project["id"], "assigned_to": admin_id}
+
+        start = time.perf_counter()
+        for _ in range(args.tasks):
+            client.post("/api/v1/tasks/", json=payload, headers=headers).raise_for_status()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for offset in range(0, args.tasks, args.batch):
+            count = min(args.batch, args.tasks - offset)
+            response = client.post(
+                "/api/v1/tasks/bulk",
+                json={"operations": [{"op": "create", "create": payload}] * count},
+                headers=headers,
+            )
+            response.raise_for_status()
+            assert response.json()["failed"] == 0
+        bulk = time.perf_counter() - start
+
+    print(f"single endpoint: {args.tasks / single:,.0f} tasks/s ({single:.2f}s)")
+    print(f"bulk endpoint:   {args.tasks / bulk:,.0f} tasks/s ({bulk:.2f}s, {args.batch} per request)")
+    print(f"speedup:         {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
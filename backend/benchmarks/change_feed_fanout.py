@@ -0,0 +1,207 @@
+"""
+Change feed fanout with 10k connections in one worker.
+
+Two measurements (see benchmarks/results/change_feed_fanout.md):
+
+- broker: 10k in-process subscriptions, each drained by its own task like
+  a connection handler, plus a share of consumers that never read. Reports
+  the cost of ``publish`` for targeted task events and for project events
+  that go to every member, the delivery latency of broadcasts, and evictions.
+- websocket: a uvicorn worker serving the app on a scratch SQLite database
+  and N real WebSocket clients. Reports how long a project update takes to
+  reach every client.
+
+Usage:
+    python -m benchmarks.change_feed_fanout --connections 10000
+    python -m benchmarks.change_feed_fanout --connections 10000 --websockets
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from app.core.events import ChangeBroker, Envelope
+from app.models.user import User, UserRole
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summary(samples_ms: list) -> str:
+    return (f"p50 {percentile(samples_ms, 50):.2f} ms, p95 {percentile(samples_ms, 95):.2f} ms, "
+            f"p99 {percentile(samples_ms, 99):.2f} ms, max {max(samples_ms):.2f} ms")
+
+
+async def broker_fanout(connections: int, slow_share: float, events: int, broadcasts: int, queue_size: int) -> None:
+    rnd = random.Random(18)
+    broker = ChangeBroker(queue_size=queue_size)
+    admins = [User(id=uuid.uuid4(), role=UserRole.admin) for _ in range(max(1, connections // 500))]
+    managers = [User(id=uuid.uuid4(), role=UserRole.manager) for _ in range(max(1, connections // 50))]
+    members = [User(id=uuid.uuid4(), role=UserRole.member) for _ in range(connections - len(admins) - len(managers))]
+    users = admins + managers + members
+
+    sent_at = {}
+    latencies = []
+
+    async def consume(subscription):
+        while True:
+            message = await subscription.get()
+            if message in sent_at:
+                latencies.append((time.perf_counter() - sent_at[message]) * 1000)
+            if subscription.evicted and subscription.queue.empty():
+                return
+
+    subscriptions = [broker.subscribe(user) for user in users]
+    slow = set(rnd.sample(range(len(subscriptions)), int(len(subscriptions) * slow_share)))
+    reading = [subscription for i, subscription in enumerate(subscriptions) if i not in slow]
+    consumers = [asyncio.create_task(consume(subscription)) for subscription in reading]
+    print(f"{connections:,} subscriptions ({len(admins)} admins, {len(managers)} managers, "
+          f"{len(members):,} members), {len(slow)} never read, queue size {queue_size}")
+
+    # Targeted task events: assignee + project manager + admins
+    start = time.perf_counter()
+    for i in range(events):
+        audience = {str(rnd.choice(members).id), str(rnd.choice(managers).id)}
+        broker.publish([Envelope(f"task {i}", audience, {"admin"})])
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    print(f"task events:    {events:,} published, {elapsed / events * 1e6:.1f} us per publish")
+    await asyncio.sleep(0.5)
+
+    # Broadcasts (project changes reach every member), one at a time
+    publish_ms = []
+    for i in range(broadcasts):
+        message = f"project {i}"
+        latencies.clear()
+        sent_at[message] = time.perf_counter()
+        broker.publish([Envelope(message, set(), {"admin", "member"})])
+        publish_ms.append((time.perf_counter() - sent_at[message]) * 1000)
+        receivers = sum(1 for s in reading if s.role in ("admin", "member"))
+        deadline = time.perf_counter() + 10
+        while len(latencies) < receivers and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+        if i == broadcasts - 1:
+            print(f"broadcast:      {receivers:,} receivers, publish {summary(publish_ms)}")
+            print(f"                delivery to all receivers of the last broadcast: {summary(latencies)}")
+
+    # Keep broadcasting until the consumers that never read overflow
+    for i in range(queue_size):
+        broker.publish([Envelope(f"burst {i}", set(), {"admin", "member"})])
+        await asyncio.sleep(0)
+    print(f"evicted:        {broker.evictions} slow consumers, {broker.connections:,} connections left")
+
+    for task in consumers:
+        task.cancel()
+
+
+def _server(port: int, db_dir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite:///" + os.path.join(db_dir, "feed.db"),
+        "SQL_INSTRUMENTATION": "false",
+    }
+    # Create the schema, then serve with a single worker
+    subprocess.run([sys.executable, "-c", (
+        "import app.models; from app.core.database import Base, engine; Base.metadata.create_all(engine)"
+    )], env=env, check=True)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+         "--backlog", "16384"],
+        env=env,
+    )
+
+
+def _cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process (Linux)."""
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def websocket_fanout(connections: int, updates: int, port: int, server_pid: int) -> None:
+    import httpx
+    import websockets
+
+    base = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base, timeout=60) as http:
+        for _ in range(100):
+            try:
+                await http.get("/health")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+        login = await http.post("/api/v1/auth/login", json={"email": "admin@example.com", "password": "password123"})
+        admin = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        login = await http.post("/api/v1/auth/login", json={"email": "member@example.com", "password": "password123"})
+        member_token = login.json()["access_token"]
+        team = (await http.post("/api/v1/teams/", json={"name": "Feed"}, headers=admin)).json()
+        project = (await http.post("/api/v1/projects/", json={"name": "Feed", "team_id": team["id"]}, headers=admin)).json()
+
+        url = f"ws://127.0.0.1:{port}/api/v1/events/ws?access_token={member_token}"
+        start = time.perf_counter()
+        sockets = []
+        for offset in range(0, connections, 500):
+            sockets += await asyncio.gather(*[
+                websockets.connect(url, ping_interval=None, max_queue=None)
+                for _ in range(min(500, connections - offset))
+            ])
+        print(f"{len(sockets):,} WebSocket connections open after {time.perf_counter() - start:.1f}s")
+
+        for i in range(updates):
+            await asyncio.sleep(1)
+            cpu = _cpu_seconds(server_pid)
+            start = time.perf_counter()
+            response = await http.put(
+                f"/api/v1/projects/{project['id']}", json={"description": f"update {i}"}, headers=admin
+            )
+            response.raise_for_status()
+            acknowledged = (time.perf_counter() - start) * 1000
+
+            async def receive(ws):
+                await ws.recv()
+                return (time.perf_counter() - start) * 1000
+
+            latencies = await asyncio.gather(*[receive(ws) for ws in sockets])
+            # Client and server share the machine: the server's own CPU time
+            # is the cost of the update plus the fanout
+            print(f"update {i}: server CPU {(_cpu_seconds(server_pid) - cpu) * 1000:.0f} ms, "
+                  f"HTTP response {acknowledged:.1f} ms; delivered to all {len(sockets):,} clients: "
+                  f"{summary(latencies)}")
+
+        await asyncio.gather(*[ws.close() for ws in sockets])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--slow-share", type=float, default=0.01, help="Share of broker consumers that never read")
+    parser.add_argument("--events", type=int, default=20000, help="Targeted task events published")
+    parser.add_argument("--broadcasts", type=int, default=20, help="Project events sent to every member")
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--websockets", action="store_true", help="Also measure real WebSocket connections")
+    parser.add_argument("--updates", type=int, default=5, help="Project updates sent to the WebSocket clients")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    asyncio.run(broker_fanout(args.connections, args.slow_share, args.events, args.broadcasts, args.queue_size))
+
+    if args.websockets:
+        print()
+        server = _server(args.port, tempfile.mkdtemp())
+        try:
+            asyncio.run(websocket_fanout(args.connections, args.updates, args.port, server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Server memory while exporting every task, at several table sizes (see
+benchmarks/results/export_memory.md).
+
+For each size: seed a scratch SQLite file with Core inserts, start a uvicorn
+worker on it, stream ``GET /api/v1/export/tasks`` as an admin and read the
+worker's peak RSS (``VmHWM``) before and after. For comparison, the same is
+done for ``GET /api/v1/tasks/`` (the whole list in one JSON array) up to
+``--list-max`` rows.
+
+SQLite's page cache and memory map are part of the worker's RSS and fill up
+as a large table is scanned (``SQLITE_CACHE_SIZE`` 64 MB and
+``SQLITE_MMAP_SIZE`` 256 MB by default). ``--small-sqlite-cache`` shrinks
+both, leaving the memory the app itself holds.
+
+Usage:
+    python -m benchmarks.export_memory --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine, insert
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.models import Project, Task, TaskStatus, Team, User, UserRole
+from benchmarks.search_latency import new_id
+
+CHUNK = 10000
+PORT = 8765
+
+
+def seed(url: str, tasks: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    start = datetime.utcnow() - timedelta(days=30)
+    user = {"id": new_id(), "username": "seed", "email": "seed@example.com", "password_hash": "x",
+            "role": UserRole.member, "created_at": start}
+    team = {"id": new_id(), "name": "Seed", "created_by": user["id"], "updated_at": start}
+    projects = [{"id": new_id(), "name": f"project{i}", "team_id": team["id"], "manager_id": user["id"],
+                 "updated_at": start} for i in range(100)]
+    statuses = list(TaskStatus)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [user])
+        connection.execute(insert(Team), [team])
+        connection.execute(insert(Project), projects)
+        for offset in range(0, tasks, CHUNK):
+            connection.execute(insert(Task), [
+                {"id": new_id(), "title": f"Task {i}", "description": "Seeded task " * 5,
+                 "project_id": projects[i % 100]["id"], "assigned_to": user["id"], "status": statuses[i % 3],
+                 "created_at": start + timedelta(seconds=i), "updated_at": start}
+                for i in range(offset, min(tasks, offset + CHUNK))
+            ])
+    engine.dispose()
+
+
+def peak_rss_mb(pid: int) -> float:
+    """Peak resident set size of a process so far (Linux)."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not found")
+
+
+def measure(url: str, path: str, params: dict, small_sqlite_cache: bool) -> tuple:
+    """Start a fresh worker, fetch ``path`` once; return (seconds, MB sent, RSS before, peak RSS)."""
+    env = {**os.environ, "DATABASE_URL": url, "SQL_INSTRUMENTATION": "false"}
+    if small_sqlite_cache:
+        env.update(SQLITE_CACHE_SIZE="-2000", SQLITE_MMAP_SIZE="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"], env=env,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=3600) as client:
+            while True:
+                try:
+                    client.get("/health")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.2)
+            login = client.post("/api/v1/auth/login", json={"email": "admin@example.com", "password": "password123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            before = peak_rss_mb(server.pid)
+            start, size = time.perf_counter(), 0
+            with client.stream("GET", path, params=params, headers=headers) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+            return time.perf_counter() - start, size / 1e6, before, peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--list-max", type=int, default=100000,
+                        help="Largest table also fetched through GET /api/v1/tasks/")
+    parser.add_argument("--small-sqlite-cache", action="store_true",
+                        help="Run the worker with a 2 MB SQLite page cache and no memory map")
+    args = parser.parse_args()
+
+    for tasks in args.sizes:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), f"export-{uuid.uuid4().hex}.db")
+        seed(url, tasks)
+        runs = [("export", "/api/v1/export/tasks", {"format": args.format})]
+        if tasks <= args.list_max:
+            runs.append(("list", "/api/v1/tasks/", {}))
+        for label, path, params in runs:
+            seconds, sent, before, peak = measure(url, path, params, args.small_sqlite_cache)
+            print(f"{tasks:>9,} tasks {label:6}: {seconds:7.1f} s, {sent:8.1f} MB sent, "
+                  f"RSS {before:5.0f} MB -> peak {peak:6.0f} MB (+{peak - before:.0f})")
+
+
+if __name__ == "__main__":
+    main()
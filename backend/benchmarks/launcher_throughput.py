@@ -0,0 +1,53 @@
+"""
+Throughput of a running server for a few representative routes.
+
+Used to compare launch modes (``python run.py --dev`` vs ``python run.py``);
+see benchmarks/results/launcher_throughput.md.
+
+Usage:
+    python -m benchmarks.launcher_throughput --url http://localhost:8000 --seconds 10 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+PATHS = ["/health", "/api/v1/tasks/", "/api/v1/stats/overview"]
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict, seconds: float, concurrency: int) -> float:
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return done / (time.perf_counter() - start)
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+        login = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        for path in PATHS:
+            rate = await measure(client, path, headers, args.seconds, args.concurrency)
+            print(f"{path}: {rate:.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-route throughput of a running server")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="password123")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,145 @@
+"""
+Per-row cost of list responses: ORM objects validated through
+``response_model`` and encoded by FastAPI (the previous path), against
+column rows encoded with orjson (``app.api.fast_json``). Measured in-process
+against a scratch SQLite database (see
+benchmarks/results/list_serialization.md).
+
+Times the database fetch and the encoding separately, then whole
+``GET /api/v1/tasks/`` requests through ``TestClient``. The previous path is
+mounted on a scratch route for that comparison.
+
+Usage:
+    python -m benchmarks.list_serialization --rows 10000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "serialization.db")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+
+from fastapi import Depends  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.api.dependencies import get_current_user, get_read_db  # noqa: E402
+from app.api.fast_json import dump_rows, out_columns  # noqa: E402
+from app.core.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Project, Task, TaskStatus, Team, User  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.schemas.task import TaskOut  # noqa: E402
+from benchmarks.search_latency import new_id  # noqa: E402
+
+FIELD = create_model_field(name="Response_list_tasks", type_=List[TaskOut], mode="serialization")
+
+
+def seed(rows: int) -> None:
+    rnd = random.Random(21)
+    start = datetime.utcnow() - timedelta(days=30)
+    user = {"id": new_id(), "username": "seed", "email": "seed@example.com", "password_hash": "x",
+            "role": UserRole.member, "created_at": start}
+    team = {"id": new_id(), "name": "Seed", "created_by": user["id"], "updated_at": start}
+    project = {"id": new_id(), "name": "Seed", "team_id": team["id"], "manager_id": user["id"], "updated_at": start}
+    with engine.begin() as connection:
+        connection.execute(insert(User), [user])
+        connection.execute(insert(Team), [team])
+        connection.execute(insert(Project), [project])
+        connection.execute(insert(Task), [
+            {"id": new_id(), "title": f"Task {i}", "description": "Seeded task " * 5,
+             "project_id": project["id"], "assigned_to": user["id"], "status": rnd.choice(list(TaskStatus)),
+             "due_date": start + timedelta(days=rnd.randint(0, 60)) if i % 3 else None,
+             "created_at": start + timedelta(seconds=i), "updated_at": start}
+            for i in range(rows)
+        ])
+
+
+async def encode_pydantic(tasks) -> bytes:
+    # What FastAPI does with a response_model: validate, then json.dumps
+    for task in tasks:
+        task.status = task.status.value
+    return JSONResponse(await serialize_response(field=FIELD, response_content=tasks)).body
+
+
+async def measure(repeat: int) -> dict:
+    samples = {"orm fetch": [], "pydantic encode": [], "row fetch": [], "orjson encode": []}
+    for _ in range(repeat):
+        # Leftovers of the previous round would be collected mid-measurement
+        gc.collect()
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            tasks = (await db.scalars(select(Task))).all()
+            samples["orm fetch"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            await encode_pydantic(tasks)
+            samples["pydantic encode"].append(time.perf_counter() - start)
+        del tasks
+        gc.collect()
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            rows = (await db.execute(select(*out_columns(TaskOut, Task)))).all()
+            samples["row fetch"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            dump_rows(TaskOut, rows)
+            samples["orjson encode"].append(time.perf_counter() - start)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+@app.get("/bench/tasks-pydantic", response_model=List[TaskOut])
+async def list_tasks_pydantic(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    tasks = (await db.scalars(select(Task))).all()
+    for task in tasks:
+        task.status = task.status.value
+    return tasks
+
+
+def timed_get(client, path: str, headers: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(path, headers=headers).raise_for_status()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    seed(args.rows)
+
+    def per_row(seconds: float) -> str:
+        return f"{seconds * 1000:7.1f} ms  ({seconds / args.rows * 1e6:5.2f} us/row)"
+
+    for name, seconds in asyncio.run(measure(args.repeat)).items():
+        print(f"{name:16}: {per_row(seconds)}")
+
+    with TestClient(app) as client:
+        login = client.post("/api/v1/auth/login", json={"email": "admin@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        for label, path in (("GET pydantic", "/bench/tasks-pydantic"), ("GET orjson", "/api/v1/tasks/")):
+            print(f"{label:16}: {per_row(timed_get(client, path, headers, args.repeat))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+End-to-end load test: virtual users replay a mix of dashboard requests
+against a server and the throughput and latency percentiles of each route
+are reported as JSON (see benchmarks/results/load_test.md).
+
+Each virtual user logs in as one of the accounts made by
+``benchmarks.dataset`` (admin, manager or member, by ``--roles``), fetches
+its task list, then sends requests picked by ``--mix`` until ``--seconds``
+have passed. Users start evenly over ``--ramp-up`` seconds:
+
+- ``login``: ``POST /api/v1/auth/login`` (and use the new token);
+- ``tasks``: ``GET /api/v1/tasks/``;
+- ``projects``: ``GET /api/v1/projects/``;
+- ``comments``: ``GET /api/v1/comments/{task_id}`` for one of its tasks;
+- ``stats``: ``GET /api/v1/stats/overview``.
+
+Point ``--url`` at a running server, or pass ``--serve DATABASE_URL`` to
+start uvicorn on a seeded database for the run. Save the report with
+``--output`` and pass it as ``--baseline`` on a later run (e.g. another
+commit) to print the change per route.
+
+Usage:
+    python -m benchmarks.dataset --url sqlite:///loadtest.db --tasks 100000 --heavy-managers 2
+    python -m benchmarks.load_test --serve sqlite:///loadtest.db --seconds 60 --output before.json
+    python -m benchmarks.load_test --serve sqlite:///loadtest.db --seconds 60 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.dataset import PASSWORD
+from benchmarks.search_latency import percentile
+
+ROUTES = {
+    "login": ("POST", "/api/v1/auth/login"),
+    "tasks": ("GET", "/api/v1/tasks/"),
+    "projects": ("GET", "/api/v1/projects/"),
+    "comments": ("GET", "/api/v1/comments/{task_id}"),
+    "stats": ("GET", "/api/v1/stats/overview"),
+}
+
+
+def weights(spec: str) -> dict:
+    """Parse ``name:weight,name:weight``."""
+    parsed = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition(":")
+        parsed[name.strip()] = float(weight or 1)
+    return parsed
+
+
+class Recorder:
+    """Latencies (ms) and error status codes per route."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+
+    async def send(self, client: httpx.AsyncClient, route: str, **kwargs) -> httpx.Response:
+        method, path = ROUTES[route]
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path.format(**kwargs.pop("path_params", {})), **kwargs)
+        except httpx.TransportError as exc:
+            self.errors[route][type(exc).__name__] += 1
+            return None
+        if response.status_code >= 400:
+            self.errors[route][str(response.status_code)] += 1
+        else:
+            self.latencies[route].append((time.perf_counter() - start) * 1000)
+        return response
+
+    def report(self, seconds: float) -> dict:
+        routes = {}
+        for route in ROUTES:
+            samples = self.latencies.get(route, [])
+            errors = dict(self.errors.get(route, {}))
+            if not samples and not errors:
+                continue
+            routes[route] = {
+                "requests": len(samples) + sum(errors.values()),
+                "errors": errors,
+                "throughput_rps": round(len(samples) / seconds, 2),
+                **{f"p{pct}_ms": round(percentile(samples, pct), 2) if samples else None for pct in (50, 95, 99)},
+            }
+        everything = [sample for samples in self.latencies.values() for sample in samples]
+        total = {
+            "requests": sum(route["requests"] for route in routes.values()),
+            "errors": sum(sum(route["errors"].values()) for route in routes.values()),
+            "throughput_rps": round(len(everything) / seconds, 2),
+            **{f"p{pct}_ms": round(percentile(everything, pct), 2) if everything else None for pct in (50, 95, 99)},
+        }
+        return {"routes": routes, "total": total}
+
+
+def account(role: str, rnd: random.Random, args) -> dict:
+    if role == "admin":
+        return {"email": "admin@example.com", "password": PASSWORD}
+    if role == "manager":
+        return {"email": f"manager{rnd.randrange(args.managers)}@example.com", "password": PASSWORD,
+                "secret_code": "manager"}
+    return {"email": f"member{rnd.randrange(args.members)}@example.com", "password": PASSWORD}
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, rnd: random.Random, delay: float,
+                       deadline: float, args, mix: dict) -> None:
+    await asyncio.sleep(delay)
+    roles = weights(args.roles)
+    credentials = account(rnd.choices(list(roles), weights=list(roles.values()))[0], rnd, args)
+
+    async def login() -> dict:
+        response = await recorder.send(client, "login", json=credentials)
+        if response is None or response.status_code != 200:
+            return None
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    headers = await login()
+    if headers is None:
+        return
+    response = await recorder.send(client, "tasks", headers=headers)
+    task_ids = [task["id"] for task in response.json()] if response is not None and response.is_success else []
+
+    names, route_weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        route = rnd.choices(names, weights=route_weights)[0]
+        if route == "login":
+            headers = await login() or headers
+        elif route == "comments":
+            if task_ids:
+                await recorder.send(client, route, headers=headers, path_params={"task_id": rnd.choice(task_ids)})
+        else:
+            await recorder.send(client, route, headers=headers)
+        if args.think_ms:
+            await asyncio.sleep(rnd.expovariate(1000 / args.think_ms))
+
+
+async def run(url: str, args) -> dict:
+    mix = weights(args.mix)
+    unknown = set(mix) - set(ROUTES)
+    if unknown:
+        raise SystemExit(f"Unknown routes in --mix: {', '.join(sorted(unknown))}")
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        deadline = start + args.seconds
+        await asyncio.gather(*(
+            virtual_user(client, recorder, random.Random(args.seed + i), args.ramp_up * i / args.concurrency,
+                         deadline, args, mix)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "url": url, "serve": args.serve, "workers": args.workers, "seconds": args.seconds,
+            "concurrency": args.concurrency, "ramp_up": args.ramp_up, "mix": mix, "roles": weights(args.roles),
+            "think_ms": args.think_ms,
+        },
+        "elapsed_seconds": round(elapsed, 2),
+        **recorder.report(elapsed),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def serve(database_url: str, port: int, workers: int):
+    """Run uvicorn on ``database_url`` until the block exits; yield its URL."""
+    env = {**os.environ, "DATABASE_URL": database_url, "SQL_INSTRUMENTATION": "false"}
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning",
+    ], env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(base_url=url) as client:
+            while True:
+                try:
+                    client.get("/health")
+                    break
+                except httpx.TransportError:
+                    if server.poll() is not None:
+                        raise SystemExit("The server exited during startup")
+                    time.sleep(0.2)
+        yield url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print throughput and p95 per route next to the baseline's."""
+    print(f"{'route':10} {'req/s':>16} {'p95 ms':>18} {'p99 ms':>18}", file=sys.stderr)
+    rows = dict(report["routes"], total=report["total"])
+    old_rows = dict(baseline["routes"], total=baseline["total"])
+    for route, new in rows.items():
+        old = old_rows.get(route)
+        if old is None:
+            continue
+
+        def cell(key):
+            if not old[key] or new[key] is None:
+                return f"{new[key]!s:>18}"
+            return f"{old[key]:>7} -> {new[key]:<7} {(new[key] / old[key] - 1) * 100:+4.0f}%"
+
+        print(f"{route:10} {cell('throughput_rps')} {cell('p95_ms')} {cell('p99_ms')}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000", help="Server to load (ignored with --serve)")
+    parser.add_argument("--serve", metavar="DATABASE_URL", help="Start uvicorn on this database for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --serve")
+    parser.add_argument("--port", type=int, default=8766, help="Port for --serve")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which virtual users start")
+    parser.add_argument("--mix", default="login:1,tasks:4,projects:3,comments:4,stats:2",
+                        help="Relative weight of each route")
+    parser.add_argument("--roles", default="admin:1,manager:4,member:45", help="Relative weight of each role")
+    parser.add_argument("--managers", type=int, default=50, help="Managers seeded by benchmarks.dataset")
+    parser.add_argument("--members", type=int, default=1000, help="Members seeded by benchmarks.dataset")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between a user's requests")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=24)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare with")
+    args = parser.parse_args()
+
+    if args.serve:
+        with serve(args.serve, args.port, args.workers) as url:
+            report = asyncio.run(run(url, args))
+    else:
+        report = asyncio.run(run(args.url, args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as previous:
+            compare(report, json.load(previous))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Per-request authentication: JWT encode/decode and ``get_current_user`` with
+and without the auth cache.
+"""
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.dependencies import get_current_user
+from app.core.auth import create_access_token, decode_token
+from app.core.auth_cache import auth_cache
+from app.core.database import AsyncSessionLocal
+
+
+def _token(user) -> str:
+    return create_access_token({"sub": str(user.id), "email": user.email, "role": user.role.value})
+
+
+def bench_create_access_token(benchmark, users):
+    payload = {"sub": str(users["member"].id), "email": users["member"].email, "role": "member"}
+    benchmark(create_access_token, payload)
+
+
+def bench_decode_token(benchmark, users):
+    benchmark(decode_token, _token(users["member"]))
+
+
+@pytest.mark.parametrize("cache", ["cached", "uncached"])
+def bench_get_current_user(benchmark, users, loop, cache):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=_token(users["member"]))
+    session = AsyncSessionLocal()
+
+    def resolve():
+        return loop.run_until_complete(get_current_user(credentials, session))
+
+    auth_cache.clear()
+    if cache == "cached":
+        resolve()
+        user = benchmark(resolve)
+    else:
+        # Token verification plus the user query, every round
+        user = benchmark.pedantic(resolve, setup=auth_cache.clear, rounds=500, warmup_rounds=10)
+    loop.run_until_complete(session.close())
+    assert user.id == users["member"].id
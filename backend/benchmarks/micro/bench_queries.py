@@ -0,0 +1,14 @@
+"""
+Building the ``list_tasks`` query with each role's visibility filter, which
+happens on every request before SQLAlchemy's compiled-statement cache is
+consulted.
+"""
+import pytest
+
+from app.api.v1.tasks import task_list_query
+
+
+@pytest.mark.parametrize("status_filter", [None, "done"])
+@pytest.mark.parametrize("role", ["admin", "manager", "member"])
+def bench_task_list_query(benchmark, users, role, status_filter):
+    benchmark(task_list_query, users[role], status_filter)
@@ -0,0 +1,50 @@
+"""
+Pydantic validation of response lists, as ``response_model`` does it: from
+ORM objects (``from_attributes``), at 1, 100 and 10k rows.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.models import Comment, Project, ProjectStatus, Task
+from app.schemas.comment import CommentOut
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+
+SIZES = [1, 100, 10000]
+START = datetime(2026, 1, 1)
+
+
+def _task(i: int) -> Task:
+    return Task(id=uuid.uuid4(), title=f"Task {i}", description="Seeded task " * 5, project_id=uuid.uuid4(),
+                assigned_to=uuid.uuid4(), status="todo", due_date=START + timedelta(days=i % 60) if i % 3 else None,
+                created_at=START + timedelta(seconds=i))
+
+
+def _project(i: int) -> Project:
+    return Project(id=uuid.uuid4(), name=f"Project {i}", description="Seeded project " * 5, team_id=uuid.uuid4(),
+                   manager_id=uuid.uuid4(), status=ProjectStatus.active, start_date=START.date(), end_date=None,
+                   created_at=START + timedelta(seconds=i))
+
+
+def _comment(i: int) -> Comment:
+    comment = Comment(id=uuid.uuid4(), task_id=uuid.uuid4(), author_id=uuid.uuid4(), message="Seeded comment " * 8,
+                      created_at=START + timedelta(seconds=i))
+    comment.author_name = f"user{i % 50}"
+    return comment
+
+
+SCHEMAS = {"TaskOut": (TaskOut, _task), "ProjectOut": (ProjectOut, _project), "CommentOut": (CommentOut, _comment)}
+
+
+@pytest.mark.parametrize("rows", SIZES)
+@pytest.mark.parametrize("schema", list(SCHEMAS))
+def bench_validate_list(benchmark, schema, rows):
+    model, make = SCHEMAS[schema]
+    adapter = TypeAdapter(List[model])
+    objects = [make(i) for i in range(rows)]
+    validated = benchmark(adapter.validate_python, objects, from_attributes=True)
+    assert len(validated) == rows
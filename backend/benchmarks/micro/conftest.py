@@ -0,0 +1,54 @@
+"""
+Fixtures for the micro-benchmarks: a scratch SQLite database with one user
+per role, created from the models.
+
+Each run is compared with the last run saved in benchmarks/results/micro
+for this platform and fails if the fastest round of any benchmark is more than 30% slower (see
+pytest.ini). With no saved run yet, nothing is compared.
+"""
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime
+
+# Must be set before the app (and its engines) are imported
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="micro-"), "micro.db")
+os.environ.setdefault("SECRET_KEY", "micro-benchmark-secret-key")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+
+import pytest  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.database import Base, engine  # noqa: E402
+from app.models import User, UserRole  # noqa: E402
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    session = getattr(config, "_benchmarksession", None)
+    if session is not None and session.compare and not session.compared_mapping:
+        # First run on this platform: record a baseline with --benchmark-save
+        session.compare_fail = []
+
+
+@pytest.fixture(scope="session")
+def users() -> dict:
+    """One user per role, inserted once; keyed by role name."""
+    Base.metadata.create_all(engine)
+    rows = {
+        role.value: {"id": uuid.uuid4(), "username": role.value, "email": f"{role.value}@example.com",
+                     "password_hash": "x", "role": role, "created_at": datetime.utcnow()}
+        for role in UserRole
+    }
+    with engine.begin() as connection:
+        connection.execute(insert(User), list(rows.values()))
+    return {name: User(**row) for name, row in rows.items()}
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
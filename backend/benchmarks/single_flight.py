@@ -0,0 +1,123 @@
+"""
+A "9:00 burst": many users open the dashboard at the same moment, with and
+without ``@single_flight``, measured in-process against a scratch SQLite
+database (see benchmarks/results/single_flight.md).
+
+Every user sends ``GET /api/v1/stats/overview`` and ``GET /api/v1/projects/``
+at once through one event loop (``httpx.ASGITransport``). The burst is timed
+and the handler runs, collapsed requests and SQL statements are counted.
+
+Usage:
+    python -m benchmarks.single_flight --users 200 --projects 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "single_flight.db")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+# Keep every user cached for the whole run, so bursts measure the endpoints alone
+os.environ.setdefault("AUTH_USER_CACHE_TTL_SECONDS", "3600")
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.auth import create_access_token  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, async_engine, engine  # noqa: E402
+from app.core.metrics import SINGLE_FLIGHT_REQUESTS  # noqa: E402
+from app.core.stats_counters import rebuild  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Project, Team, User, UserRole  # noqa: E402
+from benchmarks.search_latency import new_id  # noqa: E402
+
+PATHS = ["/api/v1/stats/overview", "/api/v1/projects/"]
+
+
+def seed(users: int, projects: int, role: UserRole) -> list:
+    """Insert the users and projects; return one auth header per user."""
+    now = datetime.utcnow()
+    rows = [
+        {"id": new_id(), "username": f"user{i}", "email": f"user{i}@example.com",
+         "password_hash": "x", "role": role, "created_at": now}
+        for i in range(users)
+    ]
+    team = {"id": new_id(), "name": "Seed", "created_by": rows[0]["id"], "updated_at": now}
+    with engine.begin() as connection:
+        connection.execute(insert(User), rows)
+        connection.execute(insert(Team), [team])
+        connection.execute(insert(Project), [
+            {"id": new_id(), "name": f"project{i}", "description": "Seeded project " * 5,
+             "team_id": team["id"], "manager_id": rows[i % users]["id"], "updated_at": now}
+            for i in range(projects)
+        ])
+        rebuild(connection)
+    return [
+        {"Authorization": f"Bearer {create_access_token({'sub': str(row['id']), 'email': row['email']})}"}
+        for row in rows
+    ]
+
+
+def _counted(result: str) -> float:
+    return sum(SINGLE_FLIGHT_REQUESTS.labels(path, result)._value.get() for path in PATHS)
+
+
+async def burst(client: httpx.AsyncClient, headers: list) -> dict:
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    collapsed = _counted("collapsed")
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.get(path, headers=h) for h in headers for path in PATHS))
+    elapsed = (time.perf_counter() - start) * 1000
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    for response in responses:
+        response.raise_for_status()
+    collapsed = _counted("collapsed") - collapsed
+    return {
+        "ms": elapsed,
+        "runs": len(responses) - collapsed,
+        "collapsed": collapsed,
+        "statements": len(statements),
+    }
+
+
+async def run(args) -> None:
+    Base.metadata.create_all(engine)
+    headers = seed(args.users, args.projects, UserRole[args.role])
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=120
+    ) as client:
+        await asyncio.gather(*(client.get("/api/v1/auth/me", headers=h) for h in headers))
+        for enabled in (False, True):
+            settings.SINGLE_FLIGHT_ENABLED = enabled
+            results = [await burst(client, headers) for _ in range(args.repeat)]
+            median = statistics.median(result["ms"] for result in results)
+            last = results[-1]
+            label = "single flight" if enabled else "off"
+            print(f"{label:13}: {median:7.0f} ms for {2 * args.users} requests, "
+                  f"{last['statements']} statements, handler runs {last['runs']:.0f} "
+                  f"(collapsed {last['collapsed']:.0f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--role", choices=[role.name for role in UserRole], default="member")
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Reconnect cost: re-downloading the task list versus ``GET /api/v1/sync``
+with a cursor, measured in-process against a scratch SQLite database (see
+benchmarks/results/sync_delta.md).
+
+Seeds tasks and comments with Core inserts, takes a full sync for an admin
+and a member, applies a small change through the API (updates, a comment, a
+delete) and times the delta sync against the full list.
+
+Usage:
+    python -m benchmarks.sync_delta --tasks 100000 --changes 20
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# The app binds its engines at import time, so point it at a scratch database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "sync.db")
+os.environ.setdefault("SQL_INSTRUMENTATION", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.search_latency import new_id  # noqa: E402
+from app.models import Comment, Project, Task, TaskStatus, Team, User, UserRole  # noqa: E402
+
+CHUNK = 5000
+
+
+def seed(tasks: int, member_id: str, admin_id: str) -> None:
+    rnd = random.Random(19)
+    start = datetime.utcnow() - timedelta(days=30)
+    users = [
+        {"id": new_id(), "username": f"user{i}", "email": f"user{i}@example.com",
+         "password_hash": "x", "role": UserRole.member, "created_at": start}
+        for i in range(49)
+    ]
+    assignees = [user["id"] for user in users] + [uuid.UUID(member_id)]
+    team = {"id": new_id(), "name": "Seed", "created_by": uuid.UUID(admin_id), "updated_at": start}
+    projects = [
+        {"id": new_id(), "name": f"project{i}", "team_id": team["id"], "manager_id": uuid.UUID(admin_id),
+         "updated_at": start}
+        for i in range(100)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+        connection.execute(insert(Team), [team])
+        connection.execute(insert(Project), projects)
+        for offset in range(0, tasks, CHUNK):
+            rows = []
+            for i in range(offset, min(tasks, offset + CHUNK)):
+                stamp = start + timedelta(seconds=i)
+                rows.append({
+                    "id": new_id(), "title": f"Task {i}", "description": "Seeded task " * 5,
+                    "project_id": rnd.choice(projects)["id"], "assigned_to": rnd.choice(assignees),
+                    "status": rnd.choice(list(TaskStatus)), "created_at": stamp, "updated_at": stamp,
+                })
+            connection.execute(insert(Task), rows)
+            connection.execute(insert(Comment), [
+                {"id": new_id(), "task_id": row["id"], "author_id": row["assigned_to"],
+                 "message": "Seeded comment", "created_at": row["created_at"], "updated_at": row["updated_at"]}
+                for row in rows[::2]
+            ])
+
+
+def timed(call, repeat: int):
+    samples, response = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = call()
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(samples), response
+
+
+def full_sync(client, headers) -> tuple:
+    start, size, cursor, calls = time.perf_counter(), 0, None, 0
+    while True:
+        params = {"limit": 1000} if cursor is None else {"limit": 1000, "since": cursor}
+        response = client.get("/api/v1/sync/", params=params, headers=headers)
+        response.raise_for_status()
+        size, calls = size + len(response.content), calls + 1
+        body = response.json()
+        cursor = body["cursor"]
+        if not body["has_more"]:
+            return cursor, (time.perf_counter() - start) * 1000, size, calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=20, help="Tasks updated between the two syncs")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as client:
+        users = {}
+        for name, email in (("admin", "admin@example.com"), ("member", "member@example.com")):
+            login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            users[name] = (headers, client.get("/api/v1/auth/me", headers=headers).json()["id"])
+        admin, member = users["admin"][0], users["member"][0]
+
+        start = time.perf_counter()
+        seed(args.tasks, users["member"][1], users["admin"][1])
+        print(f"seeded {args.tasks:,} tasks and {args.tasks // 2:,} comments in {time.perf_counter() - start:.0f}s")
+
+        cursors = {}
+        for name, headers in (("admin", admin), ("member", member)):
+            cursors[name], elapsed, size, calls = full_sync(client, headers)
+            print(f"{name:6} full sync:  {elapsed:8.0f} ms, {size / 1e6:6.2f} MB in {calls} calls")
+
+        # A small change: the member's tasks updated, one commented on, one deleted
+        mine = client.get("/api/v1/tasks/", params={"limit": args.changes + 1}, headers=member).json()
+        for task in mine[:args.changes]:
+            new_status = "todo" if task["status"] == "done" else "done"
+            client.put(f"/api/v1/tasks/{task['id']}", json={"status": new_status}, headers=member).raise_for_status()
+        client.post("/api/v1/comments/", json={"task_id": mine[0]["id"], "message": "New"}, headers=member)
+        client.delete(f"/api/v1/tasks/{mine[-1]['id']}", headers=admin).raise_for_status()
+
+        for name, headers in (("admin", admin), ("member", member)):
+            listed, response = timed(lambda: client.get("/api/v1/tasks/", headers=headers), args.repeat)
+            print(f"{name:6} GET /tasks/: {listed:8.1f} ms, {len(response.content) / 1e6:6.2f} MB "
+                  f"({len(response.json()):,} tasks)")
+            delta, response = timed(
+                lambda: client.get("/api/v1/sync/", params={"since": cursors[name]}, headers=headers), args.repeat
+            )
+            body = response.json()
+            print(f"{name:6} delta sync: {delta:8.1f} ms, {len(response.content) / 1e3:6.1f} KB "
+                  f"({len(body['tasks'])} tasks, {len(body['comments'])} comments, {len(body['deleted'])} deleted)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,102 @@
+"""
+Server entry point.
+
+    python run.py          # production: pre-forked gunicorn + uvicorn workers
+    python run.py --dev    # development: single uvicorn process with reload
+
+Production mode is tuned through environment variables:
+    WEB_CONCURRENCY      worker processes (default: CPU count)
+    BACKLOG              listen backlog (default: 2048)
+    KEEPALIVE_TIMEOUT    seconds to keep idle connections open (default: 15)
+    GRACEFUL_TIMEOUT     seconds workers get to drain on SIGTERM (default: 30)
+"""
 import os
+import sys
+import tempfile
 import uvicorn
 from dotenv import load_dotenv
 
 load_dotenv()
 
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+except ImportError:  # gunicorn is not available on Windows
+    BaseApplication = None
+    UvicornWorker = None
+
+
+if UvicornWorker is not None:
+    class ProductionUvicornWorker(UvicornWorker):
+        """Uvicorn worker pinned to uvloop and httptools."""
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+    class ProductionServer(BaseApplication):
+        """
+        Gunicorn master that imports the app once and forks workers from it.
+        SIGTERM stops accepting connections and lets in-flight requests finish
+        within ``graceful_timeout``.
+        """
+
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+
+def post_fork(server, worker):
+    # Connections must never be shared across processes; drop any the
+    # master may have opened while importing the app.
+    from app.core.database import engine, async_engine
+    from app.core.replicas import read_replicas
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in read_replicas.replicas:
+        replica.engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def run_production(port: int) -> None:
+    if BaseApplication is None:
+        sys.exit("Production mode requires gunicorn; use --dev on this platform")
+
+    # Aggregate /metrics across workers
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+    ProductionServer({
+        "bind": f"0.0.0.0:{port}",
+        "workers": int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        "worker_class": ProductionUvicornWorker,
+        "preload_app": True,
+        "backlog": int(os.getenv("BACKLOG", 2048)),
+        "keepalive": int(os.getenv("KEEPALIVE_TIMEOUT", 15)),
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }).run()
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True
-    )
+    if "--dev" in sys.argv[1:]:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True
+        )
+    else:
+        run_production(port)
@@ -0,0 +1,72 @@
+"""
+Shared fixtures: every test runs against a fresh SQLite database created
+from the models, through the real ASGI app.
+
+Run from ``backend/``:  python -m pytest -q
+"""
+import os
+import tempfile
+
+# Must be set before the app (and its engines) are imported
+_db_dir = tempfile.mkdtemp(prefix="projectmanager-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (register every table on Base.metadata)
+from app.core.auth_cache import auth_cache
+from app.core.database import Base, async_engine, engine
+from app.main import app as fastapi_app
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    auth_cache.clear()
+    with TestClient(fastapi_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login(client):
+    """Log in (creating the user on first use) and return auth headers."""
+    def _login(email: str, secret_code: str = None) -> dict:
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": "password123", "secret_code": secret_code},
+        )
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
+
+
+class QueryCounter:
+    """Counts statements the API sends to the database."""
+
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.parameters.clear()
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
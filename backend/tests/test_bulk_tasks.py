@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+
+from app.core.database import engine
+from app.core.stats_counters import check
+
+
+@pytest.fixture
+def setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+    return admin, member, member_id, project["id"]
+
+
+def _creates(project_id, assignee, count):
+    return [
+        {"op": "create", "create": {"title": f"Task {i}", "project_id": project_id, "assigned_to": assignee}}
+        for i in range(count)
+    ]
+
+
+def test_bulk_create_uses_a_fixed_number_of_queries(client, setup, query_counter):
+    admin, _, member_id, project_id = setup
+
+    def run(count):
+        query_counter.reset()
+        response = client.post(
+            "/api/v1/tasks/bulk", json={"operations": _creates(project_id, member_id, count)}, headers=admin
+        )
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["succeeded"] == count and body["failed"] == 0
+        assert all(result["status"] == 201 and result["task"]["id"] for result in body["results"])
+        return query_counter.count
+
+    assert run(5) == run(200)
+    stats = client.get("/api/v1/stats/overview", headers=admin).json()
+    assert stats["tasks"]["total"] == 205
+
+
+def test_mixed_batch_reports_each_operation(client, setup):
+    admin, member, member_id, project_id = setup
+    created = client.post(
+        "/api/v1/tasks/bulk", json={"operations": _creates(project_id, member_id, 3)}, headers=admin
+    ).json()
+    first, second, third = [result["id"] for result in created["results"]]
+    client.post("/api/v1/comments/", json={"task_id": third, "message": "keep me"}, headers=admin)
+
+    response = client.post("/api/v1/tasks/bulk", json={"operations": [
+        {"op": "update", "id": first, "update": {"status": "done"}},
+        {"op": "update", "id": second, "update": {"status": "bogus"}},
+        {"op": "delete", "id": second},
+        {"op": "delete", "id": third},
+        {"op": "create", "create": {"title": "x", "project_id": str(uuid.uuid4()), "assigned_to": member_id}},
+        {"op": "update", "id": second, "update": {"title": "gone"}},
+    ]}, headers=admin)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 400, 204, 409, 404, 404]
+    assert results[0]["task"]["status"] == "done"
+
+    remaining = {task["id"]: task["status"] for task in client.get("/api/v1/tasks/", headers=admin).json()}
+    assert remaining == {first: "done", third: "todo"}
+
+    # Members may only change the status of their own tasks and never delete
+    response = client.post("/api/v1/tasks/bulk", json={"operations": [
+        {"op": "update", "id": first, "update": {"status": "in_progress"}},
+        {"op": "update", "id": first, "update": {"title": "renamed"}},
+        {"op": "delete", "id": third},
+        {"op": "create", "create": {"title": "x", "project_id": project_id, "assigned_to": member_id}},
+    ]}, headers=member)
+    assert [result["status"] for result in response.json()["results"]] == [200, 403, 403, 403]
+
+    with engine.connect() as connection:
+        assert check(connection) == {}
+
+
+def test_atomic_batch_applies_nothing_on_failure(client, setup):
+    admin, _, member_id, project_id = setup
+    operations = _creates(project_id, member_id, 3) + [
+        {"op": "create", "create": {"title": "x", "project_id": project_id, "assigned_to": str(uuid.uuid4())}}
+    ]
+    response = client.post("/api/v1/tasks/bulk", json={"operations": operations, "atomic": True}, headers=admin)
+    body = response.json()
+    assert body["succeeded"] == 0
+    assert [result["status"] for result in body["results"]] == [424, 424, 424, 404]
+    assert client.get("/api/v1/tasks/", headers=admin).json() == []
+    assert client.get("/api/v1/stats/overview", headers=admin).json()["tasks"]["total"] == 0
+
+
+def test_operation_limit_is_enforced(client, setup):
+    admin, _, member_id, project_id = setup
+    from app.core.config import settings
+    operations = _creates(project_id, member_id, settings.TASK_BULK_MAX_OPERATIONS + 1)
+    response = client.post("/api/v1/tasks/bulk", json={"operations": operations}, headers=admin)
+    assert response.status_code == 422
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+@pytest.fixture
+def task(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+    task = client.post(
+        "/api/v1/tasks/",
+        json={"title": "Task", "project_id": project["id"], "assigned_to": member_id},
+        headers=admin,
+    ).json()
+    return task["id"], admin, member
+
+
+def _comment(client, task_id, headers, message):
+    response = client.post("/api/v1/comments/", json={"task_id": task_id, "message": message}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _list_queries(client, task_id, headers, query_counter) -> int:
+    assert client.get(f"/api/v1/comments/{task_id}", headers=headers).status_code == 200
+    query_counter.reset()
+    response = client.get(f"/api/v1/comments/{task_id}", headers=headers)
+    assert response.status_code == 200
+    return query_counter.count
+
+
+def test_listing_does_not_query_per_author(client, login, task, query_counter):
+    task_id, admin, member = task
+    _comment(client, task_id, admin, "first")
+    few = _list_queries(client, task_id, admin, query_counter)
+
+    authors = [admin, member] + [login(f"user{i}@example.com") for i in range(8)]
+    for i in range(30):
+        _comment(client, task_id, authors[i % len(authors)], f"comment {i}")
+    many = _list_queries(client, task_id, admin, query_counter)
+
+    # change_versions lookup + task existence check + comments joined with authors
+    assert few == many == 3
+
+    comments = client.get(f"/api/v1/comments/{task_id}", headers=admin).json()
+    assert len(comments) == 31
+    assert all(comment["author_name"] != "Unknown" for comment in comments)
+
+
+def test_since_accepts_timezone_aware_timestamps(client, task):
+    task_id, admin, _ = task
+    first = _comment(client, task_id, admin, "first")
+    _comment(client, task_id, admin, "second")
+
+    naive = datetime.fromisoformat(first["created_at"])
+    # Same instant expressed in UTC+02:00
+    aware = (naive + timedelta(hours=2)).replace(tzinfo=timezone(timedelta(hours=2)))
+
+    for since in (naive.isoformat(), aware.isoformat()):
+        response = client.get(f"/api/v1/comments/{task_id}", headers=admin, params={"since": since})
+        assert response.status_code == 200, response.text
+        assert [c["message"] for c in response.json()] == ["second"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.core.database import engine
+from app.models.change_version import ChangeVersion
+
+
+def _setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+    task = client.post(
+        "/api/v1/tasks/",
+        json={"title": "Task", "project_id": project["id"], "assigned_to": member_id},
+        headers=admin,
+    ).json()
+    return admin, member, team, project, task
+
+
+def test_unchanged_list_is_answered_with_304_without_row_queries(client, login, query_counter):
+    admin, member, *_ = _setup(client, login)
+    first = client.get("/api/v1/tasks/", headers=member)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    query_counter.reset()
+    second = client.get("/api/v1/tasks/", headers={**member, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert not any("FROM tasks" in statement for statement in query_counter.statements)
+    assert query_counter.count == 1  # the change_versions lookup
+
+
+def test_etag_changes_with_writes_user_and_url(client, login):
+    admin, member, team, project, task = _setup(client, login)
+
+    def etag(url, headers):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.headers["ETag"]
+
+    tasks_etag = etag("/api/v1/tasks/", member)
+    teams_etag = etag("/api/v1/teams/", member)
+    assert etag("/api/v1/tasks/", admin) != tasks_etag
+    assert etag("/api/v1/tasks/?status_filter=done", member) != tasks_etag
+
+    client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"}, headers=member)
+    assert etag("/api/v1/tasks/", member) != tasks_etag
+    # Other scopes are unaffected
+    assert etag("/api/v1/teams/", member) == teams_etag
+
+    comments_etag = etag(f"/api/v1/comments/{task['id']}", member)
+    client.post("/api/v1/comments/", json={"task_id": task["id"], "message": "hi"}, headers=member)
+    assert etag(f"/api/v1/comments/{task['id']}", member) != comments_etag
+
+
+def test_conditional_detail_and_stats_endpoints(client, login):
+    admin, member, team, project, task = _setup(client, login)
+    for url in (f"/api/v1/projects/{project['id']}", f"/api/v1/teams/{team['id']}",
+                "/api/v1/projects/", "/api/v1/stats/overview"):
+        etag = client.get(url, headers=admin).headers["ETag"]
+        response = client.get(url, headers={**admin, "If-None-Match": f'"other", {etag}'})
+        assert response.status_code == 304, url
+
+    stats_etag = client.get("/api/v1/stats/overview", headers=admin).headers["ETag"]
+    client.put(f"/api/v1/teams/{team['id']}", json={"name": "Renamed"}, headers=admin)
+    assert client.get(
+        "/api/v1/stats/overview", headers={**admin, "If-None-Match": stats_etag}
+    ).status_code == 200
+
+
+def test_last_modified_and_if_modified_since(client, login):
+    admin, *_ = _setup(client, login)
+
+    def set_updated_at(value):
+        with engine.begin() as connection:
+            connection.execute(update(ChangeVersion).values(updated_at=value))
+
+    # A change in the current second (or later) is not advertised: another
+    # write within the same second would carry the same date
+    set_updated_at(datetime.utcnow() + timedelta(minutes=1))
+    assert "Last-Modified" not in client.get("/api/v1/teams/", headers=admin).headers
+
+    set_updated_at(datetime.utcnow() - timedelta(minutes=1))
+    last_modified = client.get("/api/v1/teams/", headers=admin).headers["Last-Modified"]
+    assert client.get(
+        "/api/v1/teams/", headers={**admin, "If-Modified-Since": last_modified}
+    ).status_code == 304
+
+    client.post("/api/v1/teams/", json={"name": "Another"}, headers=admin)
+    assert client.get(
+        "/api/v1/teams/", headers={**admin, "If-Modified-Since": last_modified}
+    ).status_code == 200
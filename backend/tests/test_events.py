@@ -0,0 +1,132 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1.events import _server_sent_events
+from app.core.config import settings
+from app.core.events import RESYNC, ChangeBroker, Envelope, NOTIFY_PAYLOAD_LIMIT, _notify_payloads, broker
+from app.models.user import User, UserRole
+
+
+def _setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    other = login("other@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    other_id = client.get("/api/v1/auth/me", headers=other).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+
+    def create_task(title, assignee):
+        response = client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "project_id": project["id"], "assigned_to": assignee},
+            headers=admin,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return admin, member, other, project, create_task, member_id, other_id
+
+
+def _token(headers):
+    return headers["Authorization"].split()[1]
+
+
+def test_websocket_receives_only_visible_changes(client, login):
+    admin, member, other, project, create_task, member_id, other_id = _setup(client, login)
+
+    with client.websocket_connect("/api/v1/events/ws", headers=member) as member_ws, \
+            client.websocket_connect(f"/api/v1/events/ws?access_token={_token(other)}") as other_ws:
+        mine = create_task("Mine", member_id)
+        theirs = create_task("Theirs", other_id)
+
+        event = json.loads(member_ws.receive_text())
+        assert (event["entity"], event["action"], event["id"]) == ("task", "created", mine["id"])
+        assert event["data"]["title"] == "Mine"
+        assert event["data"]["status"] == "todo"
+        # The other user's first event is their own task, not the member's
+        assert json.loads(other_ws.receive_text())["id"] == theirs["id"]
+
+        client.put(f"/api/v1/tasks/{mine['id']}", json={"status": "done"}, headers=member)
+        event = json.loads(member_ws.receive_text())
+        assert (event["action"], event["data"]["status"]) == ("updated", "done")
+
+        client.post("/api/v1/comments/", json={"task_id": mine["id"], "message": "Shipped"}, headers=admin)
+        event = json.loads(member_ws.receive_text())
+        assert (event["entity"], event["data"]["message"]) == ("comment", "Shipped")
+
+        # Members can list every project, so they hear about project changes
+        client.put(f"/api/v1/projects/{project['id']}", json={"status": "completed"}, headers=admin)
+        assert json.loads(member_ws.receive_text())["entity"] == "project"
+        assert json.loads(other_ws.receive_text())["entity"] == "project"
+
+
+def test_rolled_back_writes_produce_no_events(client, login):
+    admin, member, other, project, create_task, member_id, _ = _setup(client, login)
+
+    with client.websocket_connect("/api/v1/events/ws", headers=member) as ws:
+        response = client.post("/api/v1/tasks/bulk", json={"atomic": True, "operations": [
+            {"op": "create", "create": {"title": "Rolled back", "project_id": project["id"], "assigned_to": member_id}},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        ]}, headers=admin)
+        assert [result["status"] for result in response.json()["results"]] == [424, 404]
+        kept = create_task("Kept", member_id)
+        assert json.loads(ws.receive_text())["id"] == kept["id"]
+
+
+def test_websocket_rejects_invalid_tokens(client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/api/v1/events/ws?access_token=garbage") as ws:
+            ws.receive_text()
+    assert exc.value.code == 1008
+
+
+def test_slow_consumers_are_evicted_with_a_resync_message():
+    async def scenario():
+        feed = ChangeBroker(queue_size=2)
+        slow = feed.subscribe(User(id=uuid.uuid4(), role=UserRole.admin))
+        fast = feed.subscribe(User(id=uuid.uuid4(), role=UserRole.admin))
+        for i in range(3):
+            feed.publish([Envelope(f"event {i}", set(), {"admin"})])
+            assert await fast.get() == f"event {i}"
+        assert slow.evicted and not fast.evicted
+        assert [slow.queue.get_nowait()] == [RESYNC] and slow.queue.empty()
+        assert feed.connections == 1 and feed.evictions == 1
+        # Later events no longer reach the evicted consumer
+        feed.publish([Envelope("event 3", set(), {"admin"})])
+        assert slow.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_server_sent_events_stream(monkeypatch):
+    monkeypatch.setattr(settings, "CHANGE_FEED_HEARTBEAT_SECONDS", 0.01)
+    user = User(id=uuid.uuid4(), role=UserRole.member)
+
+    async def scenario():
+        stream = _server_sent_events(user)
+        assert await stream.__anext__() == ": connected\n\n"
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        broker.publish([Envelope('{"type":"change"}', {str(user.id)}, set())])
+        assert await stream.__anext__() == 'data: {"type":"change"}\n\n'
+        await stream.aclose()
+        assert broker.connections == 0
+
+    asyncio.run(scenario())
+
+
+def test_notify_payloads_respect_the_size_limit():
+    small = [Envelope(json.dumps({"id": i, "data": {"title": "x" * 100}}), {"u"}, {"admin"}) for i in range(200)]
+    huge = Envelope(json.dumps({"id": "big", "data": {"title": "x" * 10000}}), {"u"}, {"admin"})
+    payloads = _notify_payloads(small + [huge])
+    assert all(len(payload.encode()) <= NOTIFY_PAYLOAD_LIMIT for payload in payloads)
+    items = [item for payload in payloads for item in json.loads(payload)]
+    assert len(items) == 201
+    # The oversized event is relayed without its row
+    assert json.loads(items[-1]["message"]) == {"id": "big", "data": None}
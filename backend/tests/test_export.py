@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several chunks per export
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_ROWS", 2)
+
+
+def _setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    ids = {
+        name: client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        for name, headers in (("member", member), ("other", login("other@example.com")))
+    }
+    teams = [client.post("/api/v1/teams/", json={"name": f"Team {i}"}, headers=admin).json() for i in range(2)]
+    projects = [
+        client.post("/api/v1/projects/", json={"name": f"Project {i}", "team_id": team["id"]}, headers=admin).json()
+        for i, team in enumerate(teams)
+    ]
+    tasks = []
+    for i in range(6):
+        tasks.append(client.post("/api/v1/tasks/", json={
+            "title": f"Task {i}",
+            "project_id": projects[i % 2]["id"],
+            "assigned_to": ids["member" if i < 4 else "other"],
+        }, headers=admin).json())
+    return admin, member, teams, projects, tasks
+
+
+def _ndjson(client, headers, entity, **params):
+    response = client.get(f"/api/v1/export/{entity}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _by_id(rows):
+    return sorted(rows, key=lambda row: row["id"])
+
+
+def test_ndjson_export_matches_the_list_endpoints(client, login):
+    admin, member, teams, projects, tasks = _setup(client, login)
+    assert _by_id(_ndjson(client, admin, "tasks")) == _by_id(tasks)
+    assert _by_id(_ndjson(client, member, "tasks")) == _by_id(tasks[:4])
+    assert _by_id(_ndjson(client, member, "projects")) == _by_id(client.get("/api/v1/projects/", headers=member).json())
+
+    client.post("/api/v1/comments/", json={"task_id": tasks[0]["id"], "message": "Mine"}, headers=member)
+    client.post("/api/v1/comments/", json={"task_id": tasks[5]["id"], "message": "Theirs"}, headers=admin)
+    comments = _ndjson(client, member, "comments")
+    assert [(comment["message"], comment["author_name"]) for comment in comments] == [("Mine", "member")]
+    assert len(_ndjson(client, admin, "comments")) == 2
+
+
+def test_filters(client, login):
+    admin, member, teams, projects, tasks = _setup(client, login)
+    in_project = _ndjson(client, admin, "tasks", project_id=projects[0]["id"])
+    assert sorted(task["title"] for task in in_project) == ["Task 0", "Task 2", "Task 4"]
+    in_team = _ndjson(client, member, "tasks", team_id=teams[1]["id"])
+    assert sorted(task["title"] for task in in_team) == ["Task 1", "Task 3"]
+    assert _ndjson(client, admin, "projects", team_id=teams[1]["id"]) == [projects[1]]
+
+    now = datetime.utcnow()
+    assert len(_ndjson(client, admin, "tasks", created_from=(now - timedelta(hours=1)).isoformat())) == 6
+    assert _ndjson(client, admin, "tasks", created_to=(now - timedelta(hours=1)).isoformat()) == []
+
+
+def test_csv_export(client, login):
+    admin, member, teams, projects, tasks = _setup(client, login)
+    response = client.get("/api/v1/export/tasks", params={"format": "csv"}, headers=member)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert _by_id([
+        {**row, "description": row["description"] or None, "due_date": row["due_date"] or None} for row in rows
+    ]) == _by_id(tasks[:4])
+
+    empty = client.get("/api/v1/export/comments", params={"format": "csv"}, headers=member)
+    assert empty.text.strip() == "id,task_id,author_id,message,created_at,author_name"
+
+
+def test_unknown_entity_and_format(client, login):
+    admin = login("admin@example.com")
+    assert client.get("/api/v1/export/users", headers=admin).status_code == 422
+    assert client.get("/api/v1/export/tasks", params={"format": "xml"}, headers=admin).status_code == 422
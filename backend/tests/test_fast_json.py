@@ -0,0 +1,67 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.api.fast_json import dump_rows, out_columns
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+
+
+def test_rows_encode_like_the_pydantic_models():
+    task_rows = [
+        (uuid.uuid4(), "Naïve", None, uuid.uuid4(), uuid.uuid4(), TaskStatus.IN_PROGRESS,
+         None, datetime(2026, 1, 2, 3, 4, 5, 678)),
+        (uuid.uuid4(), "Whole second", "d", uuid.uuid4(), uuid.uuid4(), TaskStatus.DONE,
+         datetime(2026, 5, 1), datetime(2026, 1, 2, 3, 4, 5)),
+    ]
+    project_rows = [
+        ("P", None, uuid.uuid4(), ProjectStatus.completed, date(2026, 1, 1), None,
+         uuid.uuid4(), uuid.uuid4(), datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)),
+    ]
+    for schema, rows in ((TaskOut, task_rows), (ProjectOut, project_rows)):
+        keys = list(schema.model_fields)
+        expected = TypeAdapter(List[schema]).dump_json(
+            [schema.model_validate({**dict(zip(keys, row)), "status": row[keys.index("status")].value})
+             for row in rows]
+        )
+        # Same keys in the same order, and the same values
+        assert dump_rows(schema, rows) == expected
+        assert json.loads(dump_rows(schema, rows)) == json.loads(expected)
+
+
+def test_out_columns_follow_the_schema():
+    assert [column.key for column in out_columns(TaskOut, Task)] == list(TaskOut.model_fields)
+    assert [column.key for column in out_columns(ProjectOut, Project)] == list(ProjectOut.model_fields)
+
+
+def test_list_endpoints_keep_their_shape_and_headers(client, login):
+    admin = login("admin@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=login("member@example.com")).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+    created = [
+        client.post(
+            "/api/v1/tasks/",
+            json={"title": f"Task {i}", "project_id": project["id"], "assigned_to": member_id},
+            headers=admin,
+        ).json()
+        for i in range(3)
+    ]
+
+    page = client.get("/api/v1/tasks/", params={"limit": 2}, headers=admin)
+    assert page.headers["content-type"] == "application/json"
+    assert "X-Next-Cursor" in page.headers and page.headers["ETag"]
+    assert list(page.json()[0]) == list(TaskOut.model_fields)
+    everything = client.get("/api/v1/tasks/", headers=admin).json()
+    assert sorted(everything, key=lambda task: task["id"]) == sorted(created, key=lambda task: task["id"])
+
+    assert client.get("/api/v1/projects/", headers=admin).json() == [project]
+    teams = client.get("/api/v1/teams/", headers=admin)
+    assert teams.json() == [team] and teams.headers["ETag"]
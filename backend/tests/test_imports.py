@@ -0,0 +1,135 @@
+import io
+import json
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.importer import ImportEntity, ImportFormat, import_records, read_records
+from app.core.stats_counters import check
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several chunks per import
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_ROWS", 2)
+
+
+@pytest.fixture
+def setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_me = client.get("/api/v1/auth/me", headers=member).json()
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    return admin, member, member_me, team
+
+
+def _import(client, headers, entity, body, content_type="application/x-ndjson", **params):
+    response = client.post(
+        f"/api/v1/import/{entity}", content=body, params=params,
+        headers={**headers, "Content-Type": content_type},
+    )
+    assert response.status_code == 200, response.text
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _jsonl(rows):
+    return "\n".join(json.dumps(row) for row in rows) + "\n"
+
+
+def test_import_resolves_references_and_keeps_counters(client, setup):
+    admin, member, member_me, team = setup
+    projects = (
+        "name,team,manager,status\n"
+        f"Alpha,Team,admin@example.com,active\n"
+        f"Beta,{team['id']},admin@example.com,completed\n"
+    )
+    progress = _import(client, admin, "projects", projects, content_type="text/csv")
+    assert progress[-1] == {"processed": 2, "imported": 2, "failed": 0, "errors": [], "done": True}
+
+    task_ids = [str(uuid.uuid4()) for _ in range(5)]
+    tasks = [
+        {"id": task_ids[i], "title": f"Task {i}", "project": "Alpha" if i < 3 else "Beta",
+         "assigned_to": member_me["username"] if i % 2 else "member@example.com", "status": "done" if i else "todo"}
+        for i in range(5)
+    ]
+    progress = _import(client, admin, "tasks", _jsonl(tasks))
+    assert [line["done"] for line in progress] == [False, False, True]
+    assert progress[-1]["imported"] == 5
+
+    comments = [{"task_id": task_ids[0], "author": "admin@example.com", "message": "Imported"}]
+    assert _import(client, admin, "comments", _jsonl(comments))[-1]["imported"] == 1
+
+    listed = client.get("/api/v1/tasks/", headers=member).json()
+    assert sorted(task["id"] for task in listed) == sorted(task_ids)
+    assert client.get(f"/api/v1/comments/{task_ids[0]}", headers=member).json()[0]["message"] == "Imported"
+    assert client.get("/api/v1/search/", params={"q": "Task"}, headers=member).status_code == 200
+
+    stats = client.get("/api/v1/stats/overview", headers=admin).json()
+    assert stats["tasks"]["total"] == 5
+    with engine.connect() as connection:
+        assert check(connection) == {}
+
+
+def test_bad_rows_are_reported_and_skipped(client, setup):
+    admin, _, member_me, team = setup
+    _import(client, admin, "projects", _jsonl([
+        {"name": "Alpha", "team": "Team", "manager": "admin@example.com"},
+        {"name": "Alpha", "team": "Team", "manager": "admin@example.com"},
+        {"name": "Gamma", "team": "Team", "manager": "admin@example.com"},
+    ]))
+    existing = str(uuid.uuid4())
+    _import(client, admin, "tasks", _jsonl([
+        {"id": existing, "title": "Kept", "project": "Gamma", "assigned_to": "member@example.com"},
+    ]))
+
+    body = "\n".join([
+        json.dumps({"title": "ok", "project": "Gamma", "assigned_to": "member@example.com"}),
+        "{not json",
+        json.dumps({"title": "", "project": "Gamma", "assigned_to": "member@example.com"}),
+        json.dumps({"title": "x", "project": "Alpha", "assigned_to": "member@example.com"}),
+        json.dumps({"title": "x", "project": "Gamma", "assigned_to": "nobody@example.com"}),
+        json.dumps({"id": existing, "title": "x", "project": "Gamma", "assigned_to": "member@example.com"}),
+        json.dumps({"title": "ok", "project": "Gamma", "assigned_to": member_me["id"], "status": "bogus"}),
+        json.dumps({"title": "ok too", "project": "Gamma", "assigned_to": member_me["id"]}),
+    ]) + "\n"
+    progress = _import(client, admin, "tasks", body)
+    errors = {error["line"]: error["error"] for line in progress for error in line["errors"]}
+    assert sorted(errors) == [2, 3, 4, 5, 6, 7]
+    assert "Invalid JSON" in errors[2]
+    assert "Ambiguous project" in errors[4]
+    assert "Unknown user" in errors[5]
+    assert "already exists" in errors[6]
+    assert {key: progress[-1][key] for key in ("processed", "imported", "failed", "done")} == {
+        "processed": 8, "imported": 2, "failed": 6, "done": True,
+    }
+
+    titles = sorted(task["title"] for task in client.get("/api/v1/tasks/", headers=admin).json())
+    assert titles == ["Kept", "ok", "ok too"]
+    with engine.connect() as connection:
+        assert check(connection) == {}
+
+
+def test_import_changes_etag(client, setup):
+    admin, _, _, _ = setup
+    first = client.get("/api/v1/projects/", headers=admin)
+    _import(client, admin, "projects", _jsonl([{"name": "Alpha", "team": "Team", "manager": "admin@example.com"}]))
+    second = client.get("/api/v1/projects/", headers={**admin, "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert [project["name"] for project in second.json()] == ["Alpha"]
+
+
+def test_import_is_admin_only(client, setup):
+    _, member, _, _ = setup
+    response = client.post("/api/v1/import/projects", content="", headers=member)
+    assert response.status_code == 403
+
+
+def test_read_records_csv_line_numbers(client):
+    body = io.StringIO('task_id,author,message\n1,a,"two\nlines"\n2,b,\n')
+    records = list(read_records(body, ImportFormat.csv))
+    # A record is numbered by the line it starts on
+    assert records == [(2, {"task_id": "1", "author": "a", "message": "two\nlines"}), (4, {"task_id": "2", "author": "b"})]
+    progress = list(import_records(engine, ImportEntity.comments, [(1, {"task_id": "x"})]))
+    assert progress[-1].failed == 1
@@ -0,0 +1,18 @@
+def test_auth_cache_lookups_are_counters(client, login):
+    headers = login("member@example.com")
+    for _ in range(3):
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    def sample(name: str, labels: str) -> float:
+        body = client.get("/metrics").text
+        line = next(line for line in body.splitlines() if line.startswith(f"{name}{{{labels}}}"))
+        return float(line.rsplit(" ", 1)[1])
+
+    body = client.get("/metrics").text
+    assert "# TYPE auth_cache_lookups_total counter" in body
+    assert "# TYPE password_hash_rejected_total counter" in body
+
+    before = sample("auth_cache_lookups_total", 'cache="token",result="hit"')
+    client.get("/api/v1/auth/me", headers=headers)
+    after = sample("auth_cache_lookups_total", 'cache="token",result="hit"')
+    assert after == before + 1
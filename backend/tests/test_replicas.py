@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+import pytest
+from sqlalchemy import text
+
+import app.api.dependencies
+import app.core.replicas
+from app.core.config import settings
+from app.core.replicas import ReplicaPool
+
+
+def _snapshot_primary() -> str:
+    """Copy the primary SQLite file into a stand-in replica."""
+    path = os.path.join(tempfile.mkdtemp(), "replica.db")
+    source = sqlite3.connect(settings.DATABASE_URL.replace("sqlite:///", ""))
+    target = sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.close()
+    return f"sqlite:///{path}"
+
+
+def _use_pool(monkeypatch, pool: ReplicaPool) -> None:
+    monkeypatch.setattr(app.api.dependencies, "read_replicas", pool)
+    monkeypatch.setattr(app.core.replicas, "read_replicas", pool)
+
+
+async def _database_of(pool: ReplicaPool, user_id=None) -> str:
+    async with pool.session(user_id) as db:
+        return (await db.execute(text("PRAGMA database_list"))).all()[0][2]
+
+
+def test_round_robin_and_failover(client):
+    first, second = _snapshot_primary(), _snapshot_primary()
+    dead = "sqlite:////nonexistent-directory/replica.db"
+    pool = ReplicaPool([first, dead, second], retry_seconds=60, read_your_writes_seconds=5)
+
+    served = [asyncio.run(_database_of(pool)) for _ in range(4)]
+    paths = [url.replace("sqlite:///", "") for url in (first, second)]
+    assert set(served) == set(paths)
+    assert pool.replicas[1].down_until > time.monotonic()
+
+    # Every replica down: reads fall back to the primary
+    for replica in pool.replicas:
+        pool.mark_down(replica)
+    assert asyncio.run(_database_of(pool)) == settings.DATABASE_URL.replace("sqlite:///", "")
+
+
+def test_reads_go_to_replica_except_right_after_a_write(client, login, monkeypatch):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+
+    # The stand-in replica is a snapshot, so it lags everything written after this
+    pool = ReplicaPool([_snapshot_primary()], retry_seconds=60, read_your_writes_seconds=0.5)
+    _use_pool(monkeypatch, pool)
+
+    response = client.post(
+        "/api/v1/tasks/",
+        json={"title": "fresh", "project_id": project["id"], "assigned_to": member_id},
+        headers=admin,
+    )
+    assert response.status_code == 201
+
+    # The writer reads its own write from the primary ...
+    assert [t["title"] for t in client.get("/api/v1/tasks/", headers=admin).json()] == ["fresh"]
+    # ... everyone else reads the (lagging) replica
+    assert client.get("/api/v1/tasks/", headers=member).json() == []
+
+    time.sleep(0.6)
+    assert client.get("/api/v1/tasks/", headers=admin).json() == []
@@ -0,0 +1,96 @@
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.search import postgres_search_queries
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+def _setup(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    other = login("other@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    other_id = client.get("/api/v1/auth/me", headers=other).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+
+    def task(title, description, assignee):
+        return client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "description": description, "project_id": project["id"], "assigned_to": assignee},
+            headers=admin,
+        ).json()
+
+    return admin, member, task, member_id, other_id
+
+
+def test_search_ranks_and_respects_visibility(client, login):
+    admin, member, task, member_id, other_id = _setup(client, login)
+    in_title = task("Deploy billing service", "roll out", member_id)
+    in_description = task("Weekly chores", "check the billing dashboards", member_id)
+    hidden = task("Billing migration", None, other_id)
+    task("Unrelated", "nothing here", member_id)
+    client.post("/api/v1/comments/", json={"task_id": in_description["id"], "message": "Billing numbers look off"}, headers=admin)
+    client.post("/api/v1/comments/", json={"task_id": hidden["id"], "message": "billing is blocked"}, headers=admin)
+
+    results = client.get("/api/v1/search/", params={"q": "billing"}, headers=member).json()
+    # Title matches outrank description matches; other users' tasks are hidden
+    assert [hit["id"] for hit in results["tasks"]] == [in_title["id"], in_description["id"]]
+    assert [hit["message"] for hit in results["comments"]] == ["Billing numbers look off"]
+    assert results["comments"][0]["author_name"]
+
+    admin_results = client.get("/api/v1/search/", params={"q": "billing"}, headers=admin).json()
+    assert {hit["id"] for hit in admin_results["tasks"]} == {in_title["id"], in_description["id"], hidden["id"]}
+    assert len(admin_results["comments"]) == 2
+
+
+def test_index_follows_updates_deletes_and_prefixes(client, login):
+    admin, member, task, member_id, _ = _setup(client, login)
+    created = task("Draft quarterly report", None, member_id)
+    doomed = task("Quarterly cleanup", None, member_id)
+
+    def titles(q):
+        return [hit["title"] for hit in client.get("/api/v1/search/", params={"q": q}, headers=admin).json()["tasks"]]
+
+    assert sorted(titles("quarter")) == ["Draft quarterly report", "Quarterly cleanup"]
+    assert titles("reports") == ["Draft quarterly report"]  # stemmed
+
+    client.put(f"/api/v1/tasks/{created['id']}", json={"title": "Final annual summary"}, headers=admin)
+    client.delete(f"/api/v1/tasks/{doomed['id']}", headers=admin)
+    assert titles("quarterly") == []
+    assert titles("annual summ") == ["Final annual summary"]
+
+
+def test_only_newest_candidates_are_ranked(client, login, monkeypatch):
+    admin, member, task, member_id, other_id = _setup(client, login)
+    best = task("Billing", None, member_id)
+    newest_visible = task("Chores", "billing follow-up", member_id)
+    task("Billing for someone else", None, other_id)
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 1)
+
+    results = client.get("/api/v1/search/", params={"q": "billing"}, headers=member).json()
+    # The better title match is older than the cap reaches, and the other
+    # user's even newer task does not use up the member's candidate slot
+    assert [hit["id"] for hit in results["tasks"]] == [newest_visible["id"]]
+
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 10)
+    results = client.get("/api/v1/search/", params={"q": "billing"}, headers=member).json()
+    assert [hit["id"] for hit in results["tasks"]] == [best["id"], newest_visible["id"]]
+
+
+def test_query_syntax_is_not_interpreted(client, login):
+    admin, *_ = _setup(client, login)
+    for q in ['"unbalanced', "NEAR(a b)", "title:x OR", "*", "-"]:
+        response = client.get("/api/v1/search/", params={"q": q}, headers=admin)
+        assert response.status_code == 200, (q, response.text)
+
+
+def test_postgres_queries_use_the_indexed_expressions():
+    user = User(id=None, role=UserRole.admin)
+    tasks, comments = postgres_search_queries(user, ["billing", "dash"], 20)
+    sql = str(tasks.compile(dialect=postgresql.dialect()))
+    assert "setweight(to_tsvector('english', coalesce(tasks.title, '')), 'A')" in sql
+    assert "@@ to_tsquery('english'" in sql
+    assert "to_tsvector('english', comments.message)" in str(comments.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,18 @@
+import importlib.util
+import os
+
+from app.core.search_index import POSTGRES_DDL
+
+MIGRATION = os.path.join(
+    os.path.dirname(__file__), "..", "alembic", "versions", "c8b2f41d9e57_add_full_text_search_indexes.py"
+)
+
+
+def test_migration_indexes_match_the_query_expressions(monkeypatch):
+    executed = []
+    spec = importlib.util.spec_from_file_location("search_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    monkeypatch.setattr(migration.op, "execute", executed.append, raising=False)
+    migration.upgrade()
+    assert executed == [ddl.replace(" IF NOT EXISTS", "") for ddl in POSTGRES_DDL]
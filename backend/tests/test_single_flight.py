@@ -0,0 +1,138 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from app.api.single_flight import _in_flight, single_flight
+from app.core.metrics import SINGLE_FLIGHT_REQUESTS
+from app.main import app as fastapi_app
+from app.models.user import User, UserRole
+
+USERS = {
+    name: User(id=uuid.uuid4(), role=role)
+    for name, role in (("alice", UserRole.member), ("bob", UserRole.member), ("admin", UserRole.admin))
+}
+
+
+class Out(BaseModel):
+    value: int
+
+
+ARRIVALS = []
+
+
+async def _current_user(user: str = Query(...)) -> User:
+    ARRIVALS.append(user)
+    return USERS[user]
+
+
+async def _etag(response: Response, user: User = Depends(_current_user)) -> None:
+    response.headers["ETag"] = f'"{user.id}"'
+
+
+def _collapsed(route: str) -> float:
+    return SINGLE_FLIGHT_REQUESTS.labels(route, "collapsed")._value.get()
+
+
+def _app():
+    app = FastAPI()
+    state = {"runs": 0, "release": asyncio.Event()}
+
+    @app.get("/count", response_model=Out, dependencies=[Depends(_etag)])
+    @single_flight(lambda user: "all" if user.role == UserRole.member else user.id)
+    async def count(n: int = 1, current_user: User = Depends(_current_user)):
+        state["runs"] += 1
+        await state["release"].wait()
+        if n < 0:
+            raise HTTPException(status_code=400, detail="negative")
+        # Extra fields are dropped by response_model, once
+        return {"value": n * state["runs"], "secret": "x"}
+
+    return app, state
+
+
+def _run(scenario):
+    async def main():
+        ARRIVALS.clear()
+        app, state = _app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async def get(user, **params):
+                return await client.get("/count", params={"user": user, **params})
+
+            async def release(expected):
+                # Let every request reach the handler (or start waiting on
+                # another's run) before the run finishes
+                while len(ARRIVALS) < expected:
+                    await asyncio.sleep(0)
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                state["release"].set()
+
+            return await scenario(get, release, state)
+
+    return asyncio.run(main())
+
+
+def test_concurrent_identical_requests_share_one_run():
+    async def scenario(get, release, state):
+        responses, _ = await asyncio.gather(asyncio.gather(*(get(u) for u in ("alice", "bob") * 5)), release(10))
+        return responses, state["runs"]
+
+    before = _collapsed("/count")
+    responses, runs = _run(scenario)
+    assert runs == 1
+    assert all(response.json() == {"value": 1} for response in responses)
+    # Headers from dependencies stay per request
+    assert {response.headers["ETag"] for response in responses} == {
+        f'"{USERS["alice"].id}"', f'"{USERS["bob"].id}"'
+    }
+    assert _collapsed("/count") - before == 9
+    assert not _in_flight
+
+
+def test_different_scopes_and_params_run_separately():
+    async def scenario(get, release, state):
+        responses, _ = await asyncio.gather(
+            asyncio.gather(get("alice"), get("admin"), get("alice", n=2), get("alice", n=2)), release(4)
+        )
+        return responses, state["runs"]
+
+    responses, runs = _run(scenario)
+    assert runs == 3
+    assert responses[2].json() == responses[3].json()
+
+
+def test_errors_reach_every_waiting_request():
+    async def scenario(get, release, state):
+        responses, _ = await asyncio.gather(asyncio.gather(*(get("alice", n=-1) for _ in range(3))), release(3))
+        return responses, state["runs"]
+
+    responses, runs = _run(scenario)
+    assert runs == 1
+    assert [response.status_code for response in responses] == [400] * 3
+    assert not _in_flight
+
+
+def test_handlers_need_a_current_user():
+    with pytest.raises(TypeError):
+        single_flight()(lambda: None)
+
+
+def test_single_flight_routes_keep_their_schema_and_headers(client, login):
+    member = login("member@example.com")
+    response = client.get("/api/v1/stats/overview", headers=member)
+    assert response.status_code == 200
+    assert set(response.json()) == {"projects", "tasks", "teams", "users"}
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["ETag"].startswith('W/"')
+    assert client.get(
+        "/api/v1/stats/overview", headers={**member, "If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+
+    assert client.get("/api/v1/projects/", params={"status_filter": "bad"}, headers=member).status_code == 400
+    parameters = fastapi_app.openapi()["paths"]["/api/v1/projects/"]["get"]["parameters"]
+    assert [parameter["name"] for parameter in parameters] == ["status_filter"]
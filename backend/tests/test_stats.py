@@ -0,0 +1,68 @@
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus
+
+
+def _seed(client, admin, assignee_id, projects: int, tasks_per_project: int):
+    team = client.post("/api/v1/teams/", json={"name": f"Team {projects}"}, headers=admin).json()
+    for p in range(projects):
+        project = client.post(
+            "/api/v1/projects/", json={"name": f"P{p}", "team_id": team["id"]}, headers=admin
+        ).json()
+        for t in range(tasks_per_project):
+            response = client.post(
+                "/api/v1/tasks/",
+                json={"title": f"T{p}.{t}", "project_id": project["id"], "assigned_to": assignee_id},
+                headers=admin,
+            )
+            assert response.status_code == 201, response.text
+
+
+def _overview_queries(client, headers, query_counter) -> int:
+    # Warm the auth cache so only the stats queries are counted
+    assert client.get("/api/v1/stats/overview", headers=headers).status_code == 200
+    query_counter.reset()
+    assert client.get("/api/v1/stats/overview", headers=headers).status_code == 200
+    return query_counter.count
+
+
+def test_overview_query_count_does_not_grow_with_data(client, login, query_counter):
+    admin = login("admin@example.com")
+    manager = login("manager@example.com", "manager")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+
+    _seed(client, admin, member_id, projects=1, tasks_per_project=1)
+    small = {name: _overview_queries(client, headers, query_counter)
+             for name, headers in (("admin", admin), ("manager", manager), ("member", member))}
+
+    _seed(client, admin, member_id, projects=5, tasks_per_project=8)
+    large = {name: _overview_queries(client, headers, query_counter)
+             for name, headers in (("admin", admin), ("manager", manager), ("member", member))}
+
+    assert small == large
+    # change_versions lookup + one counters query
+    assert all(count == 2 for count in large.values()), large
+
+
+def test_overview_counts_match_data(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    _seed(client, admin, member_id, projects=2, tasks_per_project=3)
+
+    tasks = client.get("/api/v1/tasks/", headers=admin).json()
+    response = client.put(
+        f"/api/v1/tasks/{tasks[0]['id']}", json={"status": TaskStatus.DONE.value}, headers=member
+    )
+    assert response.status_code == 200, response.text
+
+    stats = client.get("/api/v1/stats/overview", headers=admin).json()
+    assert stats["projects"]["total"] == 2
+    assert stats["projects"][ProjectStatus.active.value] == 2
+    assert stats["tasks"]["total"] == 6
+    assert stats["tasks"]["done"] == 1
+    assert stats["tasks"]["todo"] == 5
+
+    member_stats = client.get("/api/v1/stats/overview", headers=member).json()
+    assert member_stats["tasks"]["total"] == 6
+    assert member_stats["tasks"]["done"] == 1
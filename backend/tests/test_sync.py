@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.v1.sync import _decode, _encode
+from app.core.config import settings
+from app.core.database import engine
+from app.models.project import Project
+
+
+@pytest.fixture(autouse=True)
+def no_overlap(monkeypatch):
+    # Caught-up cursors stop at "now", so each sync sees exactly what
+    # changed since the previous one
+    monkeypatch.setattr(settings, "SYNC_OVERLAP_SECONDS", 0)
+
+
+def _set_manager(project_id, user_id):
+    # No endpoint changes a project's manager; the listeners cover any ORM write
+    with Session(engine) as session:
+        session.get(Project, UUID(project_id)).manager_id = UUID(user_id)
+        session.commit()
+
+
+def _setup(client, login):
+    admin = login("admin@example.com")
+    manager = login("manager@example.com", "manager")
+    member = login("member@example.com")
+    other = login("other@example.com")
+    ids = {
+        name: client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        for name, headers in (("manager", manager), ("member", member), ("other", other))
+    }
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+    _set_manager(project["id"], ids["manager"])
+
+    def create_task(title, assignee):
+        response = client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "project_id": project["id"], "assigned_to": ids[assignee]},
+            headers=admin,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return admin, manager, member, other, ids, team, project, create_task
+
+
+def _sync(client, headers, cursor=None, **params):
+    if cursor is not None:
+        params["since"] = cursor
+    response = client.get("/api/v1/sync/", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_full_then_incremental_sync_respects_visibility(client, login):
+    admin, manager, member, other, ids, team, project, create_task = _setup(client, login)
+    mine = create_task("Mine", "member")
+    create_task("Theirs", "other")
+
+    full = _sync(client, member)
+    assert _ids(full["tasks"]) == [mine["id"]]
+    assert _ids(full["projects"]) == [project["id"]]
+    assert _ids(full["teams"]) == [team["id"]]
+    assert full["deleted"] == [] and full["has_more"] is False
+
+    # Nothing changed: nothing is sent
+    quiet = _sync(client, member, full["cursor"])
+    assert quiet["tasks"] == quiet["projects"] == quiet["teams"] == quiet["comments"] == quiet["deleted"] == []
+
+    client.put(f"/api/v1/tasks/{mine['id']}", json={"status": "done"}, headers=member)
+    client.post("/api/v1/comments/", json={"task_id": mine["id"], "message": "Shipped"}, headers=member)
+    create_task("Theirs too", "other")
+    delta = _sync(client, member, quiet["cursor"])
+    assert [(task["id"], task["status"]) for task in delta["tasks"]] == [(mine["id"], "done")]
+    assert [(comment["message"], comment["author_name"]) for comment in delta["comments"]] == [("Shipped", "member")]
+    assert delta["projects"] == delta["teams"] == []
+
+    # The manager sees every task in their project
+    assert len(_sync(client, manager)["tasks"]) == 3
+
+
+def test_deletes_reach_only_users_who_could_see_the_row(client, login):
+    admin, manager, member, other, ids, team, project, create_task = _setup(client, login)
+    mine = create_task("Mine", "member")
+    theirs = create_task("Theirs", "other")
+    cursors = {name: _sync(client, headers)["cursor"] for name, headers in
+               (("member", member), ("other", other), ("manager", manager), ("admin", admin))}
+
+    assert client.delete(f"/api/v1/tasks/{mine['id']}", headers=admin).status_code == 204
+    deleted = {"entity": "task", "id": mine["id"]}
+    assert _sync(client, member, cursors["member"])["deleted"] == [deleted]
+    assert _sync(client, manager, cursors["manager"])["deleted"] == [deleted]
+    assert _sync(client, admin, cursors["admin"])["deleted"] == [deleted]
+    assert _sync(client, other, cursors["other"])["deleted"] == []
+
+    # Everyone lists teams, so everyone hears about a deleted one
+    spare = client.post("/api/v1/teams/", json={"name": "Spare"}, headers=admin).json()
+    cursor = _sync(client, other, cursors["other"])["cursor"]
+    assert client.delete(f"/api/v1/teams/{spare['id']}", headers=admin).status_code == 204
+    delta = _sync(client, other, cursor)
+    assert delta["deleted"] == [{"entity": "team", "id": spare["id"]}]
+    assert _ids(delta["tasks"]) == []
+    assert theirs["id"] not in [ref["id"] for ref in delta["deleted"]]
+
+
+def test_losing_visibility_is_a_tombstone_and_gaining_it_resends_rows(client, login):
+    admin, manager, member, other, ids, team, project, create_task = _setup(client, login)
+    task = create_task("Moving", "member")
+    client.post("/api/v1/comments/", json={"task_id": task["id"], "message": "Before"}, headers=member)
+    cursors = {name: _sync(client, headers)["cursor"] for name, headers in
+               (("member", member), ("other", other), ("admin", admin))}
+
+    client.put(f"/api/v1/tasks/{task['id']}", json={"assigned_to": ids["other"]}, headers=manager)
+
+    assert _sync(client, member, cursors["member"])["deleted"] == [{"entity": "task", "id": task["id"]}]
+    gained = _sync(client, other, cursors["other"])
+    assert _ids(gained["tasks"]) == [task["id"]] and gained["deleted"] == []
+    # The comment was written before the reassignment but is new to them
+    assert [comment["message"] for comment in gained["comments"]] == ["Before"]
+    admin_delta = _sync(client, admin, cursors["admin"])
+    assert _ids(admin_delta["tasks"]) == [task["id"]] and admin_delta["deleted"] == []
+
+
+def test_manager_change_tombstones_the_project_and_its_tasks(client, login):
+    admin, manager, member, other, ids, team, project, create_task = _setup(client, login)
+    task = create_task("Task", "member")
+    manager_cursor = _sync(client, manager)["cursor"]
+    member_cursor = _sync(client, member)["cursor"]
+    admin_id = client.get("/api/v1/auth/me", headers=admin).json()["id"]
+
+    _set_manager(project["id"], admin_id)
+
+    lost = _sync(client, manager, manager_cursor)
+    assert sorted((ref["entity"], ref["id"]) for ref in lost["deleted"]) == sorted(
+        [("project", project["id"]), ("task", task["id"])]
+    )
+    # The assignee keeps the task and members still list the project
+    kept = _sync(client, member, member_cursor)
+    assert kept["deleted"] == [] and _ids(kept["tasks"]) == [task["id"]]
+
+
+def test_paging_returns_every_row_once(client, login):
+    admin, manager, member, other, ids, team, project, create_task = _setup(client, login)
+    created = [create_task(f"Task {i}", "member")["id"] for i in range(5)]
+
+    seen, cursor, calls = [], None, 0
+    while True:
+        page = _sync(client, member, cursor, limit=2)
+        seen += _ids(page["tasks"])
+        cursor, calls = page["cursor"], calls + 1
+        if not page["has_more"]:
+            break
+    assert sorted(seen) == sorted(created) and calls == 3
+
+
+def test_invalid_and_expired_cursors(client, login):
+    admin = login("admin@example.com")
+    response = client.get("/api/v1/sync/", params={"since": "garbage"}, headers=admin)
+    assert response.status_code == 400
+
+    positions = _decode(_sync(client, admin)["cursor"])
+    expired = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    positions[-1] = (expired, positions[-1][1])
+    response = client.get("/api/v1/sync/", params={"since": _encode(positions)}, headers=admin)
+    assert response.status_code == 410
@@ -0,0 +1,90 @@
+import base64
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import engine
+
+
+@pytest.fixture
+def seeded(client, login):
+    admin = login("admin@example.com")
+    member = login("member@example.com")
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+    project = client.post(
+        "/api/v1/projects/", json={"name": "Project", "team_id": team["id"]}, headers=admin
+    ).json()
+
+    rng = random.Random(7)
+    base = datetime(2026, 1, 1)
+    for i in range(40):
+        due_date = rng.choice([None, (base + timedelta(days=rng.randint(0, 3))).isoformat()])
+        response = client.post(
+            "/api/v1/tasks/",
+            json={"title": f"Task {i}", "project_id": project["id"],
+                  "assigned_to": member_id, "due_date": due_date},
+            headers=admin,
+        )
+        assert response.status_code == 201, response.text
+    return admin
+
+
+def _pages(client, headers, limit):
+    cursor, ids = None, []
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/tasks/", headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        ids += [task["id"] for task in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 100])
+def test_pages_match_unpaged_list(client, seeded, limit):
+    full = [task["id"] for task in client.get("/api/v1/tasks/", headers=seeded).json()]
+    assert len(full) == 40
+    assert _pages(client, seeded, limit) == full
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    _cursor([None, {"dt": "2026-01-01T00:00:00"}]),
+    _cursor(["2026-01-01", {"dt": "2026-01-01T00:00:00"}, {"uuid": "8c1f6a52-6f0e-4a4e-9a38-0b6f5d2d8c11"}]),
+    _cursor([None, {"dt": "2026-01-01T00:00:00"}, "8c1f6a52-6f0e-4a4e-9a38-0b6f5d2d8c11"]),
+    _cursor([None, 5, {"uuid": "8c1f6a52-6f0e-4a4e-9a38-0b6f5d2d8c11"}]),
+])
+def test_malformed_cursor_is_rejected(client, seeded, cursor):
+    response = client.get("/api/v1/tasks/", headers=seeded, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_later_pages_seek_into_the_sort_index(client, seeded, query_counter):
+    first = client.get("/api/v1/tasks/", headers=seeded, params={"limit": 5})
+    cursor = first.headers["x-next-cursor"]
+
+    query_counter.reset()
+    response = client.get("/api/v1/tasks/", headers=seeded, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 200
+    statement, parameters = next(
+        (s, p) for s, p in zip(query_counter.statements, query_counter.parameters)
+        if "FROM tasks" in s
+    )
+
+    with engine.connect() as connection:
+        plan = " | ".join(
+            row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+    assert "SEARCH tasks USING INDEX ix_tasks_due_date_created_at_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
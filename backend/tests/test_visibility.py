@@ -0,0 +1,37 @@
+from uuid import UUID
+
+from app.core.database import SessionLocal
+from app.models.project import Project
+
+
+def test_manager_sees_managed_and_assigned_tasks(client, login):
+    admin = login("admin@example.com")
+    manager = login("manager@example.com", "manager")
+    member = login("member@example.com")
+    manager_id = client.get("/api/v1/auth/me", headers=manager).json()["id"]
+    member_id = client.get("/api/v1/auth/me", headers=member).json()["id"]
+    team = client.post("/api/v1/teams/", json={"name": "Team"}, headers=admin).json()
+
+    # Teams are admin-only, so hand the project to the manager directly
+    with SessionLocal() as db:
+        managed = Project(name="Managed", team_id=UUID(team["id"]), manager_id=UUID(manager_id))
+        db.add(managed)
+        db.commit()
+        managed_id = str(managed.id)
+    other = client.post("/api/v1/projects/", json={"name": "Other", "team_id": team["id"]}, headers=admin).json()
+
+    def create(title, project_id, assignee):
+        response = client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "project_id": project_id, "assigned_to": assignee},
+            headers=admin,
+        )
+        assert response.status_code == 201, response.text
+
+    create("managed", managed_id, member_id)
+    create("assigned", other["id"], manager_id)
+    create("hidden", other["id"], member_id)
+
+    titles = {task["title"] for task in client.get("/api/v1/tasks/", headers=manager).json()}
+    assert titles == {"managed", "assigned"}
+    assert len(client.get("/api/v1/tasks/", headers=member).json()) == 2